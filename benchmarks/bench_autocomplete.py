@@ -0,0 +1,65 @@
+"""
+Skill autocomplete: trie lookups vs the `icontains` search of the list view.
+
+    python -m benchmarks.bench_autocomplete [skills]
+"""
+
+import random
+import sys
+
+from benchmarks.utils import report, setup_django, timeit
+
+setup_django()
+
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from freelancer_management.models import Skill  # noqa: E402
+from freelancer_management.taxonomy import skill_taxonomy  # noqa: E402
+from freelancer_management.views.skills import (  # noqa: E402
+    SkillAutocompleteView,
+    SkillListCreateView,
+)
+
+WORDS = ["data", "web", "machine", "cloud", "mobile", "design", "python", "react"]
+
+
+def call(view, params):
+    request = APIRequestFactory().get("/skills", params)
+    return view(request).render()
+
+
+def main(skills):
+    rng = random.Random(0)
+    Skill.objects.bulk_create(
+        [
+            Skill(name=f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}")
+            for i in range(skills)
+        ],
+        batch_size=5000,
+    )
+    skill_taxonomy.bump()
+
+    build = timeit(lambda: skill_taxonomy.build_prefix_index(skill_taxonomy.get()), 3)
+    autocomplete = SkillAutocompleteView.as_view()
+    search = SkillListCreateView.as_view()
+    call(autocomplete, {"q": "d"})
+
+    rows = [("index build", f"{build:.2f}")]
+    for query in ["d", "mach", "cloud py"]:
+        rows.append(
+            (
+                f"q={query!r}, autocomplete",
+                f"{timeit(lambda: call(autocomplete, {'q': query}), 200):.3f}",
+            )
+        )
+        rows.append(
+            (
+                f"q={query!r}, list search",
+                f"{timeit(lambda: call(search, {'search': query})):.3f}",
+            )
+        )
+    report(f"Skill autocomplete, {skills} skills (median ms)", rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
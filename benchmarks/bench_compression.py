@@ -0,0 +1,55 @@
+"""
+Response compression of profile and event pages: bytes on the wire and CPU
+time per response for Brotli and gzip at several levels, through
+CompressionMiddleware.
+
+    python -m benchmarks.bench_compression [rows]
+"""
+
+import sys
+
+from benchmarks.utils import report, setup_django, timeit
+
+setup_django()
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+
+from benchmarks.bench_json import payloads  # noqa: E402
+from skill_africa.middleware import CompressionMiddleware  # noqa: E402
+from skill_africa.renderers import FastJSONRenderer  # noqa: E402
+
+LEVELS = {
+    "br": [("BROTLI_QUALITY", quality) for quality in (1, 4, 6, 9, 11)],
+    "gzip": [("GZIP_LEVEL", level) for level in (1, 6, 9)],
+}
+
+
+def compress(body, coding):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=coding)
+    response = HttpResponse(body, content_type="application/json")
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def main(rows):
+    results = []
+    for label, data in payloads(rows):
+        body = FastJSONRenderer().render(data)
+        results.append((f"{label}, uncompressed", f"{len(body) / 1024:8.1f} KiB"))
+        for coding, levels in LEVELS.items():
+            for setting, level in levels:
+                with override_settings(RESPONSE_COMPRESSION={setting: level}):
+                    size = len(compress(body, coding).content)
+                    elapsed = timeit(lambda: compress(body, coding), repeat=10)
+                results.append(
+                    (
+                        f"{label}, {coding} {level}",
+                        f"{size / 1024:8.1f} KiB ({size / len(body):5.1%})"
+                        f"  {elapsed:7.2f} ms",
+                    )
+                )
+    report("Response compression, size and median time", results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,105 @@
+"""
+Image normalization before upload: per-image latency for typical uploads,
+and throughput of the process pool against a single process.
+
+    python -m benchmarks.bench_images [images]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import report, setup_django, timeit
+
+setup_django()
+
+import numpy as np  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from media_management.images import image_processor  # noqa: E402
+
+SAMPLES = [
+    ("phone photo 4032x3024 JPEG", (4032, 3024), "JPEG"),
+    ("screenshot 1920x1080 PNG", (1920, 1080), "PNG"),
+    ("avatar 800x800 JPEG", (800, 800), "JPEG"),
+]
+
+
+def photo(size, format, seed=0):
+    """
+    Bytes of a photo-like image: smooth gradients with some noise, which
+    compresses like a real photo rather than a flat color.
+    """
+    width, height = size
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    channels = [(x + y) / 2, np.abs(x - y), 255 - (x + y) / 2]
+    pixels = np.stack(channels, axis=-1) + rng.normal(0, 12, (height, width, 3))
+    image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    buffer = io.BytesIO()
+    image.save(buffer, format, quality=92)
+    return buffer.getvalue()
+
+
+def write(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as file:
+        file.write(data)
+    return path
+
+
+def throughput(paths, workers):
+    """
+    Images per second when `workers` upload threads feed a pool of
+    `workers` processes, or process images themselves with 0.
+    """
+    threads = max(workers, 1)
+    with override_settings(IMAGE_WORKERS=workers):
+        if workers:
+            # Start the pool outside the measure
+            image_processor.process(paths[0])
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(image_processor.process, paths))
+        return len(paths) / (time.perf_counter() - start)
+
+
+def main(images):
+    with tempfile.TemporaryDirectory() as directory:
+        results = []
+        with override_settings(IMAGE_WORKERS=0):
+            for label, size, format in SAMPLES:
+                data = photo(size, format)
+                path = write(directory, f"{label}.{format.lower()}", data)
+                latency = timeit(lambda: image_processor.process(path), 5)
+                stored = os.path.getsize(f"{path}.normalized.webp")
+                results.append(
+                    (
+                        label,
+                        f"{latency:8.1f} ms  {len(data) / 2**20:5.2f} MiB"
+                        f" -> {stored / 2**20:5.2f} MiB",
+                    )
+                )
+        report("Normalization latency, one image (median)", results)
+
+        paths = [
+            write(directory, f"upload{i}.jpg", photo((4032, 3024), "JPEG", seed=i))
+            for i in range(images)
+        ]
+        results = []
+        for workers in [0, 1, 2, 4]:
+            label = f"{workers} processes" if workers else "in thread"
+            rate = throughput(paths, workers)
+            results.append((label, f"{rate:6.2f} images/s"))
+        report(
+            f"Pool throughput, {images} phone photos, cores: {os.cpu_count()}", results
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
@@ -0,0 +1,96 @@
+"""
+JSON encoding and decoding of profile and event pages: DRF's stdlib based
+JSONRenderer/JSONParser vs the orjson backed FastJSONRenderer/FastJSONParser.
+
+    python -m benchmarks.bench_json [rows]
+"""
+
+import io
+import sys
+from datetime import timedelta
+from decimal import Decimal
+
+from benchmarks.utils import report, setup_django, timeit
+
+setup_django()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from admin_management.models import AdminProfile  # noqa: E402
+from benchmarks.bench_profile_fields import create_profiles  # noqa: E402
+from event_management.models import Event, EventAttendee  # noqa: E402
+from event_management.serializers import EventSerializer  # noqa: E402
+from freelancer_management.models import FreelancerProfile  # noqa: E402
+from freelancer_management.serializers import FreelanceProfileSerializer  # noqa: E402
+from profile_management.models import User  # noqa: E402
+from skill_africa.parsers import FastJSONParser  # noqa: E402
+from skill_africa.renderers import FastJSONRenderer  # noqa: E402
+
+
+def create_events(count, attendees):
+    host = AdminProfile.objects.create(
+        user=User.objects.create(username="host", email="host@example.com")
+    )
+    events = Event.objects.bulk_create(
+        [
+            Event(
+                name=f"Meetup {i}",
+                location="Lagos",
+                datetime=timezone.now() + timedelta(days=i),
+                details="Monthly meetup for freelancers. " * 10,
+                price=Decimal("2500.00"),
+                max_attendance=200,
+                host=host,
+            )
+            for i in range(count)
+        ]
+    )
+    EventAttendee.objects.bulk_create(
+        [
+            EventAttendee(event=event, attendee=user)
+            for event in events
+            for user in attendees
+        ]
+    )
+
+
+def payloads(rows):
+    create_profiles(rows)
+    profiles = FreelanceProfileSerializer.setup_eager_loading(
+        FreelancerProfile.objects.order_by("user__username")
+    )
+    create_events(rows // 10, list(User.objects.all()[:5]))
+    events = Event.objects.select_related("host__user").prefetch_related(
+        "cohosts", "attendees__attendee"
+    )
+    return [
+        (f"{rows} profiles", FreelanceProfileSerializer(profiles, many=True).data),
+        (f"{len(events)} events", EventSerializer(events, many=True).data),
+    ]
+
+
+def main(rows):
+    results = []
+    for label, data in payloads(rows):
+        encoded = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == encoded
+        for name, renderer, parser in [
+            ("stdlib", JSONRenderer(), JSONParser()),
+            ("orjson", FastJSONRenderer(), FastJSONParser()),
+        ]:
+            render = timeit(lambda: renderer.render(data))
+            parse = timeit(lambda: parser.parse(io.BytesIO(encoded), None, {}))
+            results.append(
+                (
+                    f"{label}, {name}",
+                    f"render {render:7.2f} ms  parse {parse:7.2f} ms",
+                )
+            )
+        results.append((f"{label}, payload", f"{len(encoded) / 1024:.1f} KiB"))
+    report("JSON rendering and parsing (median)", results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
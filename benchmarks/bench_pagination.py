@@ -0,0 +1,65 @@
+"""
+Page 1 vs page 1000 under page-number and cursor pagination.
+
+    python -m benchmarks.bench_pagination [rows]
+"""
+
+import sys
+
+from benchmarks.utils import report, setup_django, timeit
+
+setup_django()
+
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from freelancer_management.models import Skill  # noqa: E402
+from skill_africa.pagination import (  # noqa: E402
+    CustomCursorPagination,
+    CustomPageNumberPagination,
+)
+
+PAGE_SIZE = 50
+
+
+def paginate(paginator_class, params):
+    request = Request(APIRequestFactory().get("/skills", params))
+    paginator = paginator_class()
+    paginator.paginate_queryset(Skill.objects.order_by("name"), request)
+
+
+def main(rows):
+    Skill.objects.bulk_create(
+        [Skill(name=f"skill_{i:07d}") for i in range(rows)], batch_size=5000
+    )
+    last_page = rows // PAGE_SIZE
+
+    # A client reaches the last page by following `next` links, so the cursor
+    # it holds is the sort key of the last row on the page before.
+    boundary = Skill.objects.order_by("name")[(last_page - 1) * PAGE_SIZE - 1]
+    cursor_request = Request(APIRequestFactory().get("/skills", {"cursor": ""}))
+    cursor_paginator = CustomCursorPagination()
+    cursor_paginator.paginate_queryset(Skill.objects.order_by("name"), cursor_request)
+    cursor = cursor_paginator.encode_cursor(boundary).split("cursor=")[1]
+
+    page_number = CustomPageNumberPagination
+    results = [
+        ("page 1, page number", timeit(lambda: paginate(page_number, {}))),
+        (
+            f"page {last_page}, page number",
+            timeit(lambda: paginate(page_number, {"page": last_page})),
+        ),
+        ("page 1, cursor", timeit(lambda: paginate(page_number, {"cursor": ""}))),
+        (
+            f"page {last_page}, cursor",
+            timeit(lambda: paginate(page_number, {"cursor": cursor})),
+        ),
+    ]
+    report(
+        f"Skill list, {rows} rows, {PAGE_SIZE} per page (median ms)",
+        [(label, f"{ms:.2f}") for label, ms in results],
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
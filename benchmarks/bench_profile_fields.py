@@ -0,0 +1,122 @@
+"""
+Payload size and latency of a 500-row profile page, full vs sparse fieldsets.
+
+    python -m benchmarks.bench_profile_fields [profiles]
+"""
+
+import sys
+
+from benchmarks.utils import report, setup_django, timeit
+
+setup_django()
+
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from freelancer_management.models import (  # noqa: E402
+    FreelancerLanguage,
+    FreelancerLink,
+    FreelancerNiche,
+    FreelancerProfile,
+    FreelancerSkill,
+    Language,
+    Niche,
+    Skill,
+)
+from freelancer_management.views.profile import FreelancerProfileList  # noqa: E402
+from profile_management.models import User  # noqa: E402
+
+PAGE_SIZE = 500
+CASES = [
+    ("full", {}),
+    ("expand=skills", {"expand": "skills"}),
+    (
+        "fields=first_name,last_name,profile_pic,skills",
+        {"fields": "first_name,last_name,profile_pic,skills"},
+    ),
+    (
+        "fields=first_name,last_name,profile_pic",
+        {"fields": "first_name,last_name,profile_pic"},
+    ),
+]
+
+
+def create_profiles(count):
+    skills = Skill.objects.bulk_create([Skill(name=f"skill {i}") for i in range(50)])
+    niches = Niche.objects.bulk_create([Niche(name=f"niche {i}") for i in range(10)])
+    languages = Language.objects.bulk_create(
+        [Language(name=f"language {i}") for i in range(10)]
+    )
+    users = User.objects.bulk_create(
+        [
+            User(username=f"user_{i:05d}", email=f"user_{i}@example.com", password="!")
+            for i in range(count)
+        ]
+    )
+    profiles = FreelancerProfile.objects.bulk_create(
+        [
+            FreelancerProfile(
+                user=user,
+                first_name="Ada",
+                last_name="Obi",
+                bio="Full stack developer",
+                about_me="Building web products for a decade. " * 20,
+                location="Lagos, Nigeria",
+                profile_pic="https://res.cloudinary.com/demo/image/upload/pic.jpg",
+            )
+            for user in users
+        ]
+    )
+    for i, profile in enumerate(profiles):
+        FreelancerSkill.objects.bulk_create(
+            [
+                FreelancerSkill(freelancer=profile, skill=skills[(i + j) % 50])
+                for j in range(5)
+            ]
+        )
+        FreelancerNiche.objects.bulk_create(
+            [
+                FreelancerNiche(freelancer=profile, niche=niches[(i + j) % 10])
+                for j in range(2)
+            ]
+        )
+        FreelancerLanguage.objects.bulk_create(
+            [
+                FreelancerLanguage(freelancer=profile, language=languages[(i + j) % 10])
+                for j in range(2)
+            ]
+        )
+        FreelancerLink.objects.bulk_create(
+            [
+                FreelancerLink(
+                    freelancer=profile, name=name, url=f"https://{name}.com/x"
+                )
+                for name in ["github", "linkedin"]
+            ]
+        )
+    return users[0]
+
+
+def main(count):
+    user = create_profiles(count)
+    token = RefreshToken.for_user(user).access_token
+    view = FreelancerProfileList.as_view()
+
+    def call(params):
+        request = APIRequestFactory().get(
+            "/profiles",
+            {"page_size": PAGE_SIZE, **params},
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        return view(request).render()
+
+    rows = []
+    for label, params in CASES:
+        size = len(call(params).content)
+        ms = timeit(lambda: call(params), 10)
+        rows.append((label, f"{size / 1024:8.1f} KiB  {ms:8.2f} ms"))
+    report(f"Profile list, {PAGE_SIZE} rows per page (payload, median latency)", rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else PAGE_SIZE)
@@ -0,0 +1,85 @@
+"""
+Similar freelancers queries against a synthetic index: building, saving,
+loading and top-k lookups for profiles with popular and rare skills.
+
+    python -m benchmarks.bench_similarity [profiles]
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.utils import report, setup_django, timeit
+
+setup_django()
+
+import numpy as np  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from freelancer_management.similarity import (  # noqa: E402
+    SimilarityIndex,
+    group_features,
+)
+
+SKILLS, NICHES, LANGUAGES = 2000, 40, 60
+
+
+def memberships(profiles, seed=0):
+    """
+    (profile id, kind, taxonomy id) rows: 3-15 skills, 1-3 niches and 1-3
+    languages per profile, popularity following a Zipf-like curve.
+    """
+    rng = np.random.default_rng(seed)
+    parts = []
+    for kind, (count, low, high) in enumerate(
+        [(SKILLS, 3, 15), (NICHES, 1, 3), (LANGUAGES, 1, 3)]
+    ):
+        per_profile = rng.integers(low, high + 1, size=profiles)
+        owners = np.repeat(np.arange(1, profiles + 1), per_profile)
+        ids = np.minimum(rng.zipf(1.3, size=len(owners)), count)
+        rows = np.unique(
+            np.column_stack([owners, np.full(len(owners), kind), ids]), axis=0
+        )
+        parts.append(rows)
+    return np.concatenate(parts)
+
+
+def main(profiles):
+    data = memberships(profiles)
+    results = [("memberships", f"{len(data):,}")]
+
+    build = timeit(lambda: SimilarityIndex.from_memberships(data, timezone.now()), 3)
+    index = SimilarityIndex.from_memberships(data, timezone.now())
+    results.append(("build", f"{build:8.1f} ms"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "similarity.npz")
+        results.append(("save", f"{timeit(lambda: index.save(path), 3):8.1f} ms"))
+        results.append(
+            ("load", f"{timeit(lambda: SimilarityIndex.load(path), 3):8.1f} ms")
+        )
+        results.append(("file size", f"{os.path.getsize(path) / 2**20:8.1f} MiB"))
+
+    features = group_features(data)
+    # The work per query is the number of profiles sharing a column with it
+    sizes = np.diff(index.indptr)
+    work = {
+        profile_id: sum(sizes[index.columns[f]] for f in profile_features)
+        for profile_id, profile_features in list(features.items())[:1000]
+    }
+    for label, profile_id in [
+        ("popular skills", max(work, key=work.get)),
+        ("rare skills", min(work, key=work.get)),
+    ]:
+        query = features[profile_id]
+
+        def top_k():
+            scores = index.scores(query)
+            return np.argpartition(-scores, 10)[:10]
+
+        results.append((f"top 10, {label}", f"{timeit(top_k, 50):8.2f} ms"))
+    report(f"Similar freelancers, {profiles:,} profiles (median)", results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
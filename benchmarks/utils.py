@@ -0,0 +1,61 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks run against a throwaway test database and a local memory cache,
+never against the databases or Redis configured in `.env`. Run them from the
+project root, e.g. `python -m benchmarks.bench_pagination`.
+"""
+
+import os
+import statistics
+import time
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+_ready = False
+
+
+def setup_django():
+    # Benchmarks may import each other's fixtures, set up only once
+    global _ready
+    if _ready:
+        return
+    _ready = True
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "skill_africa.settings")
+    os.environ.setdefault("ACCESS_TOKEN_LIFETIME_HOURS", "24")
+    os.environ.setdefault("REFRESH_TOKEN_LIFETIME_DAYS", "7")
+
+    import django
+    from django.db import connection
+    from django.test.utils import override_settings, setup_test_environment
+
+    django.setup()
+    override_settings(CACHES=LOCMEM_CACHES, DEBUG=False).enable()
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def timeit(func, repeat=20):
+    """
+    Runs `func` `repeat` times and returns the median wall time in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(title, rows):
+    """
+    Prints `rows` (a list of (label, value) tuples) as an aligned table.
+    """
+    print(f"\n{title}")
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        print(f"  {label.ljust(width)}  {value}")
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EventManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'event_management'
+
+    def ready(self):
+        from event_management import signals  # noqa: F401
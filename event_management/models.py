@@ -16,6 +16,8 @@ class Event(models.Model):
     host = models.ForeignKey(
         AdminProfile, on_delete=models.CASCADE, related_name="hosted_events"
     )
+    # Also bumped when attendees or cohosts change (event_management.signals)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
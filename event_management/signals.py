@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from event_management.models import Event, EventAttendee, EventCoHost
+
+
+def event_child_changed(sender, instance, **kwargs):
+    # The event representation embeds its cohosts and attendee count
+    Event.objects.filter(uuid=instance.event_id).update(updated_at=timezone.now())
+
+
+for model in [EventAttendee, EventCoHost]:
+    post_save.connect(event_child_changed, sender=model)
+    post_delete.connect(event_child_changed, sender=model)
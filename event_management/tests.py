@@ -1,3 +1,51 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from admin_management.models import AdminProfile
+from event_management.models import Event, EventAttendee
+from profile_management.models import User
+
+
+class EventDetailConditionalGetTests(APITestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            username="admin", email="admin@example.com", password="password"
+        )
+        self.event = Event.objects.create(
+            name="Meetup",
+            location="Lagos",
+            datetime=timezone.now() + timedelta(days=7),
+            details="Monthly meetup",
+            host=AdminProfile.objects.create(user=user),
+        )
+        self.attendee = User.objects.create_user(
+            username="jane", email="jane@example.com", password="password"
+        )
+        self.url = reverse("event-detail", args=[self.event.uuid])
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_unchanged_event_is_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_attendee_changes_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        EventAttendee.objects.create(event=self.event, attendee=self.attendee)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["attendees"], 1)
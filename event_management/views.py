@@ -16,6 +16,7 @@ from admin_management.models import AdminProfile
 from admin_management.serializers import AdminSerializer
 from profile_management.models import User
 from profile_management.serializers import UserDetailsSerializerWithId
+from skill_africa.conditional import Validators
 from skill_africa.permissions import IsAdmin, IsAuthenticatedWithJWT
 from .models import Event, EventAttendee, EventCoHost
 from .serializers import (
@@ -121,9 +122,20 @@ class EventDetailView(APIView):
     authentication_classes = [JWTAuthentication]
 
     def get(self, request, uuid):
+        updated_at = (
+            Event.objects.filter(uuid=uuid).values_list("updated_at", flat=True).first()
+        )
+        validators = None
+        if updated_at is not None:
+            validators = Validators(updated_at, request)
+            not_modified = validators.not_modified(request)
+            if not_modified is not None:
+                return not_modified
+
         event = get_object_or_404(Event, uuid=uuid)
         serializer = EventSerializer(event)
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        return validators.apply(response) if validators else response
 
     def put(self, request, uuid):
         event = get_object_or_404(Event, uuid=uuid)
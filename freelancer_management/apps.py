@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class FreelancerManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'freelancer_management'
+
+    def ready(self):
+        from freelancer_management import signals  # noqa: F401
+        from freelancer_management.search import install_search_backend
+
+        post_migrate.connect(install_search_backend, sender=self)
@@ -0,0 +1,105 @@
+"""
+Cache for serialized freelancer profiles.
+
+Profile documents are stored in the default cache (Redis in production) under
+the owner's user uuid and dropped by the model signals in
+`freelancer_management.signals` whenever the profile or one of its child rows
+changes.
+"""
+
+import logging
+import uuid as uuid_lib
+
+from django.core.cache import cache
+
+from profile_management.models import User
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_PREFIX = "freelancer_profile"
+PROFILE_CACHE_TIMEOUT = 60 * 60  # 1 hour
+PROFILE_CACHE_HITS_KEY = f"{PROFILE_CACHE_PREFIX}:stats:hits"
+PROFILE_CACHE_MISSES_KEY = f"{PROFILE_CACHE_PREFIX}:stats:misses"
+
+
+def profile_cache_key(uuid):
+    """
+    Returns the cache key for a profile, or None when `uuid` is not a valid UUID.
+    """
+    try:
+        return f"{PROFILE_CACHE_PREFIX}:{uuid_lib.UUID(str(uuid))}"
+    except ValueError:
+        return None
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter does not exist yet
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_cached_profile(uuid):
+    """
+    Returns the cached representation of a profile, or None on a miss.
+    Cache errors are treated as misses so a cache outage never fails a request.
+    """
+    key = profile_cache_key(uuid)
+    if key is None:
+        return None
+
+    try:
+        data = cache.get(key)
+        _incr(PROFILE_CACHE_MISSES_KEY if data is None else PROFILE_CACHE_HITS_KEY)
+    except Exception as e:
+        logger.warning("Profile cache read failed: %s", e)
+        return None
+    return data
+
+
+def set_cached_profile(uuid, data):
+    key = profile_cache_key(uuid)
+    if key is None:
+        return
+
+    try:
+        cache.set(key, dict(data), timeout=PROFILE_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning("Profile cache write failed: %s", e)
+
+
+def invalidate_profile(uuid):
+    key = profile_cache_key(uuid)
+    if key is None:
+        return
+
+    try:
+        cache.delete(key)
+    except Exception as e:
+        logger.warning("Profile cache invalidation failed: %s", e)
+
+
+def invalidate_profiles(profile_ids):
+    """
+    Invalidates the cached documents of the given FreelancerProfile ids.
+    """
+    uuids = User.objects.filter(freelancerprofile__id__in=profile_ids).values_list(
+        "uuid", flat=True
+    )
+    try:
+        cache.delete_many([profile_cache_key(uuid) for uuid in uuids])
+    except Exception as e:
+        logger.warning("Profile cache invalidation failed: %s", e)
+
+
+def get_profile_cache_stats():
+    """
+    Returns the hit/miss counters of the profile cache.
+    """
+    stats = cache.get_many([PROFILE_CACHE_HITS_KEY, PROFILE_CACHE_MISSES_KEY])
+    return {
+        "hits": int(stats.get(PROFILE_CACHE_HITS_KEY, 0)),
+        "misses": int(stats.get(PROFILE_CACHE_MISSES_KEY, 0)),
+    }
@@ -0,0 +1,64 @@
+"""
+Profile completeness: a 0-100 score stored on `FreelancerProfile.completeness`
+so list pages can sort and filter on an indexed column.
+
+The score adds up the weight of every part of the profile that is filled in
+(see WEIGHTS). It is recomputed after commit for every profile passed to
+`profiles_changed` (see `freelancer_management.signals`), as one UPDATE
+evaluating the whole expression in the database, however many profiles
+changed. `manage.py update_completeness` recomputes every profile, e.g.
+after the weights change.
+"""
+
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from freelancer_management.models import (
+    FreelancerProfile,
+    FreelancerSkill,
+    Project,
+    WorkExperience,
+)
+
+# Sums to 100
+WEIGHTS = {
+    "bio": 10,
+    "about_me": 15,
+    "profile_pic": 15,
+    "resume": 15,
+    "skills": 20,
+    "projects": 15,
+    "work_experience": 10,
+}
+
+# Parts that are rows in other tables
+RELATED_MODELS = {
+    "skills": FreelancerSkill,
+    "projects": Project,
+    "work_experience": WorkExperience,
+}
+
+
+def filled(name):
+    if name in RELATED_MODELS:
+        model = RELATED_MODELS[name]
+        return Exists(model.objects.filter(freelancer=OuterRef("pk")))
+    return Q(**{f"{name}__isnull": False}) & ~Q(**{name: ""})
+
+
+def completeness_expression():
+    """
+    Database expression of the score of a profile row.
+    """
+    expression = Value(0)
+    for name, weight in WEIGHTS.items():
+        expression += Case(When(filled(name), then=Value(weight)), default=Value(0))
+    return Coalesce(expression, Value(0))
+
+
+def update_completeness(profile_ids):
+    profile_ids = list(profile_ids)
+    if profile_ids:
+        FreelancerProfile.objects.filter(id__in=profile_ids).update(
+            completeness=completeness_expression()
+        )
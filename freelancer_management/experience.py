@@ -0,0 +1,111 @@
+"""
+Total professional experience: the months covered by a profile's work
+experiences, stored on `FreelancerProfile.total_experience_months` so list
+pages can sort and filter on an indexed column.
+
+Roles overlap (a side job during a full-time one), so the periods are merged
+before being counted and months worked in two roles count once. A current
+role, or one without an end date, runs until today, as do end dates in the
+future. Every profile passed to `profiles_changed` with `experience=True`
+(work experience writes, see `freelancer_management.signals`) is recomputed
+after commit. Open-ended roles keep growing without any write, so
+`manage.py update_experience` recomputes the profiles holding one, nightly.
+"""
+
+from datetime import timedelta
+from itertools import groupby
+
+from django.db.models import Q
+from django.utils import timezone
+
+from freelancer_management.models import FreelancerProfile, WorkExperience
+
+
+def merge_intervals(intervals):
+    """
+    Merges (start, end) date periods into the sorted, disjoint periods they
+    cover. Periods that overlap or follow each other by a day are joined.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def months_between(start, end):
+    """
+    Whole calendar months from `start` to `end`, both included: a role from
+    January 1st to December 31st lasted 12 months.
+    """
+    end += timedelta(days=1)
+    months = (end.year - start.year) * 12 + end.month - start.month
+    if end.day < start.day:
+        months -= 1
+    return max(months, 0)
+
+
+def experience_months(rows, today):
+    """
+    Months covered by (start_date, end_date, current_role) rows as of `today`.
+    """
+    intervals = []
+    for start, end, current_role in rows:
+        if current_role or end is None or end > today:
+            end = today
+        # Roles that have not started yet or end before they start
+        if start <= end:
+            intervals.append((start, end))
+    return sum(months_between(start, end) for start, end in merge_intervals(intervals))
+
+
+def update_experience(profile_ids, today=None):
+    """
+    Recomputes the experience of the given profiles and returns the ids of
+    those whose months changed; the others are not written.
+    """
+    profile_ids = list(profile_ids)
+    if not profile_ids:
+        return []
+    today = today or timezone.localdate()
+
+    rows = (
+        WorkExperience.objects.filter(freelancer_id__in=profile_ids)
+        .order_by("freelancer_id")
+        .values_list("freelancer_id", "start_date", "end_date", "current_role")
+    )
+    months = dict.fromkeys(profile_ids, 0)
+    for profile_id, group in groupby(rows.iterator(), key=lambda row: row[0]):
+        months[profile_id] = experience_months((row[1:] for row in group), today)
+
+    stored = FreelancerProfile.objects.filter(id__in=profile_ids).values_list(
+        "id", "total_experience_months"
+    )
+    changed = [
+        FreelancerProfile(id=profile_id, total_experience_months=months[profile_id])
+        for profile_id, current in stored
+        if current != months[profile_id]
+    ]
+    FreelancerProfile.objects.bulk_update(
+        changed, ["total_experience_months"], batch_size=1000
+    )
+    return [profile.id for profile in changed]
+
+
+def open_ended_profiles(today=None):
+    """
+    Profiles whose experience grows by itself: those with a role that is
+    current, has no end date or had not ended by yesterday.
+    """
+    yesterday = (today or timezone.localdate()) - timedelta(days=1)
+    return (
+        WorkExperience.objects.filter(
+            Q(current_role=True) | Q(end_date__isnull=True) | Q(end_date__gte=yesterday)
+        )
+        .order_by("freelancer_id")
+        .values_list("freelancer_id", flat=True)
+        .distinct()
+    )
@@ -1,5 +1,10 @@
+import django_filters
 from rest_framework import filters
 
+from freelancer_management.models import FreelancerProfile, Project
+from freelancer_management.project_tags import filter_by_tags
+from freelancer_management.search import get_search_backend
+
 
 # Custom filters
 class CustomSearchFilter(filters.SearchFilter):
@@ -8,13 +13,27 @@ class CustomSearchFilter(filters.SearchFilter):
             return ["user__username"]
 
         if request.query_params.get("niche"):
-            return ["niche__name"]
+            return ["niches__niche__name"]
 
         if request.query_params.get("name"):
             return ["first_name", "last_name"]
 
         return super().get_search_fields(view, request)
 
+    def uses_full_text_search(self, request):
+        return not any(
+            request.query_params.get(param) for param in ["username", "niche", "name"]
+        )
+
+    def filter_queryset(self, request, queryset, view):
+        # The targeted username/niche/name searches keep using icontains,
+        # a plain ?search= goes through the full-text index.
+        terms = request.query_params.get(self.search_param, "").strip()
+        backend = get_search_backend()
+        if not terms or backend is None or not self.uses_full_text_search(request):
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, terms)
+
 
 class CustomOrderingFilter(filters.OrderingFilter):
     def get_ordering(self, request, queryset, view):
@@ -27,4 +46,36 @@ class CustomOrderingFilter(filters.OrderingFilter):
         if request.query_params.get("firstname"):
             return ["first_name"]
 
+        # Full-text matches come back most relevant first unless the client
+        # asked for a specific ordering.
+        if (
+            "search_rank" in queryset.query.annotations
+            and not request.query_params.get(self.ordering_param)
+        ):
+            return ["-search_rank", "user__username"]
+
         return super().get_ordering(request, queryset, view)
+
+
+class FreelancerProfileFilter(django_filters.FilterSet):
+    # ?completeness_min=&completeness_max=, both inclusive
+    completeness = django_filters.RangeFilter()
+    # ?total_experience_months_min=&total_experience_months_max=
+    total_experience_months = django_filters.RangeFilter()
+
+    class Meta:
+        model = FreelancerProfile
+        fields = ["completeness", "total_experience_months"]
+
+
+class ProjectFilter(django_filters.FilterSet):
+    # ?skill=react,vue&tool=figma, every listed name must be on the project
+    skill = django_filters.CharFilter(method="filter_tags")
+    tool = django_filters.CharFilter(method="filter_tags")
+
+    class Meta:
+        model = Project
+        fields = ["skill", "tool"]
+
+    def filter_tags(self, queryset, name, value):
+        return filter_by_tags(queryset, f"{name}s", value)
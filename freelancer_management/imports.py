@@ -0,0 +1,277 @@
+"""
+Bulk import of freelancers, used by `manage.py import_freelancers`.
+
+Rows are read from NDJSON or CSV and handled in batches: every row is
+validated in memory, taken usernames and emails are looked up with one query
+per batch, taxonomy names are resolved from one preloaded name -> id map,
+passwords are hashed in a process pool, and users, email addresses, profiles
+and memberships are written with one bulk insert per table in a single
+transaction. Since bulk_create sends no signals, every batch refreshes the
+cache and search index of its profiles through `profiles_changed`.
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from freelancer_management.memberships import MEMBERSHIPS
+from freelancer_management.models import FreelancerProfile
+from freelancer_management.serializers import FreelancerImportSerializer
+from freelancer_management.signals import profiles_changed
+from freelancer_management.taxonomy import TAXONOMIES
+from profile_management.models import User
+
+PROFILE_FIELDS = ["first_name", "last_name", "bio", "about_me", "location"]
+
+
+def read_ndjson(stream):
+    """
+    Yields (line number, row) for every non-blank line. Lines that are not
+    a JSON object are yielded as their error message.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = f"Invalid JSON: {e}"
+        if not isinstance(row, (dict, str)):
+            row = "Expected a JSON object."
+        yield line_number, row
+
+
+def read_csv(stream):
+    """
+    Yields (line number, row) for every record, leaving out empty cells.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if value}
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+def normalize(row):
+    # Accepts the flattened `user.*` columns of the profile export
+    return {key.removeprefix("user."): value for key, value in row.items()}
+
+
+def init_worker():
+    # Workers that are not forked (spawn, forkserver) start without Django
+    import django
+
+    django.setup()
+
+
+def format_errors(errors):
+    if isinstance(errors, str):
+        return errors
+    return "; ".join(
+        f"{field}: {' '.join(str(message) for message in messages)}"
+        for field, messages in errors.items()
+    )
+
+
+class FreelancerImporter:
+    """
+    Imports batches of rows, keeping the taxonomy maps and the usernames and
+    emails seen so far across batches. Use as a context manager so the
+    hashing pool is shut down.
+    """
+
+    def __init__(self, workers=None, create_missing=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.create_missing = create_missing
+        self.pool = None
+        # taxonomy model -> {lowercased name: id}
+        self.names = {
+            model: dict(taxonomy.get().ids) for model, taxonomy in TAXONOMIES.items()
+        }
+        self.seen_usernames = set()
+        self.seen_emails = set()
+        self.imported = 0
+        self.skipped = 0
+        self.started_at = time.perf_counter()
+
+    def __enter__(self):
+        if self.workers != 1:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=init_worker)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.started_at
+        return (self.imported + self.skipped) / elapsed if elapsed else 0.0
+
+    def import_batch(self, rows):
+        """
+        Imports (line number, row) pairs. Returns [(line number, error)] for
+        the rows that were skipped.
+        """
+        valid, errors = self.validate(rows)
+        valid = self.check_taken(valid, errors)
+        valid = self.resolve_taxonomies(valid, errors)
+        if valid:
+            self.write(valid, self.hash_passwords(valid))
+        self.imported += len(valid)
+        self.skipped += len(errors)
+        return sorted(errors)
+
+    def validate(self, rows):
+        valid, errors = [], []
+        for line_number, row in rows:
+            if isinstance(row, str):
+                errors.append((line_number, row))
+                continue
+            serializer = FreelancerImportSerializer(data=normalize(row))
+            if serializer.is_valid():
+                valid.append((line_number, serializer.validated_data))
+            else:
+                errors.append((line_number, format_errors(serializer.errors)))
+        return valid, errors
+
+    def check_taken(self, rows, errors):
+        usernames = [data["username"] for _, data in rows]
+        emails = [data["email"] for _, data in rows]
+        taken_usernames = self.seen_usernames | set(
+            User.objects.filter(username__in=usernames).values_list(
+                "username", flat=True
+            )
+        )
+        taken_emails = self.seen_emails | set(
+            User.objects.filter(email__in=emails).values_list("email", flat=True)
+        )
+
+        available = []
+        for line_number, data in rows:
+            if data["username"] in taken_usernames:
+                errors.append((line_number, "username: Username is already taken."))
+            elif data["email"] in taken_emails:
+                errors.append((line_number, "email: Email is already registered."))
+            else:
+                # Also catches duplicates further down the same batch
+                taken_usernames.add(data["username"])
+                taken_emails.add(data["email"])
+                available.append((line_number, data))
+        self.seen_usernames.update(data["username"] for _, data in available)
+        self.seen_emails.update(data["email"] for _, data in available)
+        return available
+
+    def resolve_taxonomies(self, rows, errors):
+        """
+        Replaces skill, niche and language names with ids. Unknown names are
+        created when `create_missing` is set, otherwise their row is skipped.
+        """
+        if self.create_missing:
+            for taxonomy_model, field in MEMBERSHIPS.values():
+                self.create_names(taxonomy_model, rows, f"{field}s")
+
+        resolved = []
+        for line_number, data in rows:
+            unknown = []
+            for taxonomy_model, field in MEMBERSHIPS.values():
+                names = self.names[taxonomy_model]
+                values = data.get(f"{field}s", [])
+                unknown += [
+                    f"{field}s: Unknown {taxonomy_model.__name__} {value!r}."
+                    for value in values
+                    if value.lower() not in names
+                ]
+                data[f"{field}_ids"] = list(
+                    dict.fromkeys(
+                        names[value.lower()]
+                        for value in values
+                        if value.lower() in names
+                    )
+                )
+            if unknown:
+                errors.append((line_number, " ".join(unknown)))
+            else:
+                resolved.append((line_number, data))
+        return resolved
+
+    def create_names(self, taxonomy_model, rows, key):
+        names = self.names[taxonomy_model]
+        missing = {
+            value.lower(): value
+            for _, data in rows
+            for value in data.get(key, [])
+            if value.lower() not in names
+        }
+        if not missing:
+            return
+        taxonomy_model.objects.bulk_create(
+            [taxonomy_model(name=name) for name in missing.values()],
+            ignore_conflicts=True,
+        )
+        # bulk_create sends no post_save, so other workers are told here
+        TAXONOMIES[taxonomy_model].bump()
+        created = taxonomy_model.objects.filter(name__in=missing.values())
+        names.update(
+            (name.lower(), id) for id, name in created.values_list("id", "name")
+        )
+
+    def hash_passwords(self, rows):
+        passwords = [data.get("password") or None for _, data in rows]
+        to_hash = [password for password in passwords if password]
+        if self.pool is None or len(to_hash) < 2:
+            hashes = iter([make_password(password) for password in to_hash])
+        else:
+            chunksize = max(1, len(to_hash) // (self.workers * 4))
+            hashes = self.pool.map(make_password, to_hash, chunksize=chunksize)
+        # make_password(None) is an unusable password, no need for the pool
+        return [
+            next(hashes) if password else make_password(None) for password in passwords
+        ]
+
+    @transaction.atomic
+    def write(self, rows, hashes):
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=data["username"],
+                    email=data["email"],
+                    password=password_hash,
+                    role="freelancer",
+                )
+                for (_, data), password_hash in zip(rows, hashes)
+            ]
+        )
+        # As registration does, the address still has to be verified
+        EmailAddress.objects.bulk_create(
+            [
+                EmailAddress(user=user, email=user.email, primary=True, verified=False)
+                for user in users
+            ]
+        )
+        profiles = FreelancerProfile.objects.bulk_create(
+            [
+                FreelancerProfile(
+                    user=user, **{name: data.get(name) for name in PROFILE_FIELDS}
+                )
+                for user, (_, data) in zip(users, rows)
+            ]
+        )
+        for membership_model, (_, field) in MEMBERSHIPS.items():
+            membership_model.objects.bulk_create(
+                [
+                    membership_model(freelancer=profile, **{f"{field}_id": id})
+                    for profile, (_, data) in zip(profiles, rows)
+                    for id in data[f"{field}_ids"]
+                ]
+            )
+        # bulk_create does not send post_save; the profiles are new, so there
+        # is no updated_at to move
+        profiles_changed([profile.id for profile in profiles], touch=False)
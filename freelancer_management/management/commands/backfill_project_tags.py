@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from freelancer_management.models import Project
+from freelancer_management.project_tags import set_project_tags
+
+
+class Command(BaseCommand):
+    help = (
+        "Parses the skills and tools strings of every project into their "
+        "skill and tool relations. Skill names are only matched against the "
+        "existing skills, unknown ones are left out; unknown tools are created."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of projects parsed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        projects = Project.objects.order_by("id").only("id", "skills", "tools")
+
+        updated = 0
+        batch = []
+        for project in projects.iterator(chunk_size=batch_size):
+            batch.append(project)
+            if len(batch) == batch_size:
+                set_project_tags(batch)
+                updated += len(batch)
+                batch = []
+        if batch:
+            set_project_tags(batch)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Tagged {updated} projects."))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from freelancer_management.similarity import similarity_engine
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the similar freelancers index from the skill, niche and "
+        "language memberships and saves it for the workers to load."
+    )
+
+    def handle(self, *args, **options):
+        started_at = time.perf_counter()
+        index = similarity_engine.rebuild()
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {len(index.profile_ids)} profiles over "
+                f"{len(index.features)} skills, niches and languages in "
+                f"{elapsed:.2f}s ({similarity_engine.path})."
+            )
+        )
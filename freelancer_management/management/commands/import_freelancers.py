@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from freelancer_management.imports import READERS, FreelancerImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports freelancers (user, profile, skills, niches and languages) "
+        "from an NDJSON or CSV file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows validated and inserted per batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Processes hashing passwords. Defaults to the number of CPUs, "
+            "1 hashes in this process.",
+        )
+        parser.add_argument(
+            "--create-missing",
+            action="store_true",
+            help="Create unknown skills, niches and languages instead of "
+            "skipping their rows.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        format = options["format"] or os.path.splitext(path)[1].lstrip(".").lower()
+        if format not in READERS:
+            raise CommandError("Pass --format ndjson or --format csv.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        try:
+            stream = (
+                sys.stdin
+                if path == "-"
+                else open(path, newline="", encoding="utf-8-sig")
+            )
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}")
+
+        with stream, FreelancerImporter(
+            workers=options["workers"], create_missing=options["create_missing"]
+        ) as importer:
+            batch = []
+            for row in READERS[format](stream):
+                batch.append(row)
+                if len(batch) == options["batch_size"]:
+                    self.import_batch(importer, batch)
+                    batch = []
+            if batch:
+                self.import_batch(importer, batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {importer.imported} freelancers, skipped "
+                f"{importer.skipped} rows ({importer.rows_per_second:.0f} rows/sec)."
+            )
+        )
+
+    def import_batch(self, importer, batch):
+        started_at = time.perf_counter()
+        errors = importer.import_batch(batch)
+        for line_number, error in errors:
+            self.stderr.write(f"Line {line_number}: {error}")
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            f"Batch of {len(batch)} rows: {len(batch) - len(errors)} imported, "
+            f"{len(errors)} skipped ({len(batch) / elapsed:.0f} rows/sec)."
+        )
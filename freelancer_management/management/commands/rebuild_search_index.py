@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from freelancer_management.models import FreelancerProfile
+from freelancer_management.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index of every freelancer profile."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of profiles indexed per batch.",
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            raise CommandError("The configured database has no full-text backend.")
+
+        backend.install()
+        batch_size = options["batch_size"]
+        profile_ids = FreelancerProfile.objects.order_by("id").values_list(
+            "id", flat=True
+        )
+
+        indexed = 0
+        batch = []
+        for profile_id in profile_ids.iterator(chunk_size=batch_size):
+            batch.append(profile_id)
+            if len(batch) == batch_size:
+                backend.index_profiles(batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            backend.index_profiles(batch)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} profiles."))
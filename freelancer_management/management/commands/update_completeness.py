@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from freelancer_management.cache import invalidate_profiles
+from freelancer_management.completeness import update_completeness
+from freelancer_management.models import FreelancerProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the completeness score of every freelancer profile, e.g. "
+        "after adding the column or changing the weights."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of profiles updated per statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        profile_ids = FreelancerProfile.objects.order_by("id").values_list(
+            "id", flat=True
+        )
+
+        updated = 0
+        batch = []
+        for profile_id in profile_ids.iterator(chunk_size=batch_size):
+            batch.append(profile_id)
+            if len(batch) == batch_size:
+                self.update(batch)
+                updated += len(batch)
+                batch = []
+        if batch:
+            self.update(batch)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} profiles."))
+
+    @staticmethod
+    def update(profile_ids):
+        update_completeness(profile_ids)
+        # Cached representations carry the old score
+        invalidate_profiles(profile_ids)
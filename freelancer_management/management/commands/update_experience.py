@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from freelancer_management.experience import open_ended_profiles
+from freelancer_management.models import FreelancerProfile
+from freelancer_management.signals import refresh_experience
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the months of experience of the freelancer profiles with "
+        "an ongoing role, which grow without any write. Run it nightly; with "
+        "--all, every profile is recomputed, e.g. after adding the column."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every profile, not only those with an ongoing role.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of profiles recomputed at once.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if options["all"]:
+            profile_ids = FreelancerProfile.objects.order_by("id").values_list(
+                "id", flat=True
+            )
+        else:
+            profile_ids = open_ended_profiles()
+
+        checked = updated = 0
+        batch = []
+        for profile_id in profile_ids.iterator(chunk_size=batch_size):
+            batch.append(profile_id)
+            if len(batch) == batch_size:
+                updated += len(refresh_experience(batch))
+                checked += len(batch)
+                batch = []
+        if batch:
+            updated += len(refresh_experience(batch))
+            checked += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} profiles, updated {updated}.")
+        )
@@ -0,0 +1,215 @@
+"""
+Set-based helpers for a freelancer's skill, niche and language memberships.
+
+Every helper validates ids with a single `IN` query and writes with bulk
+statements, so their cost does not grow with the number of ids.
+"""
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from freelancer_management.models import (
+    FreelancerLanguage,
+    FreelancerNiche,
+    FreelancerSkill,
+    Language,
+    Niche,
+    Skill,
+)
+from freelancer_management.signals import profiles_changed
+
+# membership model -> (taxonomy model, foreign key name on the membership)
+MEMBERSHIPS = {
+    FreelancerSkill: (Skill, "skill"),
+    FreelancerNiche: (Niche, "niche"),
+    FreelancerLanguage: (Language, "language"),
+}
+
+# Per-id outcomes reported by add_memberships / remove_memberships
+CREATED = "created"
+EXISTS = "exists"
+REMOVED = "removed"
+NOT_FOUND = "not_found"
+NOT_MEMBER = "not_member"
+
+
+def parse_ids(values):
+    """
+    Turns ids from a request body or a comma separated query string into
+    integers. Values that are not integers are kept as they are so they can be
+    reported as unknown ids.
+    """
+    if isinstance(values, str):
+        values = values.split(",")
+    elif not isinstance(values, (list, tuple)):
+        values = [values]
+    ids = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+        try:
+            ids.append(int(value))
+        except (TypeError, ValueError):
+            ids.append(value)
+    return unique(ids)
+
+
+def unique(ids):
+    """
+    Drops duplicate ids while keeping the order they were sent in.
+    """
+    return list(dict.fromkeys(ids))
+
+
+def missing_id_errors(taxonomy_model, ids):
+    """
+    Returns a "<Model> with id <id> does not exist." error for every id in
+    `ids` that has no row in `taxonomy_model`.
+    """
+    ids = unique(ids)
+    found = set(taxonomy_model.objects.filter(id__in=ids).values_list("id", flat=True))
+    name = taxonomy_model.__name__
+    return [f"{name} with id {id} does not exist." for id in ids if id not in found]
+
+
+def sync_memberships(membership_model, freelancer, ids):
+    """
+    Makes the freelancer's memberships match `ids` exactly: rows no longer
+    wanted are deleted and only the new ones are created. The ids must
+    already be validated.
+    """
+    _, field = MEMBERSHIPS[membership_model]
+    wanted = set(ids)
+    rows = membership_model.objects.filter(freelancer=freelancer)
+    existing = set(rows.values_list(f"{field}_id", flat=True))
+
+    removed = existing - wanted
+    if removed:
+        rows.filter(**{f"{field}_id__in": removed}).delete()
+
+    added = [id for id in unique(ids) if id not in existing]
+    if added:
+        membership_model.objects.bulk_create(
+            [
+                membership_model(freelancer=freelancer, **{f"{field}_id": id})
+                for id in added
+            ]
+        )
+        # bulk_create does not send post_save
+        profiles_changed([freelancer.id])
+    return added, removed
+
+
+def lookup_memberships(membership_model, freelancer, ids):
+    """
+    Returns {id: (name, is_member)} for the ids that exist, in one query.
+    """
+    taxonomy_model, field = MEMBERSHIPS[membership_model]
+    valid_ids = [id for id in ids if isinstance(id, int)]
+    is_member = Exists(
+        membership_model.objects.filter(
+            freelancer=freelancer, **{field: OuterRef("pk")}
+        )
+    )
+    rows = (
+        taxonomy_model.objects.filter(id__in=valid_ids)
+        .annotate(is_member=is_member)
+        .values_list("id", "name", "is_member")
+    )
+    return {id: (name, member) for id, name, member in rows}
+
+
+def classify(ids, found, member, not_member):
+    """
+    Maps each id to NOT_FOUND, or to `member` / `not_member` depending on
+    whether the freelancer already has it.
+    """
+    return {
+        id: NOT_FOUND if id not in found else member if found[id][1] else not_member
+        for id in ids
+    }
+
+
+def add_memberships(membership_model, freelancer, ids):
+    """
+    Adds the given ids to the freelancer with one validation query and one
+    insert. Returns ({id: CREATED | EXISTS | NOT_FOUND}, {id: name}).
+    """
+    _, field = MEMBERSHIPS[membership_model]
+    ids = unique(ids)
+    found = lookup_memberships(membership_model, freelancer, ids)
+
+    results = classify(ids, found, member=EXISTS, not_member=CREATED)
+
+    added = [id for id, result in results.items() if result == CREATED]
+    if added:
+        # A concurrent request adding the same id is absorbed by the unique
+        # constraint instead of failing the whole batch.
+        membership_model.objects.bulk_create(
+            [
+                membership_model(freelancer=freelancer, **{f"{field}_id": id})
+                for id in added
+            ],
+            ignore_conflicts=True,
+        )
+        # bulk_create does not send post_save
+        profiles_changed([freelancer.id])
+    return results, {id: name for id, (name, _) in found.items()}
+
+
+def remove_memberships(membership_model, freelancer, ids):
+    """
+    Removes the given ids from the freelancer with one validation query and
+    one filtered delete. Returns {id: REMOVED | NOT_MEMBER | NOT_FOUND}.
+    """
+    _, field = MEMBERSHIPS[membership_model]
+    ids = unique(ids)
+    found = lookup_memberships(membership_model, freelancer, ids)
+
+    results = classify(ids, found, member=REMOVED, not_member=NOT_MEMBER)
+
+    removed = [id for id, result in results.items() if result == REMOVED]
+    if removed:
+        membership_model.objects.filter(
+            freelancer=freelancer, **{f"{field}_id__in": removed}
+        ).delete()
+    return results
+
+
+@transaction.atomic
+def replace_memberships(membership_model, freelancer, ids, limit=None):
+    """
+    Makes `ids` the freelancer's full set of memberships, diffing against the
+    current rows. Nothing is written when an id is unknown or `limit` is
+    exceeded. Returns ({id: CREATED | EXISTS | NOT_FOUND}, {id: name}, errors).
+    """
+    taxonomy_model, _ = MEMBERSHIPS[membership_model]
+    ids = unique(ids)
+    errors = []
+    if limit is not None and len(ids) > limit:
+        errors.append(f"Maximum of {limit} {taxonomy_model.__name__}s Per user.")
+
+    found = lookup_memberships(membership_model, freelancer, ids)
+    results = classify(ids, found, member=EXISTS, not_member=CREATED)
+
+    errors += membership_errors(membership_model, results)
+    if not errors:
+        sync_memberships(membership_model, freelancer, ids)
+    return results, {id: name for id, (name, _) in found.items()}, errors
+
+
+def membership_errors(membership_model, results):
+    """
+    Builds the error messages the membership endpoints return for `results`.
+    """
+    taxonomy_model, _ = MEMBERSHIPS[membership_model]
+    name = taxonomy_model.__name__
+    errors = []
+    for id, result in results.items():
+        if result == NOT_FOUND:
+            errors.append(f"{name} with id {id} does not exist.")
+        elif result == NOT_MEMBER:
+            errors.append(f"{name} with id {id} is not on this profile.")
+    return errors
@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from profile_management.models import ProfileBase
 
@@ -26,17 +27,39 @@ class Language(models.Model):
         return self.name
 
 
+class Tool(models.Model):
+    id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
 class FreelancerProfile(ProfileBase):
     bio = models.CharField(max_length=60, blank=True, null=True)
     about_me = models.TextField(max_length=1200, blank=True, null=True)
     location = models.CharField(max_length=300, blank=True, null=True)
     profile_pic = models.URLField(null=True, blank=True)
     profile_pic_public_id = models.CharField(max_length=255, blank=True, null=True)
+    profile_pic_thumbnail = models.URLField(null=True, blank=True)
     resume = models.URLField(null=True, blank=True)
     resume_public_id = models.CharField(max_length=255, blank=True, null=True)
     first_name = models.CharField(max_length=255, blank=True, null=True)
     last_name = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also bumped when rows on the profile change (freelancer_management.signals)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Full-text document on PostgreSQL, maintained by freelancer_management.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    # 0-100, maintained by freelancer_management.completeness
+    completeness = models.PositiveSmallIntegerField(
+        default=0, db_index=True, editable=False
+    )
+    # Months covered by the work experiences, maintained by
+    # freelancer_management.experience
+    total_experience_months = models.PositiveSmallIntegerField(
+        default=0, db_index=True, editable=False
+    )
 
     def __str__(self):
         return self.user.username
@@ -101,11 +124,16 @@ class Project(models.Model):
     )
     image = models.URLField(null=True, blank=True)
     image_public_id = models.CharField(max_length=255, blank=True, null=True)
+    image_thumbnail = models.URLField(null=True, blank=True)
     name = models.CharField(max_length=255)
     skills = models.CharField(max_length=255, default="")
     description = models.TextField(default="")
     tools = models.CharField(max_length=255, default="")
+    # `skills` and `tools` parsed into rows, see freelancer_management.project_tags
+    skill_tags = models.ManyToManyField(Skill, related_name="projects", blank=True)
+    tool_tags = models.ManyToManyField(Tool, related_name="projects", blank=True)
     url = models.URLField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.freelancer.username} - {self.name}"
@@ -123,6 +151,7 @@ class WorkExperience(models.Model):
     end_date = models.DateField(blank=True, null=True)
     current_role = models.BooleanField(default=False)
     description = models.TextField(max_length=2000)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.freelancer.username} - {self.name}"
@@ -0,0 +1,112 @@
+"""
+Skills and tools of projects.
+
+Clients send and read a project's skills and tools as comma separated
+strings. The strings are kept as they were sent and mirrored into the
+`skill_tags` and `tool_tags` relations, so "projects using React" is an
+indexed join on the relation table instead of a LIKE scan over the strings.
+Names are matched case-insensitively. Unknown tools are created, tools only
+appear on projects; unknown skills are left out of the relation, so free
+text never reaches the skill taxonomy profiles, autocomplete and filters
+use.
+"""
+
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from freelancer_management.models import Project, Skill, Tool
+from freelancer_management.taxonomy import TAXONOMIES
+
+# string field -> (relation, taxonomy model, whether unknown names are created)
+TAG_FIELDS = {
+    "skills": ("skill_tags", Skill, False),
+    "tools": ("tool_tags", Tool, True),
+}
+
+
+def split_names(value):
+    """
+    Splits a comma separated string into names, dropping blanks and
+    duplicates that only differ in case or spacing.
+    """
+    names = {}
+    for name in (value or "").split(","):
+        name = " ".join(name.split())
+        if name:
+            names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+def resolve_names(taxonomy_model, names, create=True):
+    """
+    Returns {lowercased name: id} for `names`, with `create` creating the
+    missing ones with one insert. Looked up in the table rather than the
+    taxonomy cache, which may still hold ids of rolled back inserts.
+    """
+    wanted = {name.lower(): name for name in names}
+    if not wanted:
+        return {}
+    rows = taxonomy_model.objects.annotate(key=Lower("name")).filter(key__in=wanted)
+    ids = dict(rows.values_list("key", "id"))
+    missing = [name for key, name in wanted.items() if key not in ids]
+    if not missing or not create:
+        return ids
+
+    taxonomy_model.objects.bulk_create(
+        [taxonomy_model(name=name) for name in missing], ignore_conflicts=True
+    )
+    # bulk_create sends no post_save: bumped now so this worker sees its
+    # write, and after commit so no worker keeps an older copy
+    taxonomy = TAXONOMIES[taxonomy_model]
+    taxonomy.bump()
+    transaction.on_commit(taxonomy.bump)
+    created = taxonomy_model.objects.filter(name__in=missing)
+    ids.update((name.lower(), id) for id, name in created.values_list("id", "name"))
+    return ids
+
+
+@transaction.atomic
+def set_project_tags(projects):
+    """
+    Mirrors the `skills` and `tools` strings of `projects` into their
+    relations: one name lookup, one delete and one insert per relation,
+    whatever the number of projects.
+    """
+    for field, (relation, taxonomy_model, create) in TAG_FIELDS.items():
+        names = {
+            project.id: split_names(getattr(project, field)) for project in projects
+        }
+        ids = resolve_names(
+            taxonomy_model,
+            [name for values in names.values() for name in values],
+            create,
+        )
+        through = getattr(Project, relation).through
+        column = f"{taxonomy_model._meta.model_name}_id"
+        through.objects.filter(project_id__in=names).delete()
+        through.objects.bulk_create(
+            [
+                through(project_id=project_id, **{column: ids[name.lower()]})
+                for project_id, values in names.items()
+                for name in values
+                if name.lower() in ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def filter_by_tags(queryset, field, value):
+    """
+    Narrows `queryset` to the projects tagged with every name in the comma
+    separated `value`. Names are resolved from the taxonomy cache, so an
+    unknown one matches nothing without a query.
+    """
+    relation, taxonomy_model, _ = TAG_FIELDS[field]
+    known = TAXONOMIES[taxonomy_model].get().ids
+    for name in split_names(value):
+        id = known.get(name.lower())
+        if id is None:
+            return queryset.none()
+        # One join per name: projects having all of them
+        queryset = queryset.filter(**{relation: id})
+    return queryset
@@ -0,0 +1,211 @@
+"""
+Full-text search over freelancer profiles.
+
+Each profile is indexed as a weighted document made of its names, bio,
+about_me and the names of its skills, niches and languages. On PostgreSQL the
+document lives in `FreelancerProfile.search_vector` behind a GIN index; on
+SQLite it lives in an FTS5 virtual table so search can be exercised locally.
+Other databases fall back to DRF's `icontains` search.
+
+Writes to a profile or its memberships reindex just that profile after commit
+(see `freelancer_management.signals`); `manage.py rebuild_search_index`
+rebuilds everything.
+"""
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.db.models import Case, FloatField, Value, When
+
+from freelancer_management.models import (
+    FreelancerLanguage,
+    FreelancerNiche,
+    FreelancerProfile,
+    FreelancerSkill,
+)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_documents(profile_ids):
+    """
+    Returns {profile_id: {"names", "bio", "about_me", "tags"}} for the given
+    profiles using one query per table.
+    """
+    documents = {}
+    profiles = FreelancerProfile.objects.filter(id__in=profile_ids).values_list(
+        "id", "first_name", "last_name", "user__username", "bio", "about_me"
+    )
+    for id, first_name, last_name, username, bio, about_me in profiles:
+        documents[id] = {
+            "names": " ".join(filter(None, [first_name, last_name, username])),
+            "bio": bio or "",
+            "about_me": about_me or "",
+            "tags": [],
+        }
+
+    for model, name_field in [
+        (FreelancerSkill, "skill__name"),
+        (FreelancerNiche, "niche__name"),
+        (FreelancerLanguage, "language__name"),
+    ]:
+        rows = model.objects.filter(freelancer_id__in=documents).values_list(
+            "freelancer_id", name_field
+        )
+        for freelancer_id, name in rows:
+            documents[freelancer_id]["tags"].append(name)
+
+    for document in documents.values():
+        document["tags"] = " ".join(document["tags"])
+    return documents
+
+
+class PostgresSearchBackend:
+    """
+    Stores a weighted tsvector per profile and ranks matches with ts_rank.
+    """
+
+    config = "english"
+    index_name = "freelancer_profile_search_gin"
+
+    def install(self):
+        table = FreelancerProfile._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.index_name} "
+                f"ON {table} USING gin (search_vector)"
+            )
+
+    def index_profiles(self, profile_ids):
+        from django.contrib.postgres.search import SearchVector
+
+        def vector(text, weight):
+            return SearchVector(Value(text), weight=weight, config=self.config)
+
+        for id, document in build_documents(profile_ids).items():
+            FreelancerProfile.objects.filter(id=id).update(
+                search_vector=vector(document["names"], "A")
+                + vector(document["tags"], "B")
+                + vector(document["bio"], "B")
+                + vector(document["about_me"], "C")
+            )
+
+    def remove_profiles(self, profile_ids):
+        # The vector is a column of the profile row and goes away with it
+        pass
+
+    def search(self, queryset, terms):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(terms, search_type="websearch", config=self.config)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank("search_vector", query)
+        )
+
+
+class SQLiteSearchBackend:
+    """
+    Keeps profile documents in an FTS5 table keyed by profile id and ranks
+    matches with bm25.
+    """
+
+    table = "freelancer_profile_search"
+    # bm25 weights for the names, tags, bio and about_me columns
+    weights = (10.0, 5.0, 5.0, 2.0)
+    # Upper bound of ranked matches turned into a queryset
+    max_results = 1000
+
+    def install(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                "USING fts5(names, tags, bio, about_me)"
+            )
+
+    def index_profiles(self, profile_ids):
+        documents = build_documents(profile_ids)
+        with connection.cursor() as cursor:
+            self._delete(cursor, profile_ids)
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, names, tags, bio, about_me) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [
+                    (id, d["names"], d["tags"], d["bio"], d["about_me"])
+                    for id, d in documents.items()
+                ],
+            )
+
+    def remove_profiles(self, profile_ids):
+        with connection.cursor() as cursor:
+            self._delete(cursor, profile_ids)
+
+    def _delete(self, cursor, profile_ids):
+        profile_ids = list(profile_ids)
+        if profile_ids:
+            placeholders = ", ".join(["%s"] * len(profile_ids))
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})",
+                profile_ids,
+            )
+
+    def search(self, queryset, terms):
+        tokens = TOKEN_RE.findall(terms)
+        if not tokens:
+            return queryset.none()
+
+        # Every token has to match, the last one as a prefix (type-ahead)
+        match = " ".join(f'"{token}"' for token in tokens) + "*"
+        weights = ", ".join(str(weight) for weight in self.weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, -bm25({self.table}, {weights}) AS rank "
+                f"FROM {self.table} WHERE {self.table} MATCH %s "
+                "ORDER BY rank DESC LIMIT %s",
+                [match, self.max_results],
+            )
+            ranks = cursor.fetchall()
+
+        if not ranks:
+            return queryset.none()
+        return queryset.filter(id__in=[id for id, _ in ranks]).annotate(
+            search_rank=Case(
+                *[When(id=id, then=Value(rank)) for id, rank in ranks],
+                output_field=FloatField(),
+            )
+        )
+
+
+def get_search_backend():
+    """
+    Returns the search backend for the default database, or None when the
+    database has no supported full-text engine.
+    """
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    if connection.vendor == "sqlite":
+        return SQLiteSearchBackend()
+    return None
+
+
+def install_search_backend(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate hook creating the index structures the backend needs.
+    """
+    if using != DEFAULT_DB_ALIAS:
+        return
+
+    backend = get_search_backend()
+    if backend is not None:
+        backend.install()
+
+
+def index_profiles(profile_ids):
+    backend = get_search_backend()
+    if backend is not None and profile_ids:
+        backend.index_profiles(profile_ids)
+
+
+def remove_profiles(profile_ids):
+    backend = get_search_backend()
+    if backend is not None and profile_ids:
+        backend.remove_profiles(profile_ids)
@@ -1,5 +1,13 @@
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
+from profile_management.models import User
 from profile_management.serializers import UserDetailsSerializer
+from .memberships import missing_id_errors, sync_memberships, unique
+from .project_tags import TAG_FIELDS, set_project_tags
+from .taxonomy import language_taxonomy, niche_taxonomy, skill_taxonomy
 from .models import (
     FreelancerLanguage,
     FreelancerNiche,
@@ -94,30 +102,116 @@ class FreelanceProfileSerializer(serializers.ModelSerializer):
             "about_me",
             "location",
             "profile_pic",
+            "profile_pic_thumbnail",
             "resume",
             "links",
             "skills",
             "niches",
             "languages",
+            "completeness",
+            "total_experience_months",
             "created_at",
+            "updated_at",
         ]
 
+    # Rendered from other tables; every other field is a profile column
+    relation_fields = ["user", "links", "skills", "niches", "languages"]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        `fields` limits the representation to those fields, see
+        get_requested_fields().
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def get_requested_fields(cls, query_params):
+        """
+        Parses the `fields` and `expand` query parameters into the list of
+        fields to render, or None to render all of them.
+
+        `fields` picks top-level fields. `expand` picks the relations to
+        render (user, links, skills, niches, languages); on its own it keeps
+        every plain field, so `?expand=` alone drops all relations.
+        """
+        fields = cls.split_param(query_params.get("fields"))
+        expand = cls.split_param(query_params.get("expand"))
+        if not fields and "expand" not in query_params:
+            return None
+
+        errors = {}
+        unknown = [name for name in fields if name not in cls.Meta.fields]
+        if unknown:
+            errors["fields"] = [f"Unknown field: {name}" for name in unknown]
+        unknown = [name for name in expand if name not in cls.relation_fields]
+        if unknown:
+            errors["expand"] = [f"Unknown relation: {name}" for name in unknown]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        selected = set(fields or cls.Meta.fields) - set(cls.relation_fields)
+        selected.update(name for name in fields if name in cls.relation_fields)
+        selected.update(expand)
+        return [name for name in cls.Meta.fields if name in selected]
+
+    @staticmethod
+    def split_param(value):
+        return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+    @staticmethod
+    def get_prefetches(fields=None):
+        # Names are resolved from the taxonomy cache, not joined in
+        prefetches = ["links", "niches", "skills", "languages"]
+        return [name for name in prefetches if fields is None or name in fields]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        """
+        Loads every relation the representation touches up front, so a page of
+        profiles costs a fixed number of queries regardless of its size. With
+        `fields`, only the columns and relations those fields need are loaded.
+        """
+        queryset = queryset.select_related("user")
+        if fields is not None:
+            # The username, completeness and experience are ordering and cursor keys
+            columns = [
+                "user",
+                "user__username",
+                "completeness",
+                "total_experience_months",
+            ]
+            columns += [name for name in fields if name not in cls.relation_fields]
+            if "user" in fields:
+                columns += ["user__uuid", "user__email", "user__role"]
+            queryset = queryset.only(*columns)
+        return queryset.prefetch_related(*cls.get_prefetches(fields))
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation["niches"] = extract_values(
-            ListFreelancerNicheSerializer(instance.niches, many=True).data,
-            "niche",
-        )
-        representation["skills"] = extract_values(
-            ListFreelancerSkillSerializer(instance.skills, many=True).data,
-            "skill",
-        )
-        representation["languages"] = extract_values(
-            ListFreelancerLanguageSerializer(instance.languages, many=True).data,
-            "language",
-        )
+        # `.all()` is served from the prefetch cache set up by setup_eager_loading
+        if "niches" in self.fields:
+            representation["niches"] = extract_values(
+                ListFreelancerNicheSerializer(instance.niches.all(), many=True).data,
+                "niche",
+            )
+        if "skills" in self.fields:
+            representation["skills"] = extract_values(
+                ListFreelancerSkillSerializer(instance.skills.all(), many=True).data,
+                "skill",
+            )
+        if "languages" in self.fields:
+            representation["languages"] = extract_values(
+                ListFreelancerLanguageSerializer(
+                    instance.languages.all(), many=True
+                ).data,
+                "language",
+            )
         return representation
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         niches_data = validated_data.pop("niches", [])
         skills_data = validated_data.pop("skills", [])
@@ -125,67 +219,57 @@ class FreelanceProfileSerializer(serializers.ModelSerializer):
         links_data = validated_data.pop("links", [])
         errors = []
 
-        # Update freelancer profile fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        # Update niches
+        # Validate every id up front, one query per relation
         if niches_data:
             # To make sure the user does not add more than 3 niches
-            if len(niches_data) > 3:
+            if len(unique(niches_data)) > 3:
                 errors.append("Maximum of 3 Niches Per user.")
-
-            FreelancerNiche.objects.filter(freelancer=instance).delete()
-            for niche_id in niches_data:
-                try:
-                    niche = Niche.objects.get(id=niche_id)
-                    FreelancerNiche.objects.get_or_create(
-                        freelancer=instance, niche=niche
-                    )
-                except Niche.DoesNotExist:
-                    errors.append(f"Niche with id {niche_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        # Update skills
+            errors += missing_id_errors(Niche, niches_data)
         if skills_data:
-            FreelancerSkill.objects.filter(freelancer=instance).delete()
-            for skill_id in skills_data:
-                try:
-                    skill = Skill.objects.get(id=skill_id)
-                    FreelancerSkill.objects.get_or_create(
-                        freelancer=instance, skill=skill
-                    )
-                except Skill.DoesNotExist:
-                    errors.append(f"Skill with id {skill_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        # Update languages
+            errors += missing_id_errors(Skill, skills_data)
         if languages_data:
-            FreelancerLanguage.objects.filter(freelancer=instance).delete()
-            for language_id in languages_data:
-                try:
-                    language = Language.objects.get(id=language_id)
-                    FreelancerLanguage.objects.get_or_create(
-                        freelancer=instance, language=language
-                    )
-                except Language.DoesNotExist:
-                    errors.append(f"Language with id {language_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        # Update links
-        if links_data:
-            FreelancerLink.objects.filter(freelancer=instance).delete()
-            for link_data in links_data:
-                FreelancerLink.objects.create(freelancer=instance, **link_data)
+            errors += missing_id_errors(Language, languages_data)
 
         # Raise ValidationError if errors occurred
         if errors:
             raise serializers.ValidationError({"errors": errors})
 
+        # Update freelancer profile fields
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save()
+
+        # Only the rows that changed are deleted or created
+        if niches_data:
+            sync_memberships(FreelancerNiche, instance, niches_data)
+        if skills_data:
+            sync_memberships(FreelancerSkill, instance, skills_data)
+        if languages_data:
+            sync_memberships(FreelancerLanguage, instance, languages_data)
+
+        # Update links, keeping the ones that are sent back unchanged
+        if links_data:
+            wanted = [
+                (link["name"], link.get("icon", ""), link["url"]) for link in links_data
+            ]
+            existing = {
+                (link.name, link.icon, link.url): link.id
+                for link in FreelancerLink.objects.filter(freelancer=instance)
+            }
+            removed = [id for key, id in existing.items() if key not in wanted]
+            if removed:
+                FreelancerLink.objects.filter(id__in=removed).delete()
+            FreelancerLink.objects.bulk_create(
+                [
+                    FreelancerLink(freelancer=instance, name=name, icon=icon, url=url)
+                    for name, icon, url in dict.fromkeys(wanted)
+                    if (name, icon, url) not in existing
+                ]
+            )
+
+        # Relations were rewritten above, reload them for the response
+        instance._prefetched_objects_cache = {}
+        prefetch_related_objects([instance], *self.get_prefetches())
         return instance
 
 
@@ -214,12 +298,10 @@ class ListFreelancerSkillSerializer(serializers.ModelSerializer):
         fields = ["skill"]
 
     def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["skill"] = {
-            "skill": SkillSerializer(instance.skill).data["name"],
-            "id": SkillSerializer(instance.skill).data["id"],
-        }
-        return representation
+        # Built from the taxonomy cache instead of running SkillSerializer
+        # twice per membership; the related row is only loaded on a miss.
+        name = skill_taxonomy.name(instance.skill_id) or instance.skill.name
+        return {"skill": {"skill": name, "id": instance.skill_id}}
 
 
 class FreelancerLanguageSerializer(serializers.ModelSerializer):
@@ -238,12 +320,8 @@ class ListFreelancerLanguageSerializer(serializers.ModelSerializer):
         fields = ["language"]
 
     def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["language"] = {
-            "language": LanguageSerializer(instance.language).data["name"],
-            "id": LanguageSerializer(instance.language).data["id"],
-        }
-        return representation
+        name = language_taxonomy.name(instance.language_id) or instance.language.name
+        return {"language": {"language": name, "id": instance.language_id}}
 
 
 # For use in the FreelanceProfileSerializer
@@ -253,12 +331,8 @@ class ListFreelancerNicheSerializer(serializers.ModelSerializer):
         fields = ["niche"]
 
     def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["niche"] = {
-            "niche": NicheSerializer(instance.niche).data["name"],
-            "id": NicheSerializer(instance.niche).data["id"],
-        }
-        return representation
+        name = niche_taxonomy.name(instance.niche_id) or instance.niche.name
+        return {"niche": {"niche": name, "id": instance.niche_id}}
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -274,10 +348,80 @@ class ProjectSerializer(serializers.ModelSerializer):
             "description",
             "image",
             "image_public_id",
+            "image_thumbnail",
+            "updated_at",
         ]
 
+    # The strings are what clients read, the tags are what search uses
+    @transaction.atomic
+    def create(self, validated_data):
+        project = super().create(validated_data)
+        set_project_tags([project])
+        return project
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        project = super().update(instance, validated_data)
+        if validated_data.keys() & TAG_FIELDS.keys():
+            set_project_tags([project])
+        return project
+
 
 class WorkExperienceSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkExperience
         fields = "__all__"
+
+
+class FreelancerImportSerializer(serializers.Serializer):
+    """
+    Validates one row of `manage.py import_freelancers` without touching the
+    database; taken usernames and emails and taxonomy names are checked per
+    batch (see freelancer_management.imports). Skills, niches and languages
+    are names, as a list or a "; " separated string.
+    """
+
+    username = serializers.CharField(max_length=255)
+    email = serializers.EmailField(max_length=254)
+    # Left out, the account gets an unusable password and resets it by OTP
+    password = serializers.CharField(
+        required=False, allow_blank=True, trim_whitespace=False
+    )
+    first_name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    bio = serializers.CharField(max_length=60, required=False, allow_blank=True)
+    about_me = serializers.CharField(max_length=1200, required=False, allow_blank=True)
+    location = serializers.CharField(max_length=300, required=False, allow_blank=True)
+    skills = serializers.ListField(
+        child=serializers.CharField(max_length=255), required=False
+    )
+    niches = serializers.ListField(
+        child=serializers.CharField(max_length=255), required=False
+    )
+    languages = serializers.ListField(
+        child=serializers.CharField(max_length=255), required=False
+    )
+
+    list_fields = ["skills", "niches", "languages"]
+
+    def to_internal_value(self, data):
+        data = dict(data)
+        for name in self.list_fields:
+            if isinstance(data.get(name), str):
+                data[name] = [item for item in data[name].split(";") if item.strip()]
+        return super().to_internal_value(data)
+
+    def validate_niches(self, niches):
+        # Same limit as FreelanceProfileSerializer.update
+        if len(unique([name.lower() for name in niches])) > 3:
+            raise serializers.ValidationError("Maximum of 3 Niches Per user.")
+        return niches
+
+    def validate(self, attrs):
+        if attrs.get("password"):
+            user = User(username=attrs["username"], email=attrs["email"])
+            try:
+                validate_password(attrs["password"], user)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError({"password": list(e.messages)})
+        return attrs
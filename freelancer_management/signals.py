@@ -0,0 +1,185 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from freelancer_management.cache import invalidate_profile, invalidate_profiles
+from freelancer_management.completeness import update_completeness
+from freelancer_management.experience import update_experience
+from freelancer_management.models import (
+    FreelancerLanguage,
+    FreelancerLink,
+    FreelancerNiche,
+    FreelancerProfile,
+    FreelancerSkill,
+    Language,
+    Niche,
+    Project,
+    Skill,
+    WorkExperience,
+)
+from freelancer_management.search import index_profiles, remove_profiles
+from freelancer_management.taxonomy import TAXONOMIES
+from profile_management.models import User
+
+# Rows that are part of a freelancer's profile document
+PROFILE_CHILD_MODELS = [
+    FreelancerSkill,
+    FreelancerNiche,
+    FreelancerLanguage,
+    FreelancerLink,
+    Project,
+    WorkExperience,
+]
+
+# Memberships whose names are part of the search document, with the
+# taxonomy model they point at and the lookup from a profile to it
+SEARCHABLE_MEMBERSHIPS = {
+    FreelancerSkill: (Skill, "skills__skill"),
+    FreelancerNiche: (Niche, "niches__niche"),
+    FreelancerLanguage: (Language, "languages__language"),
+}
+
+
+class PendingProfiles:
+    """
+    Collects profile ids during a transaction and hands them to `callback` in
+    one call after it commits, so a write touching many rows of the same
+    profile costs one refresh instead of one per row.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.local = threading.local()
+
+    def add(self, profile_ids):
+        pending = self.local.__dict__.setdefault("profile_ids", set())
+        pending.update(profile_ids)
+        # Registered on every call: callbacks of a rolled back transaction are
+        # discarded, and the extra ones of a committed one find nothing to do.
+        transaction.on_commit(self.flush)
+
+    def flush(self):
+        profile_ids = self.local.__dict__.pop("profile_ids", set())
+        if profile_ids:
+            self.callback(profile_ids)
+
+
+def touch_profiles(profile_ids):
+    FreelancerProfile.objects.filter(id__in=profile_ids).update(
+        updated_at=timezone.now()
+    )
+
+
+def refresh_experience(profile_ids):
+    """
+    Recomputes the months of experience of the profiles, then bumps the
+    validators and drops the cached copy of those whose months changed.
+    Callbacks run in the order they were first registered, so another
+    write of the same transaction may have flushed the invalidations
+    already.
+    """
+    changed = update_experience(profile_ids)
+    if changed:
+        touch_profiles(changed)
+        invalidate_profiles(changed)
+    return changed
+
+
+pending_experience = PendingProfiles(refresh_experience)
+# Flushed in this order: the score is part of the cached copy and the
+# validators move before the cached copy goes
+pending_completeness = PendingProfiles(update_completeness)
+pending_touches = PendingProfiles(touch_profiles)
+pending_invalidations = PendingProfiles(invalidate_profiles)
+pending_reindexes = PendingProfiles(index_profiles)
+
+
+def profiles_changed(profile_ids, search=True, touch=True, experience=False):
+    """
+    Refreshes profiles after commit: recomputes their completeness (and
+    with `experience`, their months of experience), bumps
+    their `updated_at` (conditional GET validators), drops their cached copy
+    and reindexes them. Called by the
+    signals below and by bulk write paths that bypass model signals
+    (bulk_create, update).
+    """
+    profile_ids = list(profile_ids)
+    if experience:
+        pending_experience.add(profile_ids)
+    pending_completeness.add(profile_ids)
+    if touch:
+        pending_touches.add(profile_ids)
+    pending_invalidations.add(profile_ids)
+    if search:
+        pending_reindexes.add(profile_ids)
+
+
+@receiver(post_save, sender=FreelancerProfile)
+def freelancer_profile_saved(sender, instance, **kwargs):
+    # save() has just set updated_at itself
+    profiles_changed([instance.id], touch=False)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    # The profile representation embeds the user, but logins only stamp
+    # last_login and should not invalidate anything
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    profiles_changed(
+        FreelancerProfile.objects.filter(user=instance).values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=FreelancerProfile)
+def freelancer_profile_deleted(sender, instance, **kwargs):
+    # The profile row is gone after commit, so resolve the uuid now
+    uuid, profile_id = instance.user.uuid, instance.id
+    transaction.on_commit(lambda: invalidate_profile(uuid))
+    transaction.on_commit(lambda: remove_profiles([profile_id]))
+
+
+def freelancer_profile_child_changed(sender, instance, **kwargs):
+    profiles_changed(
+        [instance.freelancer_id],
+        search=sender in SEARCHABLE_MEMBERSHIPS,
+        experience=sender is WorkExperience,
+    )
+
+
+def taxonomy_renamed(sender, instance, created, **kwargs):
+    # A new skill/niche/language is not on any profile yet
+    if created:
+        return
+
+    lookup = next(
+        lookup for model, lookup in SEARCHABLE_MEMBERSHIPS.values() if model is sender
+    )
+    profiles_changed(
+        FreelancerProfile.objects.filter(**{lookup: instance}).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def taxonomy_changed(sender, **kwargs):
+    # Bumped right away so this worker sees its own write, and again after
+    # commit so no worker keeps a copy it reloaded before the commit.
+    taxonomy = TAXONOMIES[sender]
+    taxonomy.bump()
+    transaction.on_commit(taxonomy.bump)
+
+
+for model in PROFILE_CHILD_MODELS:
+    post_save.connect(freelancer_profile_child_changed, sender=model)
+    post_delete.connect(freelancer_profile_child_changed, sender=model)
+
+for taxonomy_model, _ in SEARCHABLE_MEMBERSHIPS.values():
+    post_save.connect(taxonomy_renamed, sender=taxonomy_model)
+
+for taxonomy_model in TAXONOMIES:
+    post_save.connect(taxonomy_changed, sender=taxonomy_model)
+    post_delete.connect(taxonomy_changed, sender=taxonomy_model)
@@ -0,0 +1,310 @@
+"""
+Similar freelancers, by cosine similarity of skill, niche and language
+vectors.
+
+Every profile is a sparse binary vector with one column per skill, niche and
+language, weighted per kind (see KINDS). The index stores the vectors column
+by column: for every column, the rows of the profiles that have it. Scoring
+one profile against all the others then only touches the profiles sharing a
+column with it, in three NumPy calls: `bincount` over the concatenated
+columns gives the dot products, a division by the precomputed row norms the
+cosines, and `argpartition` the top k.
+
+`manage.py build_similarity_index` (or the first query, when there is no
+index yet) builds the index and saves it with `np.savez` to
+SIMILARITY_INDEX_PATH, so workers load it instead of rebuilding it. Every
+membership change bumps the profile's `updated_at`, so profiles changed
+since the index was built are re-read from the database, at most once every
+`refresh_interval` seconds per worker, and scored on top of it. Once that
+overlay grows past `max_overlay` profiles the index is rebuilt.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from freelancer_management.models import (
+    FreelancerLanguage,
+    FreelancerNiche,
+    FreelancerProfile,
+    FreelancerSkill,
+)
+
+logger = logging.getLogger(__name__)
+
+# (membership model, taxonomy field, weight); the position is the kind
+KINDS = [
+    (FreelancerSkill, "skill", 1.0),
+    (FreelancerNiche, "niche", 1.0),
+    (FreelancerLanguage, "language", 0.5),
+]
+WEIGHTS = np.array([weight for _, _, weight in KINDS])
+
+
+def load_memberships(**filters):
+    """
+    Returns an (n, 3) array of (profile id, kind, taxonomy id) rows, one
+    query per kind. `filters` apply to the membership models.
+    """
+    parts = []
+    for kind, (model, field, _) in enumerate(KINDS):
+        rows = model.objects.filter(**filters).values_list(
+            "freelancer_id", f"{field}_id"
+        )
+        pairs = np.array(list(rows), dtype=np.int64).reshape(-1, 2)
+        parts.append(np.insert(pairs, 1, kind, axis=1))
+    return np.concatenate(parts)
+
+
+def group_features(memberships):
+    """
+    Turns membership rows into {profile id: {(kind, taxonomy id), ...}}.
+    """
+    features = {}
+    for profile_id, kind, taxonomy_id in memberships.tolist():
+        features.setdefault(profile_id, set()).add((kind, taxonomy_id))
+    return features
+
+
+def norm(features):
+    return float(np.sqrt(sum(WEIGHTS[kind] ** 2 for kind, _ in features)))
+
+
+def cosine(a, b):
+    if not a or not b:
+        return 0.0
+    dot = sum(WEIGHTS[kind] ** 2 for kind, _ in a & b)
+    return dot / (norm(a) * norm(b))
+
+
+class SimilarityIndex:
+    """
+    Column-wise (CSC) binary matrix of profiles by skill/niche/language.
+
+    `profile_ids[row]` is the profile of a row, `features[column]` the
+    (kind, taxonomy id) of a column, and the rows having column c are
+    `indices[indptr[c]:indptr[c + 1]]`.
+    """
+
+    def __init__(self, profile_ids, features, indptr, indices, row_norms, built_at):
+        self.profile_ids = profile_ids
+        self.features = features
+        self.indptr = indptr
+        self.indices = indices
+        self.row_norms = row_norms
+        self.built_at = built_at
+        self.rows = {id: row for row, id in enumerate(profile_ids.tolist())}
+        self.columns = {
+            (kind, id): column for column, (kind, id) in enumerate(features.tolist())
+        }
+
+    @classmethod
+    def from_memberships(cls, memberships, built_at):
+        """
+        Builds the index from (profile id, kind, taxonomy id) rows.
+        """
+        memberships = np.asarray(memberships, dtype=np.int64).reshape(-1, 3)
+        profile_ids, rows = np.unique(memberships[:, 0], return_inverse=True)
+        features, columns = np.unique(memberships[:, 1:], axis=0, return_inverse=True)
+        rows, columns = rows.ravel(), columns.ravel()
+
+        order = np.lexsort((rows, columns))
+        indices = rows[order].astype(np.int32)
+        counts = np.bincount(columns, minlength=len(features))
+        indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        weights = WEIGHTS[features[:, 0]] if len(features) else np.zeros(0)
+        row_norms = np.sqrt(
+            np.bincount(rows, weights=weights[columns] ** 2, minlength=len(profile_ids))
+        )
+        return cls(
+            profile_ids,
+            features.reshape(-1, 2),
+            indptr,
+            indices,
+            row_norms,
+            built_at,
+        )
+
+    @classmethod
+    def build(cls):
+        # Writes racing with the build are picked up by the overlay
+        built_at = timezone.now()
+        return cls.from_memberships(load_memberships(), built_at)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            np.savez(
+                file,
+                profile_ids=self.profile_ids,
+                features=self.features,
+                indptr=self.indptr,
+                indices=self.indices,
+                row_norms=self.row_norms,
+                built_at=np.array([self.built_at.timestamp()]),
+            )
+        # Readers never see a half written file
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            built_at = datetime.fromtimestamp(
+                float(data["built_at"][0]), tz=dt_timezone.utc
+            )
+            return cls(
+                data["profile_ids"],
+                data["features"],
+                data["indptr"],
+                data["indices"],
+                data["row_norms"],
+                built_at,
+            )
+
+    def scores(self, features):
+        """
+        Returns the cosine similarity of `features` with every row.
+        """
+        columns = [self.columns[f] for f in features if f in self.columns]
+        scores = np.zeros(len(self.profile_ids))
+        if not columns or not features:
+            return scores
+        starts, ends = self.indptr[columns], self.indptr[np.add(columns, 1)]
+        rows = np.concatenate(
+            [self.indices[start:end] for start, end in zip(starts, ends)]
+        )
+        weights = np.repeat(WEIGHTS[self.features[columns, 0]] ** 2, ends - starts)
+        dots = np.bincount(rows, weights=weights, minlength=len(self.profile_ids))
+        return dots / (self.row_norms * norm(features))
+
+
+class SimilarityEngine:
+    # Seconds between two looks for profiles changed since the index was built
+    refresh_interval = 5
+    # Changed profiles scored on top of the index before it is rebuilt
+    max_overlay = 5000
+    # Writes committing this late after their updated_at are still picked up
+    commit_lag = timedelta(seconds=60)
+
+    def __init__(self):
+        self.index = None
+        self.index_mtime = None
+        self.overlay = {}
+        self.overlay_since = None
+        self.refreshed_at = float("-inf")
+        self.lock = threading.Lock()
+
+    @property
+    def path(self):
+        return str(settings.SIMILARITY_INDEX_PATH)
+
+    def rebuild(self):
+        """
+        Builds the index from the database and saves it for every worker.
+        """
+        index = SimilarityIndex.build()
+        try:
+            index.save(self.path)
+            self.index_mtime = os.stat(self.path).st_mtime
+        except OSError as e:
+            logger.warning("Similarity index could not be saved: %s", e)
+        self.use(index)
+        return index
+
+    def use(self, index):
+        self.index = index
+        self.overlay = {}
+        self.overlay_since = index.built_at - self.commit_lag
+        self.refreshed_at = float("-inf")
+
+    def get(self):
+        with self.lock:
+            if time.monotonic() - self.refreshed_at >= self.refresh_interval:
+                self.load()
+                self.refresh_overlay()
+                self.refreshed_at = time.monotonic()
+            return self.index, self.overlay
+
+    def load(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+
+        if mtime is None:
+            if self.index is None:
+                self.rebuild()
+        elif mtime != self.index_mtime:
+            # Saved by another worker or by build_similarity_index
+            try:
+                index = SimilarityIndex.load(self.path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Similarity index could not be loaded: %s", e)
+                if self.index is None:
+                    self.rebuild()
+                return
+            self.index_mtime = mtime
+            self.use(index)
+
+    def refresh_overlay(self):
+        changed = dict(
+            FreelancerProfile.objects.filter(
+                updated_at__gt=self.overlay_since
+            ).values_list("id", "updated_at")
+        )
+        if not changed:
+            return
+        features = group_features(
+            load_memberships(freelancer__updated_at__gt=self.overlay_since)
+        )
+        for profile_id in changed:
+            self.overlay[profile_id] = features.get(profile_id, set())
+        self.overlay_since = max(changed.values()) - self.commit_lag
+        if len(self.overlay) > self.max_overlay:
+            self.rebuild()
+
+    def similar(self, profile_id, limit):
+        """
+        Returns up to `limit` (profile id, similarity) pairs, most similar
+        first, for profiles sharing at least one skill, niche or language.
+        """
+        index, overlay = self.get()
+        features = group_features(load_memberships(freelancer_id=profile_id)).get(
+            profile_id, set()
+        )
+        if not features:
+            return []
+
+        scores = index.scores(features)
+        # Overlay profiles are scored from their current memberships instead
+        stale = [index.rows[id] for id in (*overlay, profile_id) if id in index.rows]
+        scores[stale] = 0
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(len(scores))
+        results = [
+            (int(index.profile_ids[row]), float(scores[row]))
+            for row in top
+            if scores[row] > 0
+        ]
+
+        for id, other in overlay.items():
+            if id != profile_id:
+                score = cosine(features, other)
+                if score > 0:
+                    results.append((id, score))
+
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results[:limit]
+
+
+similarity_engine = SimilarityEngine()
@@ -0,0 +1,300 @@
+"""
+In-process cache of the skill, niche, language and tool tables.
+
+These reference tables are read on nearly every request but rarely written,
+so each worker keeps an id -> name map, a name -> id map and the name-sorted
+list in memory. A version counter in the default cache (Redis in production)
+is bumped after every committed write (see `freelancer_management.signals`);
+a worker reloads its copy when the counter no longer matches the version it
+loaded. The counter is read at most once a second per worker, so lookups
+stay in memory and other workers converge within a second of a write.
+
+Autocomplete is served from a prefix trie built lazily over each snapshot,
+ranked by how many freelancers use each entry.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from freelancer_management.models import (
+    FreelancerLanguage,
+    FreelancerNiche,
+    FreelancerSkill,
+    Language,
+    Niche,
+    Project,
+    Skill,
+    Tool,
+)
+from skill_africa.conditional import representation_key, vary_on_accept
+
+logger = logging.getLogger(__name__)
+
+
+class TaxonomySnapshot:
+    def __init__(self, version, rows):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.items = [{"id": id, "name": name} for id, name in rows]
+        self.names = {id: name for id, name in rows}
+        self.ids = {name.lower(): id for id, name in rows}
+        self.prefix_index = None
+
+
+class PrefixNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+
+class PrefixIndex:
+    """
+    Trie over the lowercased names and the start of every word in them, so
+    "lea" finds "Machine Learning". Every node keeps the ids of its `size`
+    most popular completions, making a lookup O(len(prefix)) whatever the
+    size of the table.
+    """
+
+    def __init__(self, entries, size):
+        # entries: (id, name, popularity)
+        self.built_at = time.monotonic()
+        self.root = PrefixNode()
+        # Inserting the most popular entries first keeps every `top` list
+        # sorted without ever re-ranking it.
+        for id, name, _ in sorted(entries, key=lambda e: (-e[2], e[1].lower())):
+            for key in self.keys(name):
+                node = self.root
+                self.add(node, id, size)
+                for char in key:
+                    node = node.children.setdefault(char, PrefixNode())
+                    self.add(node, id, size)
+
+    @staticmethod
+    def keys(name):
+        words = name.lower().split()
+        return {" ".join(words[i:]) for i in range(len(words))}
+
+    @staticmethod
+    def add(node, id, size):
+        # An id reaches a node through several of its words back to back
+        if len(node.top) < size and (not node.top or node.top[-1] != id):
+            node.top.append(id)
+
+    def search(self, prefix, limit):
+        node = self.root
+        for char in " ".join(prefix.lower().split()):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit]
+
+
+class TaxonomyCache:
+    # Seconds between two reads of the shared version counter
+    check_interval = 1
+    # How long a snapshot is trusted when the version counter is unreachable
+    fallback_ttl = 60
+    # How long the popularity ranking of the prefix index may lag behind
+    popularity_ttl = 300
+    # Completions kept per prefix, the most an autocomplete call can return
+    max_completions = 20
+
+    def __init__(self, model, membership_model, field_name):
+        self.model = model
+        self.membership_model = membership_model
+        self.field_name = field_name
+        self.version_key = f"taxonomy:{model._meta.model_name}:version"
+        self.snapshot = None
+        self.checked_at = float("-inf")
+        self.lock = threading.Lock()
+
+    def current_version(self):
+        """
+        Returns the shared version counter, or None when it cannot be read.
+        """
+        try:
+            version = cache.get(self.version_key)
+            if version is None:
+                self.reset_version()
+                version = cache.get(self.version_key)
+            return version
+        except Exception as e:
+            logger.warning("Taxonomy version lookup failed: %s", e)
+            return None
+
+    def reset_version(self):
+        # Seeded from the clock rather than 1, so a counter lost to an evicted
+        # or flushed cache never comes back as a version a worker has loaded.
+        cache.add(self.version_key, time.time_ns() // 1000, timeout=None)
+
+    def bump(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            self.reset_version()
+        except Exception as e:
+            logger.warning("Taxonomy version bump failed: %s", e)
+        # The writing worker sees its own write on the next lookup, even when
+        # the counter is unreachable and snapshots live for fallback_ttl
+        self.snapshot = None
+        self.checked_at = float("-inf")
+
+    def get(self):
+        snapshot = self.snapshot
+        if snapshot is not None and (
+            time.monotonic() - self.checked_at < self.check_interval
+        ):
+            return snapshot
+
+        version = self.current_version()
+        if snapshot is not None and self.is_fresh(snapshot, version):
+            self.checked_at = time.monotonic()
+            return snapshot
+
+        with self.lock:
+            # Another thread may have reloaded while we waited for the lock
+            snapshot = self.snapshot
+            if snapshot is None or not self.is_fresh(snapshot, version):
+                rows = list(
+                    self.model.objects.order_by("name").values_list("id", "name")
+                )
+                snapshot = self.snapshot = TaxonomySnapshot(version, rows)
+            self.checked_at = time.monotonic()
+        return snapshot
+
+    def is_fresh(self, snapshot, version):
+        if version is None:
+            return time.monotonic() - snapshot.loaded_at < self.fallback_ttl
+        return snapshot.version == version
+
+    def prefix_index(self, snapshot):
+        index = snapshot.prefix_index
+        if not self.index_is_stale(index):
+            return index
+        # While one thread refreshes a stale ranking the others keep using it
+        if not self.lock.acquire(blocking=index is None):
+            return index
+        try:
+            if self.index_is_stale(snapshot.prefix_index):
+                snapshot.prefix_index = self.build_prefix_index(snapshot)
+        finally:
+            self.lock.release()
+        return snapshot.prefix_index
+
+    def index_is_stale(self, index):
+        return index is None or time.monotonic() - index.built_at > self.popularity_ttl
+
+    def build_prefix_index(self, snapshot):
+        popularity = dict(
+            self.membership_model.objects.values_list(self.field_name)
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        return PrefixIndex(
+            [(id, name, popularity.get(id, 0)) for id, name in snapshot.names.items()],
+            self.max_completions,
+        )
+
+    def autocomplete(self, prefix, limit):
+        snapshot = self.get()
+        ids = self.prefix_index(snapshot).search(prefix, limit)
+        return [{"id": id, "name": snapshot.names[id]} for id in ids]
+
+    def name(self, id):
+        return self.get().names.get(id)
+
+    def id(self, name):
+        return self.get().ids.get(name.lower())
+
+    def items(self):
+        return self.get().items
+
+    def etag(self, request):
+        """
+        ETag of a list response: changes with the taxonomy version and with
+        the query string and media type, since search, paging and format
+        change the body.
+        """
+        version = self.get().version
+        # A stable digest, so every worker hands out the same tag
+        key = ":".join(representation_key(request))
+        query = hashlib.md5(key.encode()).hexdigest()[:12]
+        return quote_etag(f"{self.model._meta.model_name}-{version}-{query}")
+
+
+skill_taxonomy = TaxonomyCache(Skill, FreelancerSkill, "skill")
+niche_taxonomy = TaxonomyCache(Niche, FreelancerNiche, "niche")
+language_taxonomy = TaxonomyCache(Language, FreelancerLanguage, "language")
+# Tools only appear on projects
+tool_taxonomy = TaxonomyCache(Tool, Project.tool_tags.through, "tool")
+
+TAXONOMIES = {
+    Skill: skill_taxonomy,
+    Niche: niche_taxonomy,
+    Language: language_taxonomy,
+    Tool: tool_taxonomy,
+}
+
+
+class TaxonomyListMixin:
+    """
+    Serves a taxonomy list endpoint from the in-process cache and answers
+    `If-None-Match` with 304. Requests using search, ordering or cursor
+    parameters fall back to the regular queryset.
+    """
+
+    taxonomy = None
+    queryset_only_params = ["search", "ordering", "cursor"]
+
+    def list(self, request, *args, **kwargs):
+        etag = self.taxonomy.etag(request)
+        # Weak comparison, compressed responses hand out the tag as W/"..."
+        client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in [tag.removeprefix("W/") for tag in client_etags]:
+            return vary_on_accept(
+                Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            )
+
+        if any(param in request.query_params for param in self.queryset_only_params):
+            response = super().list(request, *args, **kwargs)
+        else:
+            items = self.taxonomy.items()
+            page = self.paginate_queryset(items)
+            if page is None:
+                response = Response(items)
+            else:
+                response = self.get_paginated_response(page)
+
+        response["ETag"] = etag
+        return vary_on_accept(response)
+
+
+class TaxonomyAutocompleteView(APIView):
+    """
+    Returns the most popular entries whose name, or one of its words, starts
+    with `q`. Public and unauthenticated so a keystroke never costs a query.
+    """
+
+    taxonomy = None
+    authentication_classes = []
+    default_limit = 10
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.taxonomy.max_completions))
+        query = request.query_params.get("q", "")
+        return Response({"results": self.taxonomy.autocomplete(query, limit)})
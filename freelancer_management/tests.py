@@ -1,10 +1,59 @@
-from rest_framework.test import APITestCase
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from allauth.account.models import EmailAddress
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.functions import Lower
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.urls import reverse
 from profile_management.models import User
+from freelancer_management.cache import get_profile_cache_stats
+from freelancer_management.experience import merge_intervals, months_between
+from freelancer_management.signals import refresh_experience
+from freelancer_management.search import get_search_backend
+from freelancer_management.serializers import ProjectSerializer
+from freelancer_management.similarity import SimilarityEngine, SimilarityIndex
+from freelancer_management.views.profile import FreelancerProfileExport
+from freelancer_management.taxonomy import TAXONOMIES, skill_taxonomy
+from skill_africa.pagination import CustomCursorPagination
+from freelancer_management.models import (
+    FreelancerLanguage,
+    FreelancerLink,
+    FreelancerNiche,
+    FreelancerProfile,
+    FreelancerSkill,
+    Language,
+    Niche,
+    Project,
+    Skill,
+    Tool,
+    WorkExperience,
+)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class LocalCacheTestCase(APITestCase):
+    """
+    Runs the tests against a local-memory cache instead of the configured one.
+    """
 
 
-class FreelanceRegistrationViewTests(APITestCase):
+class FreelanceRegistrationViewTests(LocalCacheTestCase):
     def setUp(self):
         self.url = reverse("freelance_registeration")
         self.valid_data = {
@@ -60,3 +109,1399 @@ class FreelanceRegistrationViewTests(APITestCase):
         response = self.client.post(self.url, self.valid_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("email", response.data["error"])
+
+
+class FreelancerProfileQueryCountTests(LocalCacheTestCase):
+    def setUp(self):
+        self.url = reverse("freelancer_profiles_list")
+        skills = [Skill.objects.create(name=f"skill_{i}") for i in range(3)]
+        niches = [Niche.objects.create(name=f"niche_{i}") for i in range(3)]
+        languages = [Language.objects.create(name=f"language_{i}") for i in range(2)]
+
+        for i in range(10):
+            user = User.objects.create_user(
+                username=f"freelancer_{i:02d}",
+                email=f"freelancer_{i:02d}@example.com",
+                password="Str0ng_P@ssw0rd",
+            )
+            profile = FreelancerProfile.objects.create(user=user)
+            FreelancerSkill.objects.bulk_create(
+                [FreelancerSkill(freelancer=profile, skill=skill) for skill in skills]
+            )
+            FreelancerNiche.objects.bulk_create(
+                [FreelancerNiche(freelancer=profile, niche=niche) for niche in niches]
+            )
+            FreelancerLanguage.objects.bulk_create(
+                [
+                    FreelancerLanguage(freelancer=profile, language=language)
+                    for language in languages
+                ]
+            )
+            FreelancerLink.objects.create(
+                freelancer=profile, name="github", url="https://github.com/x"
+            )
+
+        self.user = user
+        self.skill = skills[0]
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        # Counts below are for a worker whose taxonomy cache is warm
+        for taxonomy in TAXONOMIES.values():
+            taxonomy.get()
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        small, response = self.count_queries(self.url, {"page_size": 2})
+        self.assertEqual(len(response.data["results"]), 2)
+        large, response = self.count_queries(self.url, {"page_size": 10})
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(small, large)
+
+    def test_list_representation_reads_relations(self):
+        _, response = self.count_queries(self.url, {"page_size": 1})
+        profile = response.data["results"][0]
+        self.assertEqual(len(profile["skills"]), 3)
+        self.assertEqual(
+            profile["skills"][0], {"skill": "skill_0", "id": self.skill.id}
+        )
+        self.assertEqual(len(profile["niches"]), 3)
+        self.assertEqual(len(profile["languages"]), 2)
+        self.assertEqual(len(profile["links"]), 1)
+
+    def test_sparse_fieldsets_trim_output_and_queries(self):
+        full, _ = self.count_queries(self.url)
+        queries, response = self.count_queries(
+            self.url, {"fields": "first_name,profile_pic", "expand": "skills"}
+        )
+        profile = response.data["results"][0]
+        self.assertEqual(list(profile), ["first_name", "profile_pic", "skills"])
+        self.assertEqual(len(profile["skills"]), 3)
+        # Links, niches and languages are never prefetched
+        self.assertEqual(queries, full - 3)
+
+        queries, response = self.count_queries(self.url, {"expand": ""})
+        profile = response.data["results"][0]
+        self.assertIn("about_me", profile)
+        self.assertNotIn("user", profile)
+        self.assertNotIn("skills", profile)
+        self.assertEqual(queries, full - 4)
+
+    def test_unknown_sparse_fields_are_rejected(self):
+        response = self.client.get(self.url, {"fields": "bio,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["fields"], ["Unknown field: password"])
+        response = self.client.get(self.url, {"expand": "bio"})
+        self.assertEqual(response.data["expand"], ["Unknown relation: bio"])
+
+    def test_detail_sparse_fieldsets(self):
+        url = reverse("freelancer_profile_details", args=[self.user.uuid])
+        params = {"fields": "bio,user,languages"}
+        _, response = self.count_queries(url, params)
+        self.assertEqual(list(response.data), ["user", "bio", "languages"])
+        self.assertEqual(len(response.data["languages"]), 2)
+
+    def test_detail_query_count_is_constant(self):
+        url = reverse("freelancer_profile_details", args=[self.user.uuid])
+        queries, response = self.count_queries(url)
+        self.assertEqual(len(response.data["skills"]), 3)
+        self.assertLessEqual(queries, 7)
+
+
+class FreelancerProfileCacheTests(LocalCacheTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="john_doe",
+            email="johndoe@example.com",
+            password="Str0ng_P@ssw0rd",
+        )
+        self.profile = FreelancerProfile.objects.create(user=self.user, bio="Old bio")
+        self.url = reverse("freelancer_profile_details", args=[self.user.uuid])
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_second_get_is_served_from_cache(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["bio"], "Old bio")
+        self.assertFalse(
+            any("freelancerprofile" in q["sql"] for q in context.captured_queries)
+        )
+        self.assertEqual(get_profile_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_profile_save_invalidates_cache(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.bio = "New bio"
+            self.profile.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["bio"], "New bio")
+
+    def test_child_rows_invalidate_cache(self):
+        skill = Skill.objects.create(name="python")
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            freelancer_skill = FreelancerSkill.objects.create(
+                freelancer=self.profile, skill=skill
+            )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["skills"], [{"skill": "python", "id": skill.id}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            freelancer_skill.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["skills"], [])
+
+
+class CursorPaginationTests(LocalCacheTestCase):
+    def setUp(self):
+        self.url = reverse("skill-list-create")
+        Skill.objects.bulk_create(
+            [Skill(name=f"skill_{i:03d}") for i in reversed(range(25))]
+        )
+        # bulk_create sends no signals, so tell the taxonomy cache ourselves
+        skill_taxonomy.bump()
+
+    def walk(self, params):
+        names, url, pages = [], self.url, 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            names += [skill["name"] for skill in response.data["results"]]
+            pages += 1
+            if not response.data["next"]:
+                return names, pages, response
+            response = self.client.get(response.data["next"])
+
+    def test_cursor_param_walks_every_row_in_order(self):
+        names, pages, _ = self.walk({"cursor": "", "page_size": 10})
+        self.assertEqual(names, [f"skill_{i:03d}" for i in range(25)])
+        self.assertEqual(pages, 3)
+
+    def test_cursor_pages_do_not_count_the_table(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, {"cursor": "", "page_size": 10})
+        self.assertFalse(any("COUNT(" in q["sql"] for q in context.captured_queries))
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(self.url, {"cursor": "", "page_size": 10})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_descending_ordering_with_cursor(self):
+        names, _, _ = self.walk({"cursor": "", "page_size": 7, "ordering": "-name"})
+        self.assertEqual(names, [f"skill_{i:03d}" for i in reversed(range(25))])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unpaginable_ordering_is_a_bad_request(self):
+        request = Request(APIRequestFactory().get(self.url, {"cursor": ""}))
+        for queryset in [
+            Skill.objects.order_by("?"),
+            Skill.objects.order_by(Lower("name")),
+        ]:
+            with self.assertRaises(ValidationError) as context:
+                CustomCursorPagination().paginate_queryset(queryset, request)
+            self.assertEqual(context.exception.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("ordering", context.exception.detail)
+
+    def test_pages_past_null_sort_keys(self):
+        for username, last_name in [
+            ("u1", "Okafor"),
+            ("u2", None),
+            ("u3", "Adeyemi"),
+            ("u4", None),
+            ("u5", "Mensah"),
+        ]:
+            user = User.objects.create_user(
+                username=username, email=f"{username}@example.com", password="x"
+            )
+            FreelancerProfile.objects.create(user=user, last_name=last_name)
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        url = reverse("freelancer_profiles_list")
+        response = self.client.get(url, {"cursor": "", "page_size": 2, "lastname": 1})
+        pages = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append([p["user"]["username"] for p in response.data["results"]])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        # NULLs last, by primary key among themselves
+        self.assertEqual(pages, [["u3", "u5"], ["u1", "u2"], ["u4"]])
+
+        # And back from the last page
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [p["user"]["username"] for p in response.data["results"]], ["u1", "u2"]
+        )
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [p["user"]["username"] for p in response.data["results"]], ["u3", "u5"]
+        )
+
+    def test_page_number_pagination_is_still_the_default(self):
+        response = self.client.get(self.url, {"page_size": 10, "page": 3})
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 5)
+
+
+class FreelancerProfileSearchTests(LocalCacheTestCase):
+    def setUp(self):
+        self.url = reverse("freelancer_profiles_list")
+        self.python = Skill.objects.create(name="python")
+        self.design = Skill.objects.create(name="design")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ada = self.create_profile("ada", "Ada", "Lovelace", "Python engineer")
+            self.bob = self.create_profile("bob", "Bob", "Builder", "I write python")
+            self.eve = self.create_profile("eve", "Eve", "Adams", "Designer")
+            FreelancerSkill.objects.create(freelancer=self.ada, skill=self.python)
+            FreelancerSkill.objects.create(freelancer=self.eve, skill=self.design)
+
+        token = RefreshToken.for_user(self.ada.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def create_profile(self, username, first_name, last_name, bio):
+        user = User.objects.create_user(
+            username=username, email=f"{username}@example.com", password="password"
+        )
+        return FreelancerProfile.objects.create(
+            user=user, first_name=first_name, last_name=last_name, bio=bio
+        )
+
+    def search(self, terms, **params):
+        response = self.client.get(self.url, {"search": terms, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [profile["user"]["username"] for profile in response.data["results"]]
+
+    def test_search_ranks_by_relevance(self):
+        # ada has python as a skill and in her bio, bob only in his bio
+        self.assertEqual(self.search("python"), ["ada", "bob"])
+
+    def test_search_matches_names_and_prefixes(self):
+        self.assertEqual(self.search("lovelace"), ["ada"])
+        self.assertEqual(self.search("desi"), ["eve"])
+
+    def test_index_follows_membership_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            FreelancerSkill.objects.create(freelancer=self.bob, skill=self.design)
+        self.assertCountEqual(self.search("design"), ["bob", "eve"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FreelancerSkill.objects.filter(freelancer=self.bob).delete()
+        self.assertEqual(self.search("design"), ["eve"])
+
+    def test_index_follows_profile_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bob.about_me = "Kubernetes and cloud"
+            self.bob.save()
+        self.assertEqual(self.search("kubernetes"), ["bob"])
+
+    def test_explicit_ordering_wins_over_rank(self):
+        self.assertEqual(
+            self.search("python", ordering="-user__username"), ["bob", "ada"]
+        )
+
+    def test_targeted_search_still_uses_fields(self):
+        response = self.client.get(self.url, {"search": "bo", "username": "1"})
+        usernames = [p["user"]["username"] for p in response.data["results"]]
+        self.assertEqual(usernames, ["bob"])
+
+
+class FreelancerProfileUpdateTests(LocalCacheTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="john_doe", email="johndoe@example.com", password="password"
+        )
+        self.profile = FreelancerProfile.objects.create(user=self.user)
+        self.skills = [Skill.objects.create(name=f"skill_{i}") for i in range(60)]
+        self.niches = [Niche.objects.create(name=f"niche_{i}") for i in range(4)]
+        FreelancerSkill.objects.bulk_create(
+            [
+                FreelancerSkill(freelancer=self.profile, skill=s)
+                for s in self.skills[:30]
+            ]
+        )
+        self.url = reverse("freelancer_profile_details", args=[self.user.uuid])
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        skill_taxonomy.get()
+
+    def put(self, data):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.put(self.url, data, format="json")
+        return response, len(context.captured_queries)
+
+    def skill_ids(self):
+        return set(
+            FreelancerSkill.objects.filter(freelancer=self.profile).values_list(
+                "skill_id", flat=True
+            )
+        )
+
+    def test_update_diffs_memberships_with_bounded_queries(self):
+        wanted = [skill.id for skill in self.skills[15:45]]
+        kept = set(
+            FreelancerSkill.objects.filter(
+                freelancer=self.profile, skill_id__in=wanted
+            ).values_list("id", flat=True)
+        )
+
+        response, large = self.put({"skills": wanted, "bio": "Hello"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.skill_ids(), set(wanted))
+        self.assertEqual(len(response.data["skills"]), 30)
+        # Rows that stayed were not recreated
+        self.assertTrue(
+            kept <= set(FreelancerSkill.objects.values_list("id", flat=True))
+        )
+
+        response, small = self.put({"skills": wanted[:3], "bio": "Hello"})
+        self.assertEqual(self.skill_ids(), set(wanted[:3]))
+        # The cost does not depend on how many ids are sent or change
+        self.assertLessEqual(large, 16)
+        self.assertLessEqual(small, 16)
+
+    def test_unknown_ids_are_reported_and_nothing_changes(self):
+        response, _ = self.put({"skills": [self.skills[0].id, 9999], "bio": "New"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"], ["Skill with id 9999 does not exist."]
+        )
+        self.assertEqual(len(self.skill_ids()), 30)
+        self.profile.refresh_from_db()
+        self.assertIsNone(self.profile.bio)
+
+    def test_niche_cap(self):
+        response, _ = self.put({"niches": [niche.id for niche in self.niches]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Maximum of 3 Niches Per user.", response.data["errors"])
+
+
+class FreelancerMembershipViewTests(LocalCacheTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="john_doe", email="johndoe@example.com", password="password"
+        )
+        self.profile = FreelancerProfile.objects.create(user=self.user)
+        self.skills = [Skill.objects.create(name=f"skill_{i}") for i in range(50)]
+        self.niches = [Niche.objects.create(name=f"niche_{i}") for i in range(4)]
+        self.skills_url = reverse("add-freelancer-skills", args=[self.user.uuid])
+        self.delete_skills_url = reverse(
+            "delete-freelancer-skills", args=[self.user.uuid]
+        )
+        self.niches_url = reverse("add-freelancer-niches", args=[self.user.uuid])
+
+    def skill_ids(self):
+        return set(
+            FreelancerSkill.objects.filter(freelancer=self.profile).values_list(
+                "skill_id", flat=True
+            )
+        )
+
+    def test_add_skills_reports_per_id_results(self):
+        FreelancerSkill.objects.create(freelancer=self.profile, skill=self.skills[0])
+        ids = [self.skills[0].id, self.skills[1].id, 9999]
+        response = self.client.post(self.skills_url, {"skills": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"], ["Skill with id 9999 does not exist."]
+        )
+        self.assertEqual(response.data["created_skills"], ["skill_1"])
+        self.assertEqual(
+            response.data["results"],
+            {
+                self.skills[0].id: "exists",
+                self.skills[1].id: "created",
+                9999: "not_found",
+            },
+        )
+        self.assertEqual(self.skill_ids(), {self.skills[0].id, self.skills[1].id})
+
+    def test_add_and_remove_cost_does_not_grow_with_ids(self):
+        def add_and_remove(skills):
+            ids = [skill.id for skill in skills]
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    self.skills_url, {"skills": ids}, format="json"
+                )
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                response = self.client.delete(
+                    f"{self.delete_skills_url}?skills={','.join(map(str, ids))}"
+                )
+                self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            return len(context.captured_queries)
+
+        self.assertEqual(add_and_remove(self.skills[:5]), add_and_remove(self.skills))
+        self.assertEqual(self.skill_ids(), set())
+
+    def test_remove_reports_rows_not_on_profile(self):
+        FreelancerSkill.objects.create(freelancer=self.profile, skill=self.skills[0])
+        response = self.client.delete(
+            f"{self.delete_skills_url}?skills={self.skills[0].id},{self.skills[1].id},x"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"],
+            [
+                f"Skill with id {self.skills[1].id} is not on this profile.",
+                "Skill with id x does not exist.",
+            ],
+        )
+        self.assertEqual(self.skill_ids(), set())
+
+    def test_add_niches_replaces_former_niches(self):
+        FreelancerNiche.objects.create(freelancer=self.profile, niche=self.niches[0])
+        ids = [self.niches[1].id, self.niches[2].id]
+        response = self.client.post(self.niches_url, {"niches": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["created_niches"],
+            [{"name": "niche_1", "id": ids[0]}, {"name": "niche_2", "id": ids[1]}],
+        )
+        self.assertEqual(
+            set(self.profile.niches.values_list("niche_id", flat=True)), set(ids)
+        )
+
+    def test_add_niches_enforces_cap(self):
+        ids = [niche.id for niche in self.niches]
+        response = self.client.post(self.niches_url, {"niches": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"], ["Maximum of 3 Niches Per user."])
+        self.assertFalse(self.profile.niches.exists())
+
+
+class TaxonomyCacheTests(LocalCacheTestCase):
+    def setUp(self):
+        self.url = reverse("skill-list-create")
+        self.skills = [Skill.objects.create(name=name) for name in ["go", "python"]]
+        user = User.objects.create_user(
+            username="john_doe", email="johndoe@example.com", password="password"
+        )
+        self.profile = FreelancerProfile.objects.create(user=user)
+        FreelancerSkill.objects.create(freelancer=self.profile, skill=self.skills[1])
+        self.detail_url = reverse("freelancer_profile_details", args=[user.uuid])
+        self.token = RefreshToken.for_user(user).access_token
+
+    def test_list_is_served_from_memory_with_etag(self):
+        skill_taxonomy.get()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertEqual(
+            response.data["results"],
+            [{"id": s.id, "name": s.name} for s in self.skills],
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_media_types_have_their_own_etag(self):
+        response = self.client.get(self.url)
+        self.assertIn("Accept", response["Vary"])
+        response = self.client.get(
+            self.url,
+            HTTP_ACCEPT="application/msgpack",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertIn("Accept", response["Vary"])
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        Skill.objects.create(name="rust")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            [skill["name"] for skill in response.data["results"]],
+            ["go", "python", "rust"],
+        )
+
+    def test_search_falls_back_to_the_database(self):
+        response = self.client.get(self.url, {"search": "py"})
+        self.assertEqual(
+            response.data["results"], [{"id": self.skills[1].id, "name": "python"}]
+        )
+
+    def test_renames_reach_profile_representation(self):
+        skill = self.skills[1]
+        self.assertEqual(skill_taxonomy.name(skill.id), "python")
+        skill.name = "Python 3"
+        skill.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        response = self.client.get(self.detail_url)
+        self.assertEqual(
+            response.data["skills"], [{"skill": "Python 3", "id": skill.id}]
+        )
+
+    def test_reset_counter_does_not_reuse_versions(self):
+        version = skill_taxonomy.get().version
+        cache.delete(skill_taxonomy.version_key)
+        skill_taxonomy.checked_at = float("-inf")
+        self.assertNotEqual(skill_taxonomy.get().version, version)
+
+    def test_writer_sees_its_write_without_the_version_counter(self):
+        skill_taxonomy.get()
+        with patch(
+            "freelancer_management.taxonomy.cache.get", side_effect=ConnectionError
+        ), patch(
+            "freelancer_management.taxonomy.cache.incr", side_effect=ConnectionError
+        ):
+            skill = Skill.objects.create(name="rust")
+            self.assertEqual(skill_taxonomy.name(skill.id), "rust")
+
+
+class TaxonomyAutocompleteTests(LocalCacheTestCase):
+    def setUp(self):
+        self.url = reverse("skill-autocomplete")
+        names = ["Python", "PyTorch", "Pandas", "Machine Learning", "Go"]
+        self.skills = {name: Skill.objects.create(name=name) for name in names}
+        # PyTorch is used by three freelancers, Python by two, Pandas by one
+        used = [["PyTorch", "Python", "Pandas"], ["PyTorch", "Python"], ["PyTorch"]]
+        for i, names in enumerate(used):
+            user = User.objects.create_user(
+                username=f"user_{i}", email=f"user_{i}@example.com", password="pass"
+            )
+            profile = FreelancerProfile.objects.create(user=user)
+            FreelancerSkill.objects.bulk_create(
+                [
+                    FreelancerSkill(freelancer=profile, skill=self.skills[n])
+                    for n in names
+                ]
+            )
+
+    def complete(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [skill["name"] for skill in response.data["results"]]
+
+    def test_prefix_matches_are_ranked_by_popularity(self):
+        self.assertEqual(self.complete(q="p"), ["PyTorch", "Python", "Pandas"])
+        self.assertEqual(self.complete(q="PYT"), ["PyTorch", "Python"])
+        self.assertEqual(self.complete(q="pyth"), ["Python"])
+        self.assertEqual(self.complete(q="p", limit=1), ["PyTorch"])
+        self.assertEqual(self.complete(q="rust"), [])
+
+    def test_word_prefixes_match(self):
+        self.assertEqual(self.complete(q="lea"), ["Machine Learning"])
+        self.assertEqual(self.complete(q="machine  l"), ["Machine Learning"])
+
+    def test_warm_index_costs_no_queries(self):
+        self.complete(q="p")
+        with CaptureQueriesContext(connection) as context:
+            self.complete(q="py")
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_new_skills_are_indexed(self):
+        self.complete(q="r")
+        Skill.objects.create(name="Rust")
+        self.assertEqual(self.complete(q="r"), ["Rust"])
+
+
+class ConditionalGetTests(LocalCacheTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="john_doe", email="johndoe@example.com", password="password"
+        )
+        self.profile = FreelancerProfile.objects.create(user=self.user, bio="Hi")
+        self.url = reverse("freelancer_profile_details", args=[self.user.uuid])
+        self.projects_url = reverse("project-list", args=[self.user.uuid])
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def revalidate(self, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        return response, len(context.captured_queries)
+
+    def test_unchanged_profile_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response, queries = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # The cached copy carries its own validators: only the two user
+        # lookups of authentication and the permission check hit the db
+        self.assertEqual(queries, 2)
+
+        cache.clear()
+        response, queries = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(queries, 3)
+
+    def test_media_types_have_their_own_etag(self):
+        response = self.client.get(self.url)
+        self.assertIn("Accept", response["Vary"])
+        response, _ = self.revalidate(self.url, response["ETag"])
+        self.assertIn("Accept", response["Vary"])
+
+        etag = response["ETag"]
+        response = self.client.get(
+            self.url, HTTP_ACCEPT="application/msgpack", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_child_rows_change_the_profile_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            FreelancerSkill.objects.create(
+                freelancer=self.profile, skill=Skill.objects.create(name="python")
+            )
+        response, _ = self.revalidate(self.url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["skills"]), 1)
+
+    def test_project_list_is_revalidated_against_the_profile(self):
+        response = self.client.get(self.projects_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        response, _ = self.revalidate(self.projects_url, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # A different query string is a different representation
+        response = self.client.get(
+            self.projects_url, {"search": "x"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        project = Project.objects.create(
+            freelancer=self.profile, name="Site", url="https://example.com"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        response, _ = self.revalidate(self.projects_url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class FreelancerProfileExportTests(LocalCacheTestCase):
+    def setUp(self):
+        self.url = reverse("freelancer_profiles_export")
+        self.skill = Skill.objects.create(name="Python")
+        for i, first_name in enumerate(["Ada", "=cmd", "Chidi", "Ada"]):
+            user = User.objects.create_user(
+                username=f"freelancer_{i}",
+                email=f"freelancer_{i}@example.com",
+                password="Str0ng_P@ssw0rd",
+            )
+            profile = FreelancerProfile.objects.create(
+                user=user, first_name=first_name, last_name=f"Last {i}"
+            )
+            FreelancerSkill.objects.create(freelancer=profile, skill=self.skill)
+            FreelancerLink.objects.create(
+                freelancer=profile, name="github", url=f"https://github.com/{i}"
+            )
+        self.sponsor = User.objects.create_user(
+            username="sponsor",
+            email="sponsor@example.com",
+            password="Str0ng_P@ssw0rd",
+            role="sponsor",
+        )
+        self.authenticate(self.sponsor)
+        for taxonomy in TAXONOMIES.values():
+            taxonomy.get()
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def export(self, params=None, **extra):
+        response = self.client.get(self.url, params, **extra)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        response, body = self.export()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="freelancers.ndjson"', response["Content-Disposition"])
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(
+            [row["user"]["username"] for row in rows],
+            [f"freelancer_{i}" for i in range(4)],
+        )
+        self.assertEqual(rows[0]["skills"], [{"skill": "Python", "id": self.skill.id}])
+        self.assertEqual(rows[0]["links"][0]["url"], "https://github.com/0")
+
+    def test_csv_export(self):
+        response, body = self.export({"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["user.username"], "freelancer_0")
+        self.assertEqual(rows[0]["skills"], "Python")
+        self.assertEqual(rows[0]["links"], "https://github.com/0")
+        # Spreadsheets must not evaluate user input
+        self.assertEqual(rows[1]["first_name"], "'=cmd")
+
+        response, body = self.export(HTTP_ACCEPT="text/csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+
+    def test_honours_search_ordering_and_fields(self):
+        _, body = self.export(
+            {
+                "search": "Ada",
+                "name": "true",
+                "ordering": "-user__username",
+                "fields": "last_name",
+            }
+        )
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(rows, [{"last_name": "Last 3"}, {"last_name": "Last 0"}])
+
+        _, body = self.export({"format": "csv", "fields": "first_name,user"})
+        header = body.splitlines()[0]
+        self.assertEqual(
+            header, "user.uuid,user.username,user.email,user.role,first_name"
+        )
+
+    def test_query_count_grows_per_chunk_only(self):
+        with patch.object(
+            FreelancerProfileExport, "chunk_size", 2
+        ), CaptureQueriesContext(connection) as context:
+            self.export()
+        with patch.object(
+            FreelancerProfileExport, "chunk_size", 4
+        ), CaptureQueriesContext(connection) as single_chunk:
+            self.export()
+        # One prefetch per relation for each extra chunk, never per profile
+        self.assertEqual(
+            len(context.captured_queries), len(single_chunk.captured_queries) + 4
+        )
+
+    def test_freelancers_cannot_export(self):
+        self.authenticate(User.objects.get(username="freelancer_0"))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials()
+        response = self.client.get(self.url)
+        self.assertIn(response.status_code, [401, 403])
+
+
+class ImportFreelancersCommandTests(LocalCacheTestCase):
+    def setUp(self):
+        Skill.objects.create(name="Python")
+        Niche.objects.create(name="Backend")
+        Language.objects.create(name="Yoruba")
+        User.objects.create_user(
+            username="taken", email="taken@example.com", password="password"
+        )
+
+    def run_import(self, suffix, content, *args):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=suffix, delete=False, encoding="utf-8"
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "import_freelancers", file.name, *args, stdout=stdout, stderr=stderr
+            )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_ndjson_import(self):
+        rows = [
+            {
+                "username": "ada",
+                "email": "ada@example.com",
+                "password": "Str0ng_P@ssw0rd",
+                "first_name": "Ada",
+                "skills": ["python"],
+                "niches": "Backend",
+                "languages": ["Yoruba"],
+            },
+            {"username": "bob", "email": "bob@example.com"},
+            {"username": "taken", "email": "new@example.com"},
+            {"username": "eve", "email": "not-an-email"},
+            {"username": "dup", "email": "ada@example.com"},
+            {"username": "kim", "email": "kim@example.com", "skills": ["Cobol"]},
+        ]
+        content = "\n".join(json.dumps(row) for row in rows) + "\n{oops\n"
+        stdout, stderr = self.run_import(".ndjson", content, "--workers", "1")
+
+        self.assertIn("Imported 2 freelancers, skipped 5 rows", stdout)
+        self.assertIn("rows/sec", stdout)
+        self.assertIn("Line 3: username: Username is already taken.", stderr)
+        self.assertIn("Line 4: email:", stderr)
+        self.assertIn("Line 5: email: Email is already registered.", stderr)
+        self.assertIn("Line 6: skills: Unknown Skill 'Cobol'.", stderr)
+        self.assertIn("Line 7: Invalid JSON", stderr)
+
+        ada = FreelancerProfile.objects.get(user__username="ada")
+        self.assertEqual(ada.first_name, "Ada")
+        self.assertEqual(ada.user.role, "freelancer")
+        self.assertTrue(ada.user.check_password("Str0ng_P@ssw0rd"))
+        self.assertEqual(
+            list(ada.skills.values_list("skill__name", flat=True)), ["Python"]
+        )
+        self.assertEqual(ada.niches.count(), 1)
+        self.assertEqual(ada.languages.count(), 1)
+        self.assertTrue(EmailAddress.objects.filter(email="ada@example.com").exists())
+        self.assertFalse(User.objects.get(username="bob").has_usable_password())
+        self.assertFalse(Skill.objects.filter(name="Cobol").exists())
+
+        # bulk_create sends no signals, the import reindexes the profiles itself
+        found = get_search_backend().search(FreelancerProfile.objects.all(), "python")
+        self.assertEqual([profile.id for profile in found], [ada.id])
+
+    def test_csv_import_creates_missing_taxonomies(self):
+        content = (
+            "user.username,user.email,password,skills,niches\n"
+            "ada,ada@example.com,Str0ng_P@ssw0rd,Python; Rust,Backend\n"
+            "bob,bob@example.com,An0ther_P@ssw0rd,rust,\n"
+        )
+        stdout, _ = self.run_import(
+            ".csv", content, "--create-missing", "--workers", "2", "--batch-size", "1"
+        )
+
+        self.assertIn("Imported 2 freelancers, skipped 0 rows", stdout)
+        rust = Skill.objects.get(name="Rust")
+        self.assertEqual(rust.freelancerskill_set.count(), 2)
+        self.assertEqual(skill_taxonomy.id("rust"), rust.id)
+        self.assertTrue(
+            User.objects.get(username="bob").check_password("An0ther_P@ssw0rd")
+        )
+
+
+class SimilarFreelancersTests(LocalCacheTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            SIMILARITY_INDEX_PATH=os.path.join(directory.name, "similarity.npz")
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.engine = SimilarityEngine()
+        # Every change is picked up on the next query, none from a lag window
+        self.engine.refresh_interval = 0
+        self.engine.commit_lag = timedelta(0)
+        engine_patch = patch(
+            "freelancer_management.views.similar.similarity_engine", self.engine
+        )
+        engine_patch.start()
+        self.addCleanup(engine_patch.stop)
+
+        self.skills = {
+            name: Skill.objects.create(name=name)
+            for name in ["python", "django", "react", "figma"]
+        }
+        self.backend = Niche.objects.create(name="backend")
+        self.ada = self.create_profile("ada", ["python", "django"], niche=True)
+        self.bob = self.create_profile("bob", ["python", "django"], niche=True)
+        self.cy = self.create_profile("cy", ["python", "react"])
+        self.dee = self.create_profile("dee", ["figma"])
+
+        token = RefreshToken.for_user(self.ada.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("freelancer-similar-profiles", args=[self.ada.user.uuid])
+
+    def create_profile(self, username, skills, niche=False):
+        user = User.objects.create_user(
+            username=username, email=f"{username}@example.com", password="password"
+        )
+        profile = FreelancerProfile.objects.create(user=user)
+        for name in skills:
+            FreelancerSkill.objects.create(freelancer=profile, skill=self.skills[name])
+        if niche:
+            FreelancerNiche.objects.create(freelancer=profile, niche=self.backend)
+        return profile
+
+    def similar(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            (profile["user"]["username"], profile["similarity"])
+            for profile in response.data["results"]
+        ]
+
+    def test_ranks_by_cosine_similarity(self):
+        self.assertEqual(self.similar(), [("bob", 1.0), ("cy", 0.4082)])
+        self.assertEqual(self.similar(limit=1), [("bob", 1.0)])
+
+        response = self.client.get(self.url, {"fields": "first_name"})
+        self.assertEqual(
+            response.data["results"][0], {"first_name": None, "similarity": 1.0}
+        )
+
+    def test_index_is_saved_and_loaded(self):
+        self.similar()
+        index = SimilarityIndex.load(self.engine.path)
+        self.assertEqual(
+            sorted(index.profile_ids.tolist()),
+            sorted(p.id for p in [self.ada, self.bob, self.cy, self.dee]),
+        )
+
+        # Another worker loads the saved index instead of building one
+        engine = SimilarityEngine()
+        with patch.object(SimilarityIndex, "build") as build:
+            engine.get()
+        build.assert_not_called()
+        self.assertEqual(len(engine.index.profile_ids), 4)
+
+    def test_membership_changes_are_picked_up(self):
+        self.similar()
+        with self.captureOnCommitCallbacks(execute=True):
+            FreelancerSkill.objects.create(
+                freelancer=self.cy, skill=self.skills["django"]
+            )
+            FreelancerSkill.objects.filter(freelancer=self.bob).delete()
+        eve = self.create_profile("eve", ["python"], niche=True)
+
+        results = self.similar()
+        self.assertEqual(results, [("eve", 0.8165), ("cy", 0.6667), ("bob", 0.5774)])
+        self.assertIn(eve.id, self.engine.overlay)
+
+    def test_deleted_and_unknown_profiles(self):
+        self.similar()
+        self.bob.user.delete()
+        self.assertEqual(self.similar(), [("cy", 0.4082)])
+
+        url = reverse("freelancer-similar-profiles", args=[self.bob.user.uuid])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FreelancerProfileCompletenessTests(LocalCacheTestCase):
+    def setUp(self):
+        self.url = reverse("freelancer_profiles_list")
+        self.user = User.objects.create_user(
+            username="ada", email="ada@example.com", password="password"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile = FreelancerProfile.objects.create(user=self.user)
+        self.python = Skill.objects.create(name="python")
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def completeness(self, profile=None):
+        profile = profile or self.profile
+        profile.refresh_from_db(fields=["completeness"])
+        return profile.completeness
+
+    def make_profile(self, username, **fields):
+        user = User.objects.create_user(
+            username=username, email=f"{username}@example.com", password="password"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            return FreelancerProfile.objects.create(user=user, **fields)
+
+    def test_every_part_adds_its_weight(self):
+        self.assertEqual(self.completeness(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.bio = "Backend developer"
+            self.profile.about_me = ""
+            self.profile.save()
+        self.assertEqual(self.completeness(), 10)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.about_me = "Ten years of Django"
+            self.profile.profile_pic = "https://example.com/ada.png"
+            self.profile.resume = "https://example.com/ada.pdf"
+            self.profile.save()
+            FreelancerSkill.objects.create(freelancer=self.profile, skill=self.python)
+            Project.objects.create(
+                freelancer=self.profile, name="Site", url="https://example.com"
+            )
+            WorkExperience.objects.create(
+                freelancer=self.profile,
+                job_title="Engineer",
+                company="Acme",
+                start_date="2020-01-01",
+                description="Built things",
+            )
+        self.assertEqual(self.completeness(), 100)
+
+    def test_deleting_rows_lowers_the_score(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                freelancer=self.profile, name="Site", url="https://example.com"
+            )
+        self.assertEqual(self.completeness(), 15)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertEqual(self.completeness(), 0)
+
+    def test_profile_update_rescores_the_profile(self):
+        url = reverse("freelancer_profile_details", args=[self.user.uuid])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                url, {"bio": "Hello", "skills": [self.python.id]}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.completeness(), 30)
+
+    def test_imported_profiles_are_scored(self):
+        rows = [
+            {
+                "username": "grace",
+                "email": "grace@example.com",
+                "bio": "Compilers",
+                "skills": ["python"],
+            }
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as file:
+            file.write("\n".join(json.dumps(row) for row in rows))
+            file.flush()
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command(
+                    "import_freelancers", file.name, workers=1, stdout=io.StringIO()
+                )
+        profile = FreelancerProfile.objects.get(user__username="grace")
+        self.assertEqual(profile.completeness, 30)
+
+    def test_update_completeness_command_recomputes_every_profile(self):
+        FreelancerProfile.objects.filter(id=self.profile.id).update(
+            bio="Stale", completeness=0
+        )
+        output = io.StringIO()
+        call_command("update_completeness", batch_size=1, stdout=output)
+        self.assertEqual(self.completeness(), 10)
+        self.assertIn("Updated 1 profiles.", output.getvalue())
+
+    def test_list_orders_and_filters_by_completeness(self):
+        self.make_profile("bob", bio="Hi")
+        self.make_profile("cy", bio="Hi", about_me="More", profile_pic="https://x.io/a")
+
+        response = self.client.get(self.url, {"ordering": "-completeness"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [p["completeness"] for p in response.data["results"]], [40, 10, 0]
+        )
+
+        response = self.client.get(
+            self.url, {"completeness_min": 10, "completeness_max": 20}
+        )
+        self.assertEqual(
+            [p["user"]["username"] for p in response.data["results"]], ["bob"]
+        )
+
+    def test_cursor_walk_by_completeness_with_sparse_fields(self):
+        for i in range(4):
+            self.make_profile(f"user_{i}", bio="Hi" if i % 2 else None)
+        params = {"cursor": "", "page_size": 2, "ordering": "-completeness"}
+        response = self.client.get(self.url, {**params, "fields": "bio"})
+        seen = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [p["bio"] for p in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, ["Hi", "Hi", None, None, None])
+
+
+class FreelancerProfileExperienceTests(LocalCacheTestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("freelancer_profiles_list")
+        self.user = User.objects.create_user(
+            username="ada", email="ada@example.com", password="password"
+        )
+        self.profile = FreelancerProfile.objects.create(user=self.user)
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        today = patch(
+            "freelancer_management.experience.timezone.localdate",
+            return_value=date(2024, 7, 1),
+        )
+        today.start()
+        self.addCleanup(today.stop)
+
+    def months(self, profile=None):
+        profile = profile or self.profile
+        profile.refresh_from_db(fields=["total_experience_months"])
+        return profile.total_experience_months
+
+    def add(self, start_date, end_date=None, current_role=False, profile=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return WorkExperience.objects.create(
+                freelancer=profile or self.profile,
+                job_title="Engineer",
+                company="Acme",
+                start_date=start_date,
+                end_date=end_date,
+                current_role=current_role,
+                description="Built things",
+            )
+
+    def test_merge_intervals(self):
+        intervals = [
+            (date(2020, 6, 1), date(2021, 1, 1)),
+            (date(2018, 1, 1), date(2019, 1, 1)),
+            (date(2020, 1, 1), date(2020, 12, 31)),
+            # Starts the day after the one above ends
+            (date(2019, 1, 2), date(2019, 6, 1)),
+        ]
+        self.assertEqual(
+            merge_intervals(intervals),
+            [
+                (date(2018, 1, 1), date(2019, 6, 1)),
+                (date(2020, 1, 1), date(2021, 1, 1)),
+            ],
+        )
+
+    def test_overlapping_roles_count_once(self):
+        self.add("2020-01-01", "2021-01-01")
+        self.assertEqual(self.months(), 12)
+        # Side job during the first one
+        self.add("2020-06-01", "2021-07-01")
+        self.assertEqual(self.months(), 18)
+        # A gap, then six more months
+        self.add("2022-01-15", "2022-07-14")
+        self.assertEqual(self.months(), 24)
+
+    def test_end_dates_are_included(self):
+        self.assertEqual(months_between(date(2020, 1, 1), date(2020, 12, 31)), 12)
+        self.assertEqual(months_between(date(2020, 1, 15), date(2020, 2, 13)), 0)
+        self.assertEqual(months_between(date(2020, 1, 15), date(2020, 2, 14)), 1)
+        # A full calendar year
+        self.add("2019-01-01", "2019-12-31")
+        self.assertEqual(self.months(), 12)
+
+    def test_current_and_open_ended_roles_run_until_today(self):
+        self.add("2023-07-01", "2023-09-01", current_role=True)
+        self.assertEqual(self.months(), 12)
+        self.add("2022-07-01")
+        self.assertEqual(self.months(), 24)
+        # Not started yet
+        self.add("2025-01-01", "2026-01-01")
+        self.assertEqual(self.months(), 24)
+
+    def test_work_experience_views_update_the_months(self):
+        url = reverse("work-experience-create", args=[self.user.uuid])
+        data = {
+            "job_title": "Engineer",
+            "company": "Acme",
+            "start_date": "2021-01-01",
+            "end_date": "2022-01-01",
+            "current_role": False,
+            "description": "Built things",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.months(), 12)
+
+        url = reverse(
+            "work-experience-delete", args=[self.user.uuid, response.data["id"]]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.months(), 0)
+
+    def test_cached_profile_gets_the_new_months(self):
+        url = reverse("freelancer_profile_details", args=[self.user.uuid])
+        # When a profile write comes first in the transaction, its
+        # invalidation flushes before the months are recomputed and a
+        # concurrent read can cache the old months meanwhile
+        with self.captureOnCommitCallbacks(execute=False):
+            WorkExperience.objects.create(
+                freelancer=self.profile,
+                job_title="Engineer",
+                company="Acme",
+                start_date="2021-01-01",
+                end_date="2022-01-01",
+                description="Built things",
+            )
+        self.assertEqual(self.client.get(url).data["total_experience_months"], 0)
+        refresh_experience([self.profile.id])
+        self.assertEqual(self.client.get(url).data["total_experience_months"], 12)
+
+    def test_updated_role_is_recounted(self):
+        experience = self.add("2021-01-01", "2022-01-01")
+        with self.captureOnCommitCallbacks(execute=True):
+            experience.end_date = date(2023, 1, 1)
+            experience.save()
+        self.assertEqual(self.months(), 24)
+
+    def test_command_recomputes_ongoing_roles(self):
+        ended = FreelancerProfile.objects.create(
+            user=User.objects.create_user(
+                username="bob", email="bob@example.com", password="password"
+            )
+        )
+        self.add("2023-07-01", current_role=True)
+        self.add("2020-01-01", "2021-01-01", profile=ended)
+        FreelancerProfile.objects.update(total_experience_months=0)
+
+        output = io.StringIO()
+        call_command("update_experience", batch_size=1, stdout=output)
+        self.assertEqual(self.months(), 12)
+        self.assertEqual(self.months(ended), 0)
+        self.assertIn("Checked 1 profiles, updated 1.", output.getvalue())
+
+        # A month later
+        with patch(
+            "freelancer_management.experience.timezone.localdate",
+            return_value=date(2024, 8, 1),
+        ):
+            call_command("update_experience", stdout=output)
+            self.assertEqual(self.months(), 13)
+
+            call_command("update_experience", all=True, stdout=output)
+        self.assertEqual(self.months(ended), 12)
+        self.assertIn("Checked 2 profiles, updated 1.", output.getvalue())
+
+    def test_list_orders_and_filters_by_experience(self):
+        for username, start_date in [("bob", "2022-07-01"), ("cy", "2014-07-01")]:
+            profile = FreelancerProfile.objects.create(
+                user=User.objects.create_user(
+                    username=username, email=f"{username}@example.com", password="x"
+                )
+            )
+            self.add(start_date, current_role=True, profile=profile)
+
+        response = self.client.get(self.url, {"ordering": "-total_experience_months"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [p["total_experience_months"] for p in response.data["results"]],
+            [120, 24, 0],
+        )
+
+        # Two years of experience or more
+        response = self.client.get(self.url, {"total_experience_months_min": 24})
+        self.assertEqual(
+            [p["user"]["username"] for p in response.data["results"]], ["bob", "cy"]
+        )
+
+
+class ProjectTagTests(LocalCacheTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="ada", email="ada@example.com", password="password"
+        )
+        self.profile = FreelancerProfile.objects.create(user=self.user)
+        self.react = Skill.objects.create(name="React")
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.search_url = reverse("project-search")
+
+    def create_project(self, name, skills="", tools="", profile=None):
+        return ProjectSerializer().create(
+            {
+                "freelancer": profile or self.profile,
+                "name": name,
+                "url": "https://example.com",
+                "skills": skills,
+                "tools": tools,
+            }
+        )
+
+    def tag_names(self, project, relation):
+        return sorted(getattr(project, relation).values_list("name", flat=True))
+
+    def search(self, **params):
+        response = self.client.get(self.search_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [project["name"] for project in response.data["results"]]
+
+    def test_create_keeps_the_strings_and_tags_the_project(self):
+        url = reverse("project-create", args=[self.user.uuid])
+        response = self.client.post(
+            url,
+            {
+                "name": "Shop",
+                "url": "https://example.com",
+                "skills": "react,  Backend   development, REACT,",
+                "tools": "Figma, nodeJs",
+                "description": "An online shop",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(
+            response.data["skills"], "react,  Backend   development, REACT,"
+        )
+        project = Project.objects.get(id=response.data["id"])
+        # "react" is the existing "React"; free text never becomes a skill
+        self.assertEqual(self.tag_names(project, "skill_tags"), ["React"])
+        self.assertEqual(list(Skill.objects.values_list("name", flat=True)), ["React"])
+        self.assertEqual(self.tag_names(project, "tool_tags"), ["Figma", "nodeJs"])
+
+    def test_updating_the_strings_replaces_the_tags(self):
+        project = self.create_project("Shop", skills="React", tools="Figma")
+        serializer = ProjectSerializer(project, data={"tools": "Docker"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(self.tag_names(project, "tool_tags"), ["Docker"])
+        self.assertEqual(self.tag_names(project, "skill_tags"), ["React"])
+
+    def test_search_across_freelancers(self):
+        other = FreelancerProfile.objects.create(
+            user=User.objects.create_user(
+                username="bob", email="bob@example.com", password="password"
+            )
+        )
+        Skill.objects.create(name="Django")
+        self.create_project("Shop", skills="React, Django", tools="Figma")
+        self.create_project("Blog", skills="react", tools="Docker", profile=other)
+        self.create_project("Api", skills="Django", tools="Docker", profile=other)
+
+        self.assertEqual(self.search(skill="REACT"), ["Blog", "Shop"])
+        self.assertEqual(self.search(skill="react,django"), ["Shop"])
+        self.assertEqual(self.search(skill="django", tool="docker"), ["Api"])
+        self.assertEqual(self.search(tool="Sketch"), [])
+
+    def test_search_cost_does_not_grow_with_matches(self):
+        for i in range(2):
+            self.create_project(f"p{i}", skills="React", tools="Figma")
+        # Loads the taxonomy snapshots the names are resolved from
+        self.search(skill="React", tool="Figma")
+        with CaptureQueriesContext(connection) as context:
+            self.search(skill="React", tool="Figma")
+        small = len(context.captured_queries)
+        for i in range(2, 20):
+            self.create_project(f"p{i}", skills="React", tools="Figma")
+        with CaptureQueriesContext(connection) as context:
+            self.search(skill="React", tool="Figma")
+        self.assertEqual(len(context.captured_queries), small)
+
+    def test_backfill_command_parses_existing_strings(self):
+        Skill.objects.create(name="Vue")
+        Project.objects.bulk_create(
+            [
+                Project(
+                    freelancer=self.profile,
+                    name=f"p{i}",
+                    url="https://example.com",
+                    skills="React, Vue",
+                    tools="Vite" if i % 2 else "",
+                )
+                for i in range(5)
+            ]
+        )
+        output = io.StringIO()
+        call_command("backfill_project_tags", batch_size=2, stdout=output)
+        self.assertIn("Tagged 5 projects.", output.getvalue())
+        self.assertEqual(
+            Project.skill_tags.through.objects.filter(skill=self.react).count(), 5
+        )
+        self.assertEqual(Tool.objects.get(name="Vite").projects.count(), 2)
+        # Running it again changes nothing
+        call_command("backfill_project_tags", stdout=io.StringIO())
+        self.assertEqual(Project.skill_tags.through.objects.count(), 10)
@@ -3,6 +3,7 @@ from django.urls import path
 from freelancer_management.views.language import (
     AddLanguageView,
     DeleteLanguageView,
+    LanguageAutocompleteView,
     LanguageListCreateView,
 )
 from freelancer_management.views.links import (
@@ -12,28 +13,37 @@ from freelancer_management.views.links import (
 from freelancer_management.views.niche import (
     AddNicheView,
     DeleteNicheView,
+    NicheAutocompleteView,
     NicheCreateView,
     NicheListView,
 )
 from freelancer_management.views.profile import (
     FreelanceRegistrationView,
     FreelancerProfileDetail,
+    FreelancerProfileExport,
     FreelancerProfileList,
+    ProfilePictureSignedUploadView,
+    ProfilePictureUploadView,
 )
+from freelancer_management.views.similar import SimilarFreelancersView
 from freelancer_management.views.projects import (
     CoverImageDeleteView,
+    CoverImageSignedUploadView,
     CoverImageUploadView,
     ProjectCreateView,
     ProjectDeleteView,
     ProjectListView,
+    ProjectSearchView,
 )
 from freelancer_management.views.skills import (
     AddSkillsView,
     DeleteSkillView,
+    SkillAutocompleteView,
     SkillListCreateView,
 )
 from freelancer_management.views.work_experience import (
     ResumeDeleteView,
+    ResumeSignedUploadView,
     ResumeUploadView,
     WorkExperienceCreateView,
     WorkExperienceDeleteView,
@@ -45,11 +55,31 @@ urlpatterns = [
         "register/", FreelanceRegistrationView.as_view(), name="freelance_registeration"
     ),
     path("profiles", FreelancerProfileList.as_view(), name="freelancer_profiles_list"),
+    path(
+        "profiles/export",
+        FreelancerProfileExport.as_view(),
+        name="freelancer_profiles_export",
+    ),
     path(
         "profiles/<str:uuid>",
         FreelancerProfileDetail.as_view(),
         name="freelancer_profile_details",
     ),
+    path(
+        "profiles/<str:uuid>/profile-pic/upload",
+        ProfilePictureUploadView.as_view(),
+        name="profile_pic_upload",
+    ),
+    path(
+        "profiles/<str:uuid>/profile-pic/sign",
+        ProfilePictureSignedUploadView.as_view(),
+        name="profile_pic_sign",
+    ),
+    path(
+        "profiles/<str:uuid>/similar",
+        SimilarFreelancersView.as_view(),
+        name="freelancer-similar-profiles",
+    ),
     # Links urls
     path(
         "profiles/<str:uuid>/links",
@@ -73,6 +103,11 @@ urlpatterns = [
         name="delete-freelancer-skills",
     ),
     path("skills", SkillListCreateView.as_view(), name="skill-list-create"),
+    path(
+        "skills/autocomplete",
+        SkillAutocompleteView.as_view(),
+        name="skill-autocomplete",
+    ),
     # Skills urls
     path(
         "profiles/<str:uuid>/languages",
@@ -85,6 +120,11 @@ urlpatterns = [
         name="delete-freelancer-languages",
     ),
     path("languages", LanguageListCreateView.as_view(), name="language-list-create"),
+    path(
+        "languages/autocomplete",
+        LanguageAutocompleteView.as_view(),
+        name="language-autocomplete",
+    ),
     # Niche urls
     path(
         "profiles/<str:uuid>/niches",
@@ -97,8 +137,14 @@ urlpatterns = [
         name="delete-freelancer-niches",
     ),
     path("niches", NicheListView.as_view(), name="niche-list"),
+    path(
+        "niches/autocomplete",
+        NicheAutocompleteView.as_view(),
+        name="niche-autocomplete",
+    ),
     path("niche", NicheCreateView.as_view(), name="niche-create"),
     # Project urls
+    path("projects", ProjectSearchView.as_view(), name="project-search"),
     path(
         "profiles/<str:uuid>/projects",
         ProjectListView.as_view(),
@@ -119,6 +165,11 @@ urlpatterns = [
         CoverImageUploadView.as_view(),
         name="project_cover_image_upload",
     ),
+    path(
+        "profiles/<str:uuid>/project/coverimage/<int:id>/sign",
+        CoverImageSignedUploadView.as_view(),
+        name="project_cover_image_sign",
+    ),
     path(
         "profiles/<str:uuid>/project/coverimage/<int:id>/delete",
         CoverImageDeleteView.as_view(),
@@ -145,6 +196,11 @@ urlpatterns = [
         ResumeUploadView.as_view(),
         name="resume_upload",
     ),
+    path(
+        "profiles/resume/<str:uuid>/sign",
+        ResumeSignedUploadView.as_view(),
+        name="resume_sign",
+    ),
     path(
         "profiles/resume/<str:uuid>/delete",
         ResumeDeleteView.as_view(),
@@ -1,4 +1,3 @@
-from django.db import transaction
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, extend_schema_view
@@ -10,15 +9,20 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from freelancer_management.views.profile import get_freelancer_profile_with_uuid
 from freelancer_management.serializers import (
     FreelancerLanguageSerializer,
-    FreelancerSkillSerializer,
     LanguageSerializer,
-    SkillSerializer,
 )
-from freelancer_management.models import (
-    FreelancerLanguage,
-    FreelancerSkill,
-    Language,
-    Skill,
+from freelancer_management.models import FreelancerLanguage, Language
+from freelancer_management.taxonomy import (
+    TaxonomyAutocompleteView,
+    TaxonomyListMixin,
+    language_taxonomy,
+)
+from freelancer_management.memberships import (
+    CREATED,
+    add_memberships,
+    membership_errors,
+    parse_ids,
+    remove_memberships,
 )
 
 
@@ -34,7 +38,8 @@ from freelancer_management.models import (
         responses={201: LanguageSerializer},
     ),
 )
-class LanguageListCreateView(generics.ListCreateAPIView):
+class LanguageListCreateView(TaxonomyListMixin, generics.ListCreateAPIView):
+    taxonomy = language_taxonomy
     queryset = Language.objects.all()
     serializer_class = LanguageSerializer
     filter_backends = [SearchFilter, OrderingFilter]
@@ -42,6 +47,40 @@ class LanguageListCreateView(generics.ListCreateAPIView):
     search_fields = ["name"]
 
 
+@extend_schema(
+    summary="Autocomplete languages",
+    description=(
+        "Returns the languages used by the most freelancers whose name, or one of "
+        "its words, starts with `q`. Served from memory, meant to be called on "
+        "every keystroke."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="q",
+            description="Prefix typed so far",
+            required=False,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+        ),
+        OpenApiParameter(
+            name="limit",
+            description="Number of completions to return (default 10, max 20)",
+            required=False,
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+        ),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=LanguageSerializer(many=True),
+            description="Completions under `results`, most popular first",
+        )
+    },
+)
+class LanguageAutocompleteView(TaxonomyAutocompleteView):
+    taxonomy = language_taxonomy
+
+
 class AddLanguageView(APIView):
     @extend_schema(
         summary="Add language to a freelancer",
@@ -83,34 +122,26 @@ class AddLanguageView(APIView):
     )
     def post(self, request, uuid):
         freelancer = get_freelancer_profile_with_uuid(uuid)
-        language_ids = request.data.get("languages", [])
-
-        errors = []
-        created_languages = []
+        language_ids = parse_ids(request.data.get("languages", []))
 
-        @transaction.atomic
-        def create_freelancer_languages():
-            for language_id in language_ids:
-                try:
-                    language = Language.objects.get(id=language_id)
-                    freelancer_language, created = (
-                        FreelancerLanguage.objects.get_or_create(
-                            freelancer=freelancer, language=language
-                        )
-                    )
-                    if created:
-                        created_languages.append(freelancer_language.language.name)
-                except Language.DoesNotExist:
-                    errors.append(f"Language with id {language_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        create_freelancer_languages()
+        results, names = add_memberships(FreelancerLanguage, freelancer, language_ids)
+        created_languages = [
+            names[id] for id, result in results.items() if result == CREATED
+        ]
+        errors = membership_errors(FreelancerLanguage, results)
 
         if errors:
-            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {
+                    "errors": errors,
+                    "added_languages": created_languages,
+                    "results": results,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         return Response(
-            {"added_languages": created_languages}, status=status.HTTP_201_CREATED
+            {"added_languages": created_languages, "results": results},
+            status=status.HTTP_201_CREATED,
         )
 
 
@@ -146,27 +177,15 @@ class DeleteLanguageView(APIView):
     )
     def delete(self, request, uuid):
         freelancer = get_freelancer_profile_with_uuid(uuid)
-        language_ids = request.GET.get("languages", "").split(",")
+        language_ids = parse_ids(request.GET.get("languages", ""))
 
-        errors = []
-
-        @transaction.atomic
-        def create_freelancer_language():
-            for language_id in language_ids:
-                try:
-                    language = Language.objects.get(id=language_id)
-                    freelancer_language = FreelancerLanguage.objects.get(
-                        freelancer=freelancer, language=language
-                    )
-                    freelancer_language.delete()
-                except Language.DoesNotExist:
-                    errors.append(f"Language with id {language_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        create_freelancer_language()
+        results = remove_memberships(FreelancerLanguage, freelancer, language_ids)
+        errors = membership_errors(FreelancerLanguage, results)
 
         if errors:
-            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {"errors": errors, "results": results},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         return Response({}, status=status.HTTP_204_NO_CONTENT)
@@ -1,4 +1,3 @@
-from django.db import transaction
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -14,6 +13,19 @@ from freelancer_management.serializers import (
     NicheSerializer,
 )
 from freelancer_management.models import FreelancerNiche, Niche
+from freelancer_management.taxonomy import (
+    TaxonomyAutocompleteView,
+    TaxonomyListMixin,
+    niche_taxonomy,
+)
+from freelancer_management.memberships import (
+    membership_errors,
+    parse_ids,
+    remove_memberships,
+    replace_memberships,
+)
+
+MAX_NICHES = 3
 
 
 @extend_schema_view(
@@ -23,7 +35,8 @@ from freelancer_management.models import FreelancerNiche, Niche
         responses={200: NicheSerializer(many=True)},
     ),
 )
-class NicheListView(generics.ListAPIView):
+class NicheListView(TaxonomyListMixin, generics.ListAPIView):
+    taxonomy = niche_taxonomy
     queryset = Niche.objects.all()
     serializer_class = NicheSerializer
     filter_backends = [SearchFilter, OrderingFilter]
@@ -31,6 +44,40 @@ class NicheListView(generics.ListAPIView):
     search_fields = ["name"]
 
 
+@extend_schema(
+    summary="Autocomplete niches",
+    description=(
+        "Returns the niches used by the most freelancers whose name, or one of "
+        "its words, starts with `q`. Served from memory, meant to be called on "
+        "every keystroke."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="q",
+            description="Prefix typed so far",
+            required=False,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+        ),
+        OpenApiParameter(
+            name="limit",
+            description="Number of completions to return (default 10, max 20)",
+            required=False,
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+        ),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=NicheSerializer(many=True),
+            description="Completions under `results`, most popular first",
+        )
+    },
+)
+class NicheAutocompleteView(TaxonomyAutocompleteView):
+    taxonomy = niche_taxonomy
+
+
 @extend_schema_view(
     post=extend_schema(
         summary="Create a new niche",
@@ -90,47 +137,23 @@ class AddNicheView(APIView):
     )
     def post(self, request, uuid):
         freelancer = get_freelancer_profile_with_uuid(uuid)
-        niche_ids = request.data.get("niches", [])
+        niche_ids = parse_ids(request.data.get("niches", []))
+
+        # The posted niches replace the former ones, at most MAX_NICHES of them
+        results, names, errors = replace_memberships(
+            FreelancerNiche, freelancer, niche_ids, limit=MAX_NICHES
+        )
 
-        # To make sure the user does not add more than 3 niches
-        if len(niche_ids) > 3:
+        if errors:
             return Response(
-                {"error": "Maximum of 3 Niches Per user."},
+                {"errors": errors, "results": results},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # delete former niches
-        FreelancerNiche.objects.filter(freelancer=freelancer).delete()
-        errors = []
-        created_niches = []
-
-        @transaction.atomic
-        def create_freelancer_niche():
-            for niche_id in niche_ids:
-                try:
-                    niche = Niche.objects.get(id=niche_id)
-                    freelancer_niche, created = FreelancerNiche.objects.get_or_create(
-                        freelancer=freelancer, niche=niche
-                    )
-                    if created:
-                        created_niches.append(
-                            {
-                                "name": freelancer_niche.niche.name,
-                                "id": freelancer_niche.niche.id,
-                            }
-                        )
-                except Niche.DoesNotExist:
-                    errors.append(f"Niche with id {niche_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        create_freelancer_niche()
-
-        if errors:
-            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
-
+        created_niches = [{"name": names[id], "id": id} for id in results]
         return Response(
-            {"created_niches": created_niches}, status=status.HTTP_201_CREATED
+            {"created_niches": created_niches, "results": results},
+            status=status.HTTP_201_CREATED,
         )
 
 
@@ -182,27 +205,15 @@ class DeleteNicheView(APIView):
     )
     def delete(self, request, uuid):
         freelancer = get_freelancer_profile_with_uuid(uuid)
-        niche_ids = request.GET.get("niches", "").split(",")
-
-        errors = []
-
-        @transaction.atomic
-        def delete_freelancer_niche():
-            for niche_id in niche_ids:
-                try:
-                    niche = Niche.objects.get(id=niche_id)
-                    freelancer_niche = FreelancerNiche.objects.get(
-                        freelancer=freelancer, niche=niche
-                    )
-                    freelancer_niche.delete()
-                except Niche.DoesNotExist:
-                    errors.append(f"Niche with id {niche_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        delete_freelancer_niche()
+        niche_ids = parse_ids(request.GET.get("niches", ""))
+
+        results = remove_memberships(FreelancerNiche, freelancer, niche_ids)
+        errors = membership_errors(FreelancerNiche, results)
 
         if errors:
-            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {"errors": errors, "results": results},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         return Response({}, status=status.HTTP_204_NO_CONTENT)
@@ -1,5 +1,9 @@
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import status, generics
+from django.utils.dateparse import parse_datetime
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import serializers, status, generics
 from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
 from profile_management.serializers import DocumentationRegisterSerializer
@@ -8,18 +12,32 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
+    OpenApiParameter,
     OpenApiResponse,
 )
 from rest_framework.response import Response
 from drf_spectacular.types import OpenApiTypes
 
-from skill_africa.permissions import IsAuthenticatedWithJWT
+from media_management.serializers import UploadJobSerializer
+from media_management.views import (
+    SignedUploadView,
+    UploadView,
+    signed_upload_schema,
+)
+from skill_africa.conditional import Validators
+from skill_africa.permissions import IsAuthenticatedWithJWT, IsSponsorOrAdmin
+from skill_africa.renderers import CSVRenderer, NDJSONRenderer
 from freelancer_management.serializers import (
     FreelanceSerializer,
     FreelanceProfileSerializer,
 )
 from freelancer_management.models import FreelancerProfile
-from freelancer_management.filters import CustomOrderingFilter, CustomSearchFilter
+from freelancer_management.cache import get_cached_profile, set_cached_profile
+from freelancer_management.filters import (
+    CustomOrderingFilter,
+    CustomSearchFilter,
+    FreelancerProfileFilter,
+)
 
 
 def get_freelancer_profile_with_uuid(uuid):
@@ -28,6 +46,34 @@ def get_freelancer_profile_with_uuid(uuid):
     )
 
 
+def get_profile_updated_at(uuid):
+    return (
+        FreelancerProfile.objects.filter(user__uuid=uuid)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+
+
+class ProfileChildListMixin:
+    """
+    Conditional GET for lists of rows on a profile (projects, work
+    experience). Every write to those rows bumps the profile's `updated_at`,
+    so one indexed lookup validates the list without building it.
+    """
+
+    def list(self, request, *args, **kwargs):
+        updated_at = get_profile_updated_at(self.kwargs["uuid"])
+        if updated_at is None:
+            # Unknown profile, let get_queryset answer 404
+            return super().list(request, *args, **kwargs)
+
+        validators = Validators(updated_at, request)
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        return validators.apply(super().list(request, *args, **kwargs))
+
+
 # Class View for registering Freelancers
 class FreelanceRegistrationView(APIView):
     """
@@ -91,30 +137,148 @@ class FreelanceRegistrationView(APIView):
         return response
 
 
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        description=(
+            "Comma separated top-level fields to return, e.g. "
+            "`first_name,last_name,profile_pic,skills`. Defaults to all fields."
+        ),
+        required=False,
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+    ),
+    OpenApiParameter(
+        name="expand",
+        description=(
+            "Comma separated relations to return (user, links, skills, niches, "
+            "languages). Without `fields`, every plain field is kept, so an "
+            "empty `expand` returns no relations."
+        ),
+        required=False,
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+    ),
+]
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Retrieve a list of freelancer profiles",
+        description="Retrieve a list of freelancer profiles.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
+    ),
+)
 class FreelancerProfileList(generics.ListAPIView):
     queryset = FreelancerProfile.objects.all()
     serializer_class = FreelanceProfileSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticatedWithJWT]
-    filter_backends = [CustomSearchFilter, CustomOrderingFilter]
-    ordering_fields = ["user__username"]
+    filter_backends = [DjangoFilterBackend, CustomSearchFilter, CustomOrderingFilter]
+    filterset_class = FreelancerProfileFilter
+    ordering_fields = ["user__username", "completeness", "total_experience_months"]
     ordering = ["user__username"]
     search_fields = [
         "user__username",
         "user__email",
-        "niche__name",
+        "niches__niche__name",
         "first_name",
         "last_name",
     ]
+    # Set per request by get(); None renders every field
+    requested_fields = None
 
     def get(self, request, *args, **kwargs):
+        self.requested_fields = FreelanceProfileSerializer.get_requested_fields(
+            request.query_params
+        )
         return super().get(request, *args, **kwargs)
 
+    def get_queryset(self):
+        # Unrequested columns and relations are never loaded
+        return FreelanceProfileSerializer.setup_eager_loading(
+            super().get_queryset(), self.requested_fields
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.requested_fields)
+        return super().get_serializer(*args, **kwargs)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Export freelancer profiles",
+        description=(
+            "Streams every freelancer profile matching the same search and "
+            "ordering parameters as the profile list, unpaginated, as NDJSON "
+            "(default) or CSV (`?format=csv` or `Accept: text/csv`). Sponsors "
+            "and admins only."
+        ),
+        parameters=SPARSE_FIELDSET_PARAMETERS,
+        responses={
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+            (200, "text/csv"): OpenApiTypes.STR,
+        },
+    ),
+)
+class FreelancerProfileExport(FreelancerProfileList):
+    """
+    Streams the whole directory instead of holding pages in memory: profiles
+    are read `chunk_size` at a time with their relations prefetched per
+    chunk, and every chunk is encoded and sent before the next is read.
+    """
+
+    permission_classes = [IsAuthenticatedWithJWT, IsSponsorOrAdmin]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    pagination_class = None
+    chunk_size = 500
+
+    def get(self, request, *args, **kwargs):
+        self.requested_fields = FreelanceProfileSerializer.get_requested_fields(
+            request.query_params
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            self.stream(queryset, self.get_serializer(), renderer),
+            content_type=renderer.media_type
+            + (f"; charset={renderer.charset}" if renderer.charset else ""),
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="freelancers.{renderer.format}"'
+        )
+        return response
+
+    def stream(self, queryset, serializer, renderer):
+        columns = self.get_columns(serializer)
+        yield renderer.render_header(columns)
+        rows = []
+        for instance in queryset.iterator(chunk_size=self.chunk_size):
+            representation = serializer.to_representation(instance)
+            rows.append(renderer.render_row(representation, columns))
+            if len(rows) == self.chunk_size:
+                yield b"".join(rows)
+                rows = []
+        if rows:
+            yield b"".join(rows)
+
+    @staticmethod
+    def get_columns(serializer):
+        # Nested objects (user) are flattened into one column per field
+        columns = []
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.Serializer):
+                columns += [f"{name}.{child}" for child in field.fields]
+            else:
+                columns.append(name)
+        return columns
+
 
 @extend_schema_view(
     get=extend_schema(
         summary="Retrieve a freelancer profile",
         description="Retrieve the details of a freelancer profile by UUID.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
         responses={200: FreelanceProfileSerializer},
     ),
     put=extend_schema(
@@ -148,9 +312,33 @@ class FreelancerProfileDetail(APIView):
         return get_freelancer_profile_with_uuid(uuid)
 
     def get(self, request, uuid):
-        profile = self.get_object(uuid)
-        serializer = FreelanceProfileSerializer(profile)
-        return Response(serializer.data)
+        fields = FreelanceProfileSerializer.get_requested_fields(request.query_params)
+        data = get_cached_profile(uuid)
+        if data is not None and "updated_at" in data:
+            # A revalidated cache hit costs no query at all
+            validators = Validators(parse_datetime(data["updated_at"]), request)
+            not_modified = validators.not_modified(request)
+            if not_modified is not None:
+                return not_modified
+            if fields is not None:
+                data = {name: data[name] for name in fields}
+            return validators.apply(Response(data))
+
+        # Validate against the profile row before loading its relations
+        profile = get_freelancer_profile_with_uuid(uuid)
+        validators = Validators(profile.updated_at, request)
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+
+        prefetch_related_objects(
+            [profile], *FreelanceProfileSerializer.get_prefetches(fields)
+        )
+        data = FreelanceProfileSerializer(profile, fields=fields).data
+        # Only full representations are cached, sparse ones are cut from them
+        if fields is None:
+            set_cached_profile(uuid, data)
+        return validators.apply(Response(data))
 
     def put(self, request, uuid):
         profile = self.get_object(uuid)
@@ -163,6 +351,8 @@ class FreelancerProfileDetail(APIView):
         serializer = FreelanceProfileSerializer(profile, data=request.data)
         if serializer.is_valid():
             serializer.save()
+            # Recomputed in the database once the update committed
+            profile.refresh_from_db(fields=["completeness"])
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -176,3 +366,54 @@ class FreelancerProfileDetail(APIView):
 
         profile.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="Upload Profile Picture",
+        description=(
+            "Uploads a profile picture (JPEG or PNG, at most 5 MB) for the "
+            "freelancer, replacing any existing one. The upload runs in the "
+            "background: the response is the queued job, whose `status_url` "
+            "reports its progress and, once done, the picture url."
+        ),
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    "profile_pic": {
+                        "type": "string",
+                        "format": "binary",
+                        "description": "Image file to be uploaded (JPEG or PNG only).",
+                    }
+                },
+                "required": ["profile_pic"],
+            }
+        },
+        responses={
+            202: UploadJobSerializer,
+            400: OpenApiTypes.OBJECT,
+            401: OpenApiTypes.OBJECT,
+        },
+    ),
+)
+class ProfilePictureUploadView(UploadView):
+    target = "profile_pic"
+    file_field = "profile_pic"
+    SUPPORTED_MIME_TYPES = ["image/jpeg", "image/png"]
+    MAX_FILE_SIZE_MB = 5
+
+    def get_object(self, uuid):
+        freelancer = get_freelancer_profile_with_uuid(uuid)
+        return freelancer, freelancer.user
+
+
+@extend_schema_view(
+    post=signed_upload_schema(
+        "Sign a direct Profile Picture upload",
+        "Signs an upload of a profile picture (JPEG or PNG, at most 5 MB) "
+        "the client sends straight to the media storage.",
+    ),
+)
+class ProfilePictureSignedUploadView(SignedUploadView):
+    upload_view = ProfilePictureUploadView
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.views import APIView
@@ -6,12 +7,24 @@ from rest_framework.response import Response
 from drf_spectacular.utils import OpenApiResponse, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from freelancer_management.filters import ProjectFilter
 from freelancer_management.models import Project
 from freelancer_management.serializers import FreelanceSerializer, ProjectSerializer
-from freelancer_management.views.profile import get_freelancer_profile_with_uuid
+from freelancer_management.views.profile import (
+    ProfileChildListMixin,
+    get_freelancer_profile_with_uuid,
+)
+from media_management import dedup
+from media_management.serializers import UploadJobSerializer
+from media_management.views import (
+    SignedUploadView,
+    UploadView,
+    signed_upload_schema,
+)
 from skill_africa.permissions import IsAuthenticatedWithJWT
-from skill_africa.utils import delete_file_from_cloudinary, upload_file_to_cloudinary
 
 
 @extend_schema_view(
@@ -21,7 +34,7 @@ from skill_africa.utils import delete_file_from_cloudinary, upload_file_to_cloud
         responses={200: ProjectSerializer(many=True)},
     ),
 )
-class ProjectListView(generics.ListAPIView):
+class ProjectListView(ProfileChildListMixin, generics.ListAPIView):
     serializer_class = ProjectSerializer
     filter_backends = [SearchFilter, OrderingFilter]
     ordering = ["name"]
@@ -33,6 +46,28 @@ class ProjectListView(generics.ListAPIView):
         return Project.objects.filter(freelancer=freelancer)
 
 
+@extend_schema_view(
+    get=extend_schema(
+        summary="Search projects by skill or tool",
+        description=(
+            "Projects of every freelancer using the given skills and tools. "
+            "`skill` and `tool` take comma separated names, matched "
+            "case-insensitively; a project must have all of them."
+        ),
+        responses={200: ProjectSerializer(many=True)},
+    ),
+)
+class ProjectSearchView(generics.ListAPIView):
+    queryset = Project.objects.all()
+    serializer_class = ProjectSerializer
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticatedWithJWT]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = ProjectFilter
+    ordering_fields = ["name", "updated_at"]
+    ordering = ["name"]
+
+
 class ProjectCreateView(APIView):
     permission_classes = [IsAuthenticatedWithJWT]
 
@@ -165,7 +200,9 @@ class ProjectDeleteView(APIView):
     summary="Upload Cover Image for Project",
     description=(
         "Allows authenticated users to upload a cover image for their project using the project ID. "
-        "The file must be an image (JPEG or PNG) and will replace any existing cover image."
+        "The file must be an image (JPEG or PNG) and will replace any existing cover image. "
+        "The upload runs in the background: the response is the queued job, whose "
+        "`status_url` reports its progress and, once done, the image url."
     ),
     request={
         "multipart/form-data": {
@@ -181,20 +218,11 @@ class ProjectDeleteView(APIView):
         }
     },
     responses={
-        201: OpenApiTypes.OBJECT,
+        202: UploadJobSerializer,
         400: OpenApiTypes.OBJECT,
         401: OpenApiTypes.OBJECT,
-        500: OpenApiTypes.OBJECT,
     },
     examples=[
-        OpenApiExample(
-            "Successful Upload",
-            value={
-                "message": "File uploaded successfully",
-                "cover_image": "https://res.cloudinary.com/demo/image/upload/sample.jpg",
-            },
-            status_codes=["201"],
-        ),
         OpenApiExample(
             "Unsupported File Type",
             value={"error": "Unsupported file type"},
@@ -207,74 +235,27 @@ class ProjectDeleteView(APIView):
         ),
     ],
 )
-class CoverImageUploadView(APIView):
-    permission_classes = [IsAuthenticatedWithJWT]
+class CoverImageUploadView(UploadView):
+    target = "cover_image"
+    file_field = "image"
     SUPPORTED_MIME_TYPES = ["image/jpeg", "image/png"]
     MAX_FILE_SIZE_MB = 5
 
-    def post(self, request, uuid, id):
-        try:
-            file = request.FILES.get("image")
-            freelancer = get_freelancer_profile_with_uuid(uuid)
-            project = get_object_or_404(Project, id=id)
-
-            if not file:
-                return Response(
-                    {"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST
-                )
-
-            # Check if the file type is supported
-            if file.content_type not in self.SUPPORTED_MIME_TYPES:
-                return Response(
-                    {"error": "Unsupported file type"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            # Check file size (convert MAX_FILE_SIZE_MB to bytes)
-            max_file_size_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
-            if file.size > max_file_size_bytes:
-                return Response(
-                    {
-                        "error": f"File size exceeds the maximum limit of {self.MAX_FILE_SIZE_MB} MB."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            if request.user != freelancer.user:
-                return Response(
-                    {"error": "User Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED
-                )
+    def get_object(self, uuid, id):
+        freelancer = get_freelancer_profile_with_uuid(uuid)
+        project = get_object_or_404(Project, id=id, freelancer=freelancer)
+        return project, freelancer.user
 
-            # Delete any previous file
-            if project.image_public_id:
-                delete_file_from_cloudinary(project.image_public_id)
 
-            # Upload the file to Cloudinary
-            result = upload_file_to_cloudinary(file, folder="skill_afrika")
-            serializer = ProjectSerializer(
-                project,
-                data={
-                    "image_public_id": result["public_id"],
-                    "image": result["secure_url"],
-                },
-                partial=True,
-            )
-            if serializer.is_valid():
-                serializer.save()
-                return Response(
-                    {
-                        "message": "File uploaded successfully",
-                        "cover_image": result["secure_url"],
-                    },
-                    status=status.HTTP_201_CREATED,
-                )
-            return Response(
-                {"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
-            )
-        except Exception as e:
-            return Response(
-                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+@extend_schema_view(
+    post=signed_upload_schema(
+        "Sign a direct Cover Image upload for Project",
+        "Signs an upload of a cover image (JPEG or PNG, at most 5 MB) the "
+        "client sends straight to the media storage.",
+    ),
+)
+class CoverImageSignedUploadView(SignedUploadView):
+    upload_view = CoverImageUploadView
 
 
 @extend_schema(
@@ -322,11 +303,14 @@ class CoverImageDeleteView(APIView):
 
             # Delete any file, if any
             if project.image_public_id:
-                delete_file_from_cloudinary(project.image_public_id)
-                project.image = None
-                project.image_public_id = None
+                with transaction.atomic():
+                    # Deleted from the storage in the background, unless shared
+                    dedup.release([project.image_public_id])
+                    project.image = None
+                    project.image_public_id = None
+                    project.image_thumbnail = None
 
-                project.save()
+                    project.save()
                 return Response({}, status=status.HTTP_204_NO_CONTENT)
             return Response(
                 {"error": "Project has no cover image"},
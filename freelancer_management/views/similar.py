@@ -0,0 +1,75 @@
+from django.http import Http404
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from freelancer_management.models import FreelancerProfile
+from freelancer_management.serializers import FreelanceProfileSerializer
+from freelancer_management.similarity import similarity_engine
+from freelancer_management.views.profile import SPARSE_FIELDSET_PARAMETERS
+from skill_africa.permissions import IsAuthenticatedWithJWT
+
+
+class SimilarFreelancersView(APIView):
+    """
+    Profiles sharing the most skills, niches and languages with a profile,
+    served from the precomputed similarity index.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticatedWithJWT]
+    default_limit = 10
+    max_limit = 50
+    # Ranked ids beyond the limit, in case some profiles were deleted since
+    # the index was built
+    slack = 10
+
+    @extend_schema(
+        summary="Retrieve freelancers similar to a profile",
+        description=(
+            "Profiles ranked by the cosine similarity of their skills, niches "
+            "and languages with this profile's, most similar first. Every "
+            "result carries its `similarity` (0 to 1)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                description="Number of profiles to return (1-50, default 10).",
+                required=False,
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+            *SPARSE_FIELDSET_PARAMETERS,
+        ],
+        responses={200: FreelanceProfileSerializer(many=True)},
+    )
+    def get(self, request, uuid):
+        fields = FreelanceProfileSerializer.get_requested_fields(request.query_params)
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        profile_id = (
+            FreelancerProfile.objects.filter(user__uuid=uuid)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if profile_id is None:
+            raise Http404
+
+        scores = dict(similarity_engine.similar(profile_id, limit + self.slack))
+        profiles = FreelanceProfileSerializer.setup_eager_loading(
+            FreelancerProfile.objects.filter(id__in=scores), fields
+        )
+        profiles = sorted(profiles, key=lambda p: (-scores[p.id], p.id))[:limit]
+
+        results = []
+        for profile in profiles:
+            data = FreelanceProfileSerializer(profile, fields=fields).data
+            data["similarity"] = round(scores[profile.id], 4)
+            results.append(data)
+        return Response({"results": results})
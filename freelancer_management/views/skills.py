@@ -1,4 +1,3 @@
-from django.db import transaction
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, extend_schema_view
@@ -10,6 +9,18 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from freelancer_management.views.profile import get_freelancer_profile_with_uuid
 from freelancer_management.serializers import FreelancerSkillSerializer, SkillSerializer
 from freelancer_management.models import FreelancerSkill, Skill
+from freelancer_management.taxonomy import (
+    TaxonomyAutocompleteView,
+    TaxonomyListMixin,
+    skill_taxonomy,
+)
+from freelancer_management.memberships import (
+    CREATED,
+    add_memberships,
+    membership_errors,
+    parse_ids,
+    remove_memberships,
+)
 
 
 @extend_schema_view(
@@ -24,7 +35,8 @@ from freelancer_management.models import FreelancerSkill, Skill
         responses={201: SkillSerializer},
     ),
 )
-class SkillListCreateView(generics.ListCreateAPIView):
+class SkillListCreateView(TaxonomyListMixin, generics.ListCreateAPIView):
+    taxonomy = skill_taxonomy
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     filter_backends = [SearchFilter, OrderingFilter]
@@ -32,6 +44,40 @@ class SkillListCreateView(generics.ListCreateAPIView):
     search_fields = ["name"]
 
 
+@extend_schema(
+    summary="Autocomplete skills",
+    description=(
+        "Returns the skills used by the most freelancers whose name, or one of "
+        "its words, starts with `q`. Served from memory, meant to be called on "
+        "every keystroke."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="q",
+            description="Prefix typed so far",
+            required=False,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+        ),
+        OpenApiParameter(
+            name="limit",
+            description="Number of completions to return (default 10, max 20)",
+            required=False,
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+        ),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=SkillSerializer(many=True),
+            description="Completions under `results`, most popular first",
+        )
+    },
+)
+class SkillAutocompleteView(TaxonomyAutocompleteView):
+    taxonomy = skill_taxonomy
+
+
 class AddSkillsView(APIView):
     @extend_schema(
         summary="Add skills to a freelancer",
@@ -82,32 +128,26 @@ class AddSkillsView(APIView):
     )
     def post(self, request, uuid):
         freelancer = get_freelancer_profile_with_uuid(uuid)
-        skill_ids = request.data.get("skills", [])
+        skill_ids = parse_ids(request.data.get("skills", []))
 
-        errors = []
-        created_skills = []
-
-        @transaction.atomic
-        def create_freelancer_skills():
-            for skill_id in skill_ids:
-                try:
-                    skill = Skill.objects.get(id=skill_id)
-                    freelancer_skill, created = FreelancerSkill.objects.get_or_create(
-                        freelancer=freelancer, skill=skill
-                    )
-                    if created:
-                        created_skills.append(freelancer_skill.skill.name)
-                except Skill.DoesNotExist:
-                    errors.append(f"Skill with id {skill_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        create_freelancer_skills()
+        results, names = add_memberships(FreelancerSkill, freelancer, skill_ids)
+        created_skills = [
+            names[id] for id, result in results.items() if result == CREATED
+        ]
+        errors = membership_errors(FreelancerSkill, results)
 
         if errors:
-            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {
+                    "errors": errors,
+                    "created_skills": created_skills,
+                    "results": results,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         return Response(
-            {"created_skills": created_skills}, status=status.HTTP_201_CREATED
+            {"created_skills": created_skills, "results": results},
+            status=status.HTTP_201_CREATED,
         )
 
 
@@ -159,27 +199,15 @@ class DeleteSkillView(APIView):
     )
     def delete(self, request, uuid):
         freelancer = get_freelancer_profile_with_uuid(uuid)
-        skill_ids = request.GET.get("skills", "").split(",")
+        skill_ids = parse_ids(request.GET.get("skills", ""))
 
-        errors = []
-
-        @transaction.atomic
-        def create_freelancer_skill():
-            for skill_id in skill_ids:
-                try:
-                    skill = Skill.objects.get(id=skill_id)
-                    freelancer_skill = FreelancerSkill.objects.get(
-                        freelancer=freelancer, skill=skill
-                    )
-                    freelancer_skill.delete()
-                except Skill.DoesNotExist:
-                    errors.append(f"Skill with id {skill_id} does not exist.")
-                except Exception as e:
-                    errors.append(str(e))
-
-        create_freelancer_skill()
+        results = remove_memberships(FreelancerSkill, freelancer, skill_ids)
+        errors = membership_errors(FreelancerSkill, results)
 
         if errors:
-            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                {"errors": errors, "results": results},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         return Response({}, status=status.HTTP_204_NO_CONTENT)
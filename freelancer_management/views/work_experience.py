@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.views import APIView
@@ -8,13 +9,19 @@ from drf_spectacular.types import OpenApiTypes
 from rest_framework.filters import SearchFilter, OrderingFilter
 
 from freelancer_management.models import WorkExperience
-from freelancer_management.serializers import (
-    FreelanceSerializer,
-    WorkExperienceSerializer,
+from freelancer_management.serializers import WorkExperienceSerializer
+from freelancer_management.views.profile import (
+    ProfileChildListMixin,
+    get_freelancer_profile_with_uuid,
+)
+from media_management import dedup
+from media_management.serializers import UploadJobSerializer
+from media_management.views import (
+    SignedUploadView,
+    UploadView,
+    signed_upload_schema,
 )
-from freelancer_management.views.profile import get_freelancer_profile_with_uuid
 from skill_africa.permissions import IsAuthenticatedWithJWT
-from skill_africa.utils import delete_file_from_cloudinary, upload_file_to_cloudinary
 
 
 @extend_schema_view(
@@ -24,7 +31,7 @@ from skill_africa.utils import delete_file_from_cloudinary, upload_file_to_cloud
         responses={200: WorkExperienceSerializer(many=True)},
     ),
 )
-class WorkExperienceListView(generics.ListAPIView):
+class WorkExperienceListView(ProfileChildListMixin, generics.ListAPIView):
     serializer_class = WorkExperienceSerializer
     filter_backends = [SearchFilter, OrderingFilter]
     ordering = ["start_date", "end_date", "job_title", "company", "description"]
@@ -161,7 +168,9 @@ class WorkExperienceDeleteView(APIView):
     summary="Upload Resume",
     description=(
         "Allows authenticated users to upload a resume for a freelancer using their UUID. "
-        "The file must be a pdf and will replace any existing resume. Size must be less than 5mb"
+        "The file must be a pdf and will replace any existing resume. Size must be less than 5mb. "
+        "The upload runs in the background: the response is the queued job, whose "
+        "`status_url` reports its progress and, once done, the resume url."
     ),
     request={
         "multipart/form-data": {
@@ -177,20 +186,11 @@ class WorkExperienceDeleteView(APIView):
         }
     },
     responses={
-        201: OpenApiTypes.OBJECT,
+        202: UploadJobSerializer,
         400: OpenApiTypes.OBJECT,
         401: OpenApiTypes.OBJECT,
-        500: OpenApiTypes.OBJECT,
     },
     examples=[
-        OpenApiExample(
-            "Successful Upload",
-            value={
-                "message": "File uploaded successfully",
-                "resume": "https://res.cloudinary.com/demo/image/upload/sample.jpg",
-            },
-            status_codes=["201"],
-        ),
         OpenApiExample(
             "Unsupported File Type",
             value={"error": "Unsupported file type"},
@@ -203,72 +203,26 @@ class WorkExperienceDeleteView(APIView):
         ),
     ],
 )
-class ResumeUploadView(APIView):
-    permission_classes = [IsAuthenticatedWithJWT]
+class ResumeUploadView(UploadView):
+    target = "resume"
+    file_field = "resume"
     SUPPORTED_MIME_TYPES = ["application/pdf"]
     MAX_FILE_SIZE_MB = 5
 
-    def post(self, request, uuid):
-        try:
-            file = request.FILES.get("resume")
-            freelancer = get_freelancer_profile_with_uuid(uuid)
-
-            if not file:
-                return Response(
-                    {"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST
-                )
-
-            # Check if the file type is supported
-            if file.content_type not in self.SUPPORTED_MIME_TYPES:
-                return Response(
-                    {"error": "Unsupported file type"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            # Check file size (convert MAX_FILE_SIZE_MB to bytes)
-            max_file_size_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
-            if file.size > max_file_size_bytes:
-                return Response(
-                    {
-                        "error": f"File size exceeds the maximum limit of {self.MAX_FILE_SIZE_MB} MB."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            if request.user != freelancer.user:
-                return Response(
-                    {"error": "User Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED
-                )
+    def get_object(self, uuid):
+        freelancer = get_freelancer_profile_with_uuid(uuid)
+        return freelancer, freelancer.user
 
-            # Delete any previous file
-            if freelancer.resume_public_id:
-                delete_file_from_cloudinary(freelancer.resume_public_id)
 
-            # Upload the file to Cloudinary
-            result = upload_file_to_cloudinary(file, folder="skill_afrika")
-            serializer = FreelanceSerializer(
-                freelancer,
-                data={
-                    "resume_public_id": result["public_id"],
-                    "resume": result["secure_url"],
-                },
-            )
-            if serializer.is_valid():
-                serializer.save()
-                return Response(
-                    {
-                        "message": "File uploaded successfully",
-                        "resume": result["secure_url"],
-                    },
-                    status=status.HTTP_201_CREATED,
-                )
-            return Response(
-                {"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
-            )
-        except Exception as e:
-            return Response(
-                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+@extend_schema_view(
+    post=signed_upload_schema(
+        "Sign a direct Resume upload",
+        "Signs an upload of a resume (pdf, at most 5 MB) the client sends "
+        "straight to the media storage.",
+    ),
+)
+class ResumeSignedUploadView(SignedUploadView):
+    upload_view = ResumeUploadView
 
 
 @extend_schema(
@@ -315,11 +269,13 @@ class ResumeDeleteView(APIView):
 
             # Delete any file, if any
             if freelancer.resume_public_id:
-                delete_file_from_cloudinary(freelancer.resume_public_id)
-                freelancer.resume_public_id = None
-                freelancer.resume = None
+                with transaction.atomic():
+                    # Deleted from the storage in the background, unless shared
+                    dedup.release([freelancer.resume_public_id])
+                    freelancer.resume_public_id = None
+                    freelancer.resume = None
 
-                freelancer.save()
+                    freelancer.save()
                 return Response({}, status=status.HTTP_204_NO_CONTENT)
             return Response(
                 {"error": "User has no resume"},
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class MediaManagementConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "media_management"
+
+    def ready(self):
+        from media_management import storage  # noqa: F401
+        from media_management.signals import connect_signals
+
+        connect_signals()
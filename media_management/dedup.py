@@ -0,0 +1,117 @@
+"""
+Sharing of stored files between rows whose uploads have the same content.
+
+Spooled uploads are hashed as they are written. Once a file with a given
+hash is stored, it is indexed in StoredFile with a count of the rows pointing
+at it; later uploads of the same content point at it too instead of sending
+the bytes again. Dropping a file goes through `release`, which only deletes
+it once no row points at it anymore. Files that are not indexed, like direct
+uploads, have a single row and are deleted right away.
+
+An indexed file exists as long as its StoredFile row does: the row goes in
+the same transaction that queues the file for deletion, and is locked by
+whoever adds a reference.
+"""
+
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from media_management.deletions import deletion_queue
+from media_management.models import StoredFile
+from media_management.storage import thumbnail_id
+
+
+def content_hasher():
+    return hashlib.sha256()
+
+
+def retain(content_hash, public_id=None, url="", thumbnail_url=None, size=0):
+    """
+    Adds a reference to the stored file with `content_hash`, indexing the
+    given file when there is none yet. Returns the StoredFile, or None when
+    there is none and no file is given.
+    """
+    with transaction.atomic():
+        stored = (
+            StoredFile.objects.select_for_update()
+            .filter(content_hash=content_hash)
+            .first()
+        )
+        if stored is None:
+            if public_id is None:
+                return None
+            try:
+                with transaction.atomic():
+                    stored = StoredFile.objects.create(
+                        content_hash=content_hash,
+                        public_id=public_id,
+                        url=url,
+                        thumbnail_url=thumbnail_url,
+                        size=size,
+                    )
+            except IntegrityError:
+                # Indexed meanwhile by an upload of the same content
+                stored = StoredFile.objects.select_for_update().get(
+                    content_hash=content_hash
+                )
+        StoredFile.objects.filter(id=stored.id).update(refcount=F("refcount") + 1)
+        stored.refcount += 1
+        return stored
+
+
+def release(public_ids):
+    """
+    Drops a reference to each of `public_ids` and queues the deletion of the
+    files no row points at anymore.
+    """
+    public_ids = [public_id for public_id in public_ids if public_id]
+    if not public_ids:
+        return
+    with transaction.atomic():
+        indexed = {
+            stored.public_id: stored
+            for stored in StoredFile.objects.select_for_update().filter(
+                public_id__in=public_ids
+            )
+        }
+        unused = []
+        for public_id in public_ids:
+            stored = indexed.get(public_id)
+            if stored is None:
+                unused.append(public_id)
+            else:
+                stored.refcount = max(stored.refcount - 1, 0)
+        for stored in indexed.values():
+            if stored.refcount:
+                stored.save(update_fields=["refcount"])
+            else:
+                stored.delete()
+                unused.append(stored.public_id)
+        deletion_queue.add(with_thumbnails(unused))
+
+
+def with_thumbnails(public_ids):
+    # Only images have one, deleting a missing thumbnail is harmless
+    return [
+        stored_id
+        for public_id in public_ids
+        for stored_id in (public_id, thumbnail_id(public_id))
+    ]
+
+
+def discard(public_id):
+    """
+    Queues the deletion of a file no row was ever pointed at, unless it is
+    an indexed file others share.
+    """
+    if not StoredFile.objects.filter(public_id=public_id).exists():
+        deletion_queue.add(with_thumbnails([public_id]))
+
+
+def forget(public_ids):
+    """
+    Drops the index entries of files deleted behind the index's back.
+    """
+    StoredFile.objects.filter(public_id__in=public_ids).delete()
@@ -0,0 +1,150 @@
+"""
+Deletion of stored files nothing points at anymore.
+
+Files are not deleted by the request or upload that dropped them: their
+public ids go to the PendingDeletion table, in the same transaction as the
+change that dropped them, and are deleted in batches of up to
+BULK_DELETE_LIMIT per call to the storage's bulk delete API. A flush runs on
+the upload worker pool once the transaction commits, and `run_upload_worker`
+flushes whatever is left. Failed deletions are retried with capped
+exponential backoff; they are never dropped.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from media_management import workers
+from media_management.models import PendingDeletion
+from media_management.storage import BULK_DELETE_LIMIT, StorageError, get_storage
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of destroy_many meaning the file is gone
+GONE = ("deleted", "not_found")
+
+
+class DeletionQueue:
+    batch_size = BULK_DELETE_LIMIT
+    # Delay before the first retry, doubled after every failed attempt
+    backoff = timedelta(seconds=30)
+    max_backoff = timedelta(hours=1)
+    # Claimed rows are left alone for this long by other workers
+    lease = timedelta(minutes=5)
+    # Failures are logged as errors from this attempt on
+    alert_attempts = 5
+
+    def add(self, public_ids, resource_type="image"):
+        """
+        Schedules the deletion of `public_ids`, skipping empty ones. The
+        flush starts once the surrounding transaction commits.
+        """
+        public_ids = [public_id for public_id in dict.fromkeys(public_ids) if public_id]
+        if not public_ids:
+            return 0
+        PendingDeletion.objects.bulk_create(
+            [
+                PendingDeletion(public_id=public_id, resource_type=resource_type)
+                for public_id in public_ids
+            ],
+            ignore_conflicts=True,
+        )
+        transaction.on_commit(self.submit)
+        return len(public_ids)
+
+    def submit(self):
+        return workers.submit(self.flush)
+
+    def flush(self):
+        """
+        Deletes every file that is due, a batch per call to the storage.
+        Returns how many are gone.
+        """
+        gone = 0
+        while True:
+            batch = self.claim()
+            if not batch:
+                return gone
+            gone += self.delete(batch)
+
+    def claim(self):
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                PendingDeletion.objects.select_for_update(skip_locked=True)
+                .filter(next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "id")[: self.batch_size]
+            )
+            PendingDeletion.objects.filter(
+                id__in=[deletion.id for deletion in batch]
+            ).update(next_attempt_at=now + self.lease)
+        return batch
+
+    def delete(self, batch):
+        storage = get_storage()
+        by_type = defaultdict(list)
+        for deletion in batch:
+            by_type[deletion.resource_type].append(deletion)
+
+        gone = 0
+        for resource_type, deletions in by_type.items():
+            public_ids = [deletion.public_id for deletion in deletions]
+            try:
+                outcome = storage.destroy_many(public_ids, resource_type=resource_type)
+            except StorageError as e:
+                self.retry(deletions, str(e))
+                continue
+            done = [d for d in deletions if outcome.get(d.public_id) in GONE]
+            PendingDeletion.objects.filter(id__in=[d.id for d in done]).delete()
+            gone += len(done)
+            for deletion in deletions:
+                if deletion not in done:
+                    error = outcome.get(deletion.public_id) or "missing from response"
+                    self.retry([deletion], f"Not deleted: {error}")
+        return gone
+
+    def retry(self, deletions, error):
+        now = timezone.now()
+        for deletion in deletions:
+            deletion.attempts += 1
+            deletion.last_error = error
+            delay = min(self.backoff * 2 ** (deletion.attempts - 1), self.max_backoff)
+            deletion.next_attempt_at = now + delay
+            level = (
+                logging.ERROR
+                if deletion.attempts >= self.alert_attempts
+                else logging.WARNING
+            )
+            logger.log(
+                level,
+                "Could not delete %s (attempt %s): %s",
+                deletion.public_id,
+                deletion.attempts,
+                error,
+            )
+        PendingDeletion.objects.bulk_update(
+            deletions, ["attempts", "last_error", "next_attempt_at"]
+        )
+
+    def stats(self):
+        """
+        Returns the depth of the queue, how much of it is due or being
+        retried, and the age in seconds of the oldest deletion.
+        """
+        now = timezone.now()
+        summary = PendingDeletion.objects.aggregate(
+            depth=Count("id"),
+            due=Count("id", filter=Q(next_attempt_at__lte=now)),
+            retrying=Count("id", filter=Q(attempts__gt=0)),
+            oldest=Min("created_at"),
+        )
+        oldest = summary.pop("oldest")
+        summary["oldest_age"] = (now - oldest).total_seconds() if oldest else 0.0
+        return summary
+
+
+deletion_queue = DeletionQueue()
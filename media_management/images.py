@@ -0,0 +1,145 @@
+"""
+Normalization of uploaded images before they are stored.
+
+Cover images and profile pictures are checked, turned upright, stripped of
+their metadata (EXIF, GPS, color profiles), downscaled to `max_dimension`
+and re-encoded as WebP, with a square thumbnail next to them. Decoding and
+encoding are CPU bound, so they run in a pool of IMAGE_WORKERS processes:
+the upload worker threads only wait on them, and neither they nor request
+threads hold the GIL meanwhile. With 0 workers images are processed in the
+calling thread.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+class ImageError(Exception):
+    """
+    The file is not an image that can be stored.
+    """
+
+
+def normalize(source, destination, thumbnail, options):
+    """
+    Writes the normalized image of the file at `source` to `destination` and
+    its thumbnail to `thumbnail`. Returns the size of both images. Runs in
+    the pool processes, so everything it needs comes in `options`.
+    """
+    try:
+        with Image.open(source) as image:
+            width, height = image.size
+            if width * height > options["max_pixels"]:
+                raise ImageError(f"The image is too large ({width}x{height} pixels).")
+            # JPEG can decode straight at a fraction of the size
+            max_dimension = options["max_dimension"]
+            image.draft("RGB", (max_dimension, max_dimension))
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGBA" if has_alpha(image) else "RGB")
+    except (UnidentifiedImageError, OSError, ValueError) as e:
+        raise ImageError(f"The file is not a valid image: {e}") from e
+
+    image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    # Saving without exif or icc_profile leaves the metadata behind
+    save(image, destination, options)
+    size = options["thumbnail_size"]
+    square = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+    save(square, thumbnail, options)
+    return {"size": image.size, "thumbnail_size": square.size}
+
+
+def has_alpha(image):
+    return image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+
+
+def save(image, path, options):
+    if options["format"] == "JPEG":
+        image = image.convert("RGB")
+    image.save(path, options["format"], quality=options["quality"])
+
+
+class ImageProcessor:
+    # Longest side of stored images
+    max_dimension = 2048
+    # Side of the square thumbnails
+    thumbnail_size = 400
+    format = "WEBP"
+    quality = 80
+    # Larger images are refused before being decoded
+    max_pixels = 40_000_000
+    # Seconds an image may take before the upload fails
+    timeout = 60
+
+    def __init__(self):
+        self.executor = None
+        self.lock = threading.Lock()
+
+    @property
+    def extension(self):
+        return ".jpg" if self.format == "JPEG" else f".{self.format.lower()}"
+
+    def options(self):
+        return {
+            "max_dimension": self.max_dimension,
+            "thumbnail_size": self.thumbnail_size,
+            "format": self.format,
+            "quality": self.quality,
+            "max_pixels": self.max_pixels,
+        }
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                # Forking a process running threads is unsafe
+                self.executor = ProcessPoolExecutor(
+                    settings.IMAGE_WORKERS, mp_context=get_context("spawn")
+                )
+            return self.executor
+
+    def process(self, source):
+        """
+        Normalizes the image at `source`, returning the paths of the image
+        and of its thumbnail, written next to it.
+        """
+        destination = f"{source}.normalized{self.extension}"
+        thumbnail = f"{source}.thumbnail{self.extension}"
+        args = (source, destination, thumbnail, self.options())
+        try:
+            if settings.IMAGE_WORKERS <= 0:
+                normalize(*args)
+            else:
+                self.get_executor().submit(normalize, *args).result(self.timeout)
+        except BaseException as e:
+            for path in (destination, thumbnail):
+                if os.path.exists(path):
+                    os.remove(path)
+            if isinstance(e, TimeoutError):
+                raise ImageError("The image took too long to process.") from e
+            if isinstance(e, BrokenProcessPool):
+                self.shutdown()
+                raise ImageError("The image processing pool crashed.") from e
+            raise
+        return destination, thumbnail
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+
+image_processor = ImageProcessor()
+
+
+@receiver(setting_changed)
+def reset_image_processor(setting, **kwargs):
+    if setting == "IMAGE_WORKERS":
+        image_processor.shutdown()
@@ -0,0 +1,404 @@
+"""
+Background uploads of cover images, profile pictures and resumes.
+
+Upload endpoints only validate the file, spool it to UPLOAD_SPOOL_DIR and
+create an UploadJob, answering 202 with the job, so a request never waits on
+the media storage. Once the job is committed it is handed to a pool of
+UPLOAD_WORKERS threads in the same process; with 0 workers it is left to
+`manage.py run_upload_worker`, which also picks up the jobs of a process
+that died before finishing them.
+
+A worker normalizes images (see media_management.images), uploads the
+spooled file and the thumbnail of images, retrying with exponential backoff, points
+the row at the new file and only then schedules the deletion of the file it
+replaced (see media_management.deletions), so a failed upload never leaves
+the row pointing at a deleted file. A job that
+finishes after a newer upload for the same row was queued is discarded.
+
+Direct uploads skip the app servers altogether: `sign` creates an AWAITING
+job and signs an upload to a public id of its own, the client posts the file
+straight to the storage, and the job is applied the same way once either the
+client confirms it with the signed upload response or the storage's
+notification arrives, whichever comes first.
+"""
+
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from media_management import dedup, workers
+from media_management.deletions import deletion_queue
+from media_management.images import ImageError, image_processor
+from media_management.models import UploadJob
+from media_management.storage import StorageError, get_storage, thumbnail_id
+
+logger = logging.getLogger(__name__)
+
+# target -> (model, url field, public id field, thumbnail url field); targets
+# with a thumbnail field are images, normalized before they are stored
+TARGETS = {
+    "cover_image": (
+        "freelancer_management.Project",
+        "image",
+        "image_public_id",
+        "image_thumbnail",
+    ),
+    "profile_pic": (
+        "freelancer_management.FreelancerProfile",
+        "profile_pic",
+        "profile_pic_public_id",
+        "profile_pic_thumbnail",
+    ),
+    "resume": (
+        "freelancer_management.FreelancerProfile",
+        "resume",
+        "resume_public_id",
+        None,
+    ),
+}
+
+# Storage folder every upload goes to
+FOLDER = "skill_afrika"
+
+
+def public_id_fields():
+    """
+    Maps each model holding stored files to its public id fields.
+    """
+    fields = defaultdict(list)
+    for model_label, _, public_id_field, _ in TARGETS.values():
+        fields[apps.get_model(model_label)].append(public_id_field)
+    return fields
+
+
+def spool(file):
+    """
+    Copies an uploaded file to UPLOAD_SPOOL_DIR, hashing it on the way, and
+    returns its path and content hash.
+    """
+    directory = Path(settings.UPLOAD_SPOOL_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = Path(file.name or "").suffix
+    if not suffix[1:].isalnum():
+        suffix = ""
+    path = directory / f"{uuid.uuid4().hex}{suffix}"
+    hasher = dedup.content_hasher()
+    with open(path, "wb") as spooled:
+        for chunk in file.chunks():
+            hasher.update(chunk)
+            spooled.write(chunk)
+    return str(path), hasher.hexdigest()
+
+
+def remove_spooled(path):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def enqueue(owner, target, instance, file):
+    """
+    Spools `file` and queues its upload for the `target` field of `instance`.
+    The job starts once the surrounding transaction commits.
+    """
+    path, content_hash = spool(file)
+    try:
+        job = UploadJob.objects.create(
+            owner=owner,
+            target=target,
+            object_id=instance.pk,
+            spool_path=path,
+            content_hash=content_hash,
+            file_name=(file.name or "")[:255],
+            content_type=file.content_type or "",
+            size=file.size,
+        )
+    except Exception:
+        remove_spooled(path)
+        raise
+    transaction.on_commit(lambda: upload_queue.submit(job.id))
+    return job
+
+
+def sign(owner, target, instance, content_type, size, **params):
+    """
+    Creates the job of a direct upload for the `target` field of `instance`
+    and returns it with the signed upload for the client to send.
+    """
+    job = UploadJob.objects.create(
+        owner=owner,
+        target=target,
+        object_id=instance.pk,
+        content_type=content_type,
+        size=size,
+        status=UploadJob.AWAITING,
+        public_id=f"{FOLDER}/{uuid.uuid4().hex}",
+        expires_at=timezone.now() + upload_queue.signature_ttl,
+    )
+    return job, get_storage().sign_upload(job.public_id, **params)
+
+
+class UploadQueue:
+    # Upload attempts per job
+    max_attempts = 5
+    # Seconds before the first retry, doubled after every failed attempt
+    backoff = 1.0
+    # Jobs running for this long without progress are assumed dead
+    lease = timedelta(minutes=10)
+    # How long a direct upload can be confirmed; Cloudinary refuses signed
+    # uploads older than an hour anyway
+    signature_ttl = timedelta(hours=1)
+
+    EXPIRED = "The upload was not confirmed in time."
+    TOO_LARGE = "The file is larger than announced."
+
+    def submit(self, job_id):
+        """
+        Runs the job on the in-process pool. Returns the future, or None when
+        jobs are left to `run_upload_worker`.
+        """
+        return workers.submit(self.run, job_id)
+
+    def pending(self):
+        return list(
+            UploadJob.objects.filter(status=UploadJob.QUEUED)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def recover(self):
+        """
+        Queues again the jobs of workers that died mid-upload.
+        """
+        return (
+            UploadJob.objects.filter(
+                status=UploadJob.RUNNING, updated_at__lt=timezone.now() - self.lease
+            )
+            .exclude(spool_path="")
+            .update(status=UploadJob.QUEUED, updated_at=timezone.now())
+        )
+
+    def expire(self):
+        """
+        Fails the direct uploads nobody confirmed before their signature
+        expired.
+        """
+        return UploadJob.objects.filter(
+            status=UploadJob.AWAITING, expires_at__lt=timezone.now()
+        ).update(
+            status=UploadJob.FAILED,
+            error=self.EXPIRED,
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+
+    def reject(self, job_id, error):
+        """
+        Fails a direct upload still awaiting confirmation. Returns whether
+        it was.
+        """
+        rejected = UploadJob.objects.filter(
+            id=job_id, status=UploadJob.AWAITING
+        ).update(
+            status=UploadJob.FAILED,
+            error=error,
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return rejected == 1
+
+    def revoke(self, job, error):
+        """
+        Fails a direct upload that was applied before the storage reported
+        it breaks the rules, and releases its file if the row still points
+        at it.
+        """
+        model_label, url_field, public_id_field, thumbnail_field = TARGETS[job.target]
+        model = apps.get_model(model_label)
+        with transaction.atomic():
+            instance = (
+                model.objects.select_for_update().filter(pk=job.object_id).first()
+            )
+            if instance is not None and getattr(instance, public_id_field) == (
+                job.public_id
+            ):
+                update_fields = [url_field, public_id_field, "updated_at"]
+                if thumbnail_field:
+                    update_fields.append(thumbnail_field)
+                for field in update_fields[:-1]:
+                    setattr(instance, field, None)
+                instance.save(update_fields=update_fields)
+                dedup.release([job.public_id])
+            self.finish(job, UploadJob.FAILED, error=error)
+
+    def claim(self, job_id):
+        # Only one worker gets past this for a given job
+        claimed = UploadJob.objects.filter(id=job_id, status=UploadJob.QUEUED).update(
+            status=UploadJob.RUNNING, updated_at=timezone.now()
+        )
+        return claimed == 1
+
+    def run(self, job_id):
+        """
+        Runs a queued job to completion. Returns the job, or None when
+        another worker already took it.
+        """
+        if not self.claim(job_id):
+            return None
+        job = UploadJob.objects.get(id=job_id)
+        # Content stored before is not sent again
+        if job.content_hash and self.apply(job, None):
+            return job
+        try:
+            result = self.store(job)
+        except (StorageError, ImageError, OSError) as e:
+            logger.warning("Upload job %s failed: %s", job.uuid, e)
+            self.finish(job, UploadJob.FAILED, error=str(e))
+            return job
+        self.apply(job, result)
+        return job
+
+    def confirm(self, job_id, result):
+        """
+        Applies a direct upload the storage reports as done. Returns the job,
+        or None when it was already confirmed.
+        """
+        claimed = UploadJob.objects.filter(id=job_id, status=UploadJob.AWAITING).update(
+            status=UploadJob.RUNNING, attempts=1, updated_at=timezone.now()
+        )
+        if not claimed:
+            return None
+        job = UploadJob.objects.get(id=job_id)
+        self.apply(job, result)
+        return job
+
+    def store(self, job):
+        """
+        Uploads the spooled file, normalized first when it is an image, along
+        with its thumbnail.
+        """
+        if TARGETS[job.target][3] is None:
+            return self.upload(job, job.spool_path)
+        image, thumbnail = image_processor.process(job.spool_path)
+        try:
+            result = self.upload(job, image)
+            try:
+                stored_thumbnail = self.upload(
+                    job, thumbnail, public_id=thumbnail_id(result["public_id"])
+                )
+            except StorageError:
+                deletion_queue.add([result["public_id"]])
+                raise
+        finally:
+            remove_spooled(image)
+            remove_spooled(thumbnail)
+        return {**result, "thumbnail_url": stored_thumbnail["secure_url"]}
+
+    def upload(self, job, path, **params):
+        storage = get_storage()
+        attempt = 0
+        while True:
+            attempt += 1
+            job.attempts += 1
+            job.save(update_fields=["attempts", "error", "updated_at"])
+            try:
+                with open(path, "rb") as file:
+                    return storage.upload(file, folder=FOLDER, **params)
+            except StorageError as e:
+                if attempt >= self.max_attempts:
+                    raise
+                job.error = str(e)
+                # Counted per call: job.attempts also holds earlier runs
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+    def apply(self, job, result):
+        """
+        Points the row at the uploaded file, or with no `result` at the
+        stored file with the same content, unless the row is gone or a newer
+        upload for it is under way. Releases the file left unused. Returns
+        False when there was no stored file to reuse.
+        """
+        model_label, url_field, public_id_field, thumbnail_field = TARGETS[job.target]
+        model = apps.get_model(model_label)
+        with transaction.atomic():
+            instance = (
+                model.objects.select_for_update().filter(pk=job.object_id).first()
+            )
+            newer = UploadJob.objects.filter(
+                target=job.target,
+                object_id=job.object_id,
+                id__gt=job.id,
+                # Signatures that were never used do not count
+                status__in=[
+                    UploadJob.QUEUED,
+                    UploadJob.RUNNING,
+                    UploadJob.SUCCEEDED,
+                ],
+            ).exists()
+            if instance is None or newer:
+                if result is not None:
+                    dedup.discard(result["public_id"])
+                self.finish(job, UploadJob.SUPERSEDED, error="")
+                return True
+
+            if job.content_hash:
+                stored = dedup.retain(
+                    job.content_hash,
+                    result and result["public_id"],
+                    result and result["secure_url"],
+                    result and result.get("thumbnail_url"),
+                    job.size,
+                )
+                if stored is None:
+                    return False
+                if result is not None and stored.public_id != result["public_id"]:
+                    # The same content was stored meanwhile
+                    dedup.discard(result["public_id"])
+                job.reused = result is None or stored.public_id != result["public_id"]
+                result = {
+                    "public_id": stored.public_id,
+                    "secure_url": stored.url,
+                    "thumbnail_url": stored.thumbnail_url,
+                }
+
+            replaced = getattr(instance, public_id_field)
+            setattr(instance, url_field, result["secure_url"])
+            setattr(instance, public_id_field, result["public_id"])
+            update_fields = [url_field, public_id_field, "updated_at"]
+            if thumbnail_field:
+                # Direct uploads are stored as sent, without a thumbnail
+                setattr(instance, thumbnail_field, result.get("thumbnail_url"))
+                update_fields.append(thumbnail_field)
+            instance.save(update_fields=update_fields)
+            self.finish(
+                job,
+                UploadJob.SUCCEEDED,
+                url=result["secure_url"],
+                public_id=result["public_id"],
+                error="",
+            )
+            dedup.release([replaced])
+        return True
+
+    def finish(self, job, status, **fields):
+        job.status = status
+        job.finished_at = timezone.now()
+        for name, value in fields.items():
+            setattr(job, name, value)
+        job.save()
+        remove_spooled(job.spool_path)
+
+
+upload_queue = UploadQueue()
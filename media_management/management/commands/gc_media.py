@@ -0,0 +1,100 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from media_management import dedup
+from media_management.deletions import deletion_queue
+from media_management.jobs import FOLDER
+from media_management.orphans import find_orphans
+from media_management.storage import StorageError
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes stored files no project or profile points at. Orphans are "
+        "queued for deletion, which runs in batches with retries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the orphans without deleting them.",
+        )
+        parser.add_argument(
+            "--prefix",
+            default=f"{FOLDER}/",
+            help="Only look at files whose public id starts with this.",
+        )
+        parser.add_argument(
+            "--resource-type",
+            action="append",
+            dest="resource_types",
+            help="Resource types to list, image by default. Repeatable.",
+        )
+        parser.add_argument(
+            "--min-age-hours",
+            type=float,
+            default=24,
+            help="Leave younger files alone, their upload may be under way.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=500,
+            help="Files listed per call to the storage.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        created_before = timezone.now() - timedelta(hours=options["min_age_hours"])
+        scanned = orphans = pages = 0
+        started = time.monotonic()
+
+        for resource_type in options["resource_types"] or ["image"]:
+            listing = find_orphans(
+                options["prefix"], resource_type, created_before, options["page_size"]
+            )
+            try:
+                for listed, page_orphans in listing:
+                    pages += 1
+                    scanned += listed
+                    orphans += len(page_orphans)
+                    if not dry_run:
+                        with transaction.atomic():
+                            dedup.forget(page_orphans)
+                            deletion_queue.add(
+                                page_orphans, resource_type=resource_type
+                            )
+                    if options["verbosity"] >= 2:
+                        for public_id in page_orphans:
+                            self.stdout.write(f"Orphan: {public_id}")
+                        self.stdout.write(
+                            f"Page {pages}: {listed} files, "
+                            f"{len(page_orphans)} orphans"
+                        )
+            except StorageError as e:
+                raise CommandError(f"Listing stopped after {scanned} files: {e}")
+
+        elapsed = time.monotonic() - started
+        rate = scanned / elapsed if elapsed else 0.0
+        self.stdout.write(
+            f"Scanned {scanned} files in {pages} pages and {elapsed:.1f}s "
+            f"({rate:.0f} files/s), found {orphans} orphans."
+        )
+        if dry_run:
+            self.stdout.write(self.style.WARNING("Dry run, nothing was deleted."))
+            return
+
+        started = time.monotonic()
+        deleted = deletion_queue.flush()
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} files in {elapsed:.1f}s, "
+                f"{deletion_queue.stats()['depth']} left queued."
+            )
+        )
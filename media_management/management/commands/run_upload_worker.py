@@ -0,0 +1,55 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from media_management.deletions import deletion_queue
+from media_management.jobs import upload_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs queued uploads and file deletions. Needed when UPLOAD_WORKERS "
+        "is 0, and picks up the work of web processes that died before "
+        "finishing it. Also fails the direct uploads whose signature expired "
+        "unconfirmed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs queued now and exit instead of polling.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds between two looks for queued jobs.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print the deletion queue metrics as JSON and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.stdout.write(json.dumps(deletion_queue.stats()))
+            return
+        while True:
+            upload_queue.recover()
+            upload_queue.expire()
+            done = 0
+            for job_id in upload_queue.pending():
+                job = upload_queue.run(job_id)
+                if job is not None:
+                    done += 1
+                    self.stdout.write(f"Upload {job.uuid}: {job.status}")
+            deleted = deletion_queue.flush()
+            if deleted:
+                self.stdout.write(f"Deleted {deleted} files.")
+            if options["once"]:
+                self.stdout.write(self.style.SUCCESS(f"Ran {done} uploads."))
+                return
+            time.sleep(options["poll_interval"])
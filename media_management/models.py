@@ -0,0 +1,101 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+from profile_management.models import User
+
+
+class UploadJob(models.Model):
+    """
+    A file on its way to the media storage (see media_management.jobs):
+    either spooled by an upload endpoint for a worker to send, or uploaded
+    by the client itself with a signature issued for `public_id`.
+    """
+
+    AWAITING = "awaiting"
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+    STATUS_CHOICES = [
+        (AWAITING, "Awaiting upload"),
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+        (SUPERSEDED, "Superseded"),
+    ]
+
+    uuid = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="uploads")
+    # Key of media_management.jobs.TARGETS and the row the file belongs to
+    target = models.CharField(max_length=30)
+    object_id = models.PositiveIntegerField()
+    # Empty for direct uploads
+    spool_path = models.CharField(max_length=500, blank=True, default="")
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    size = models.PositiveIntegerField(default=0)
+    # SHA-256 of the spooled file, empty for direct uploads
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    # Whether a stored copy of the same content was used instead of uploading
+    reused = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    url = models.URLField(null=True, blank=True)
+    public_id = models.CharField(max_length=255, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Direct uploads confirmed after this are refused
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["target", "object_id"]),
+            models.Index(fields=["public_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.target} {self.object_id} ({self.status})"
+
+
+class PendingDeletion(models.Model):
+    """
+    A stored file waiting to be deleted by media_management.deletions.
+    """
+
+    public_id = models.CharField(max_length=255, unique=True)
+    resource_type = models.CharField(max_length=10, default="image")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Also pushed forward while a worker holds the row
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.public_id
+
+
+class StoredFile(models.Model):
+    """
+    A file stored by the upload workers, indexed by the hash of its content
+    so identical uploads share it; see media_management.dedup.
+    """
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    public_id = models.CharField(max_length=255, unique=True)
+    url = models.URLField()
+    thumbnail_url = models.URLField(null=True, blank=True)
+    size = models.PositiveIntegerField(default=0)
+    # Rows pointing at the file
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.public_id} ({self.refcount})"
@@ -0,0 +1,64 @@
+"""
+Stored files no row points at anymore, left behind by deletions that failed
+before the deletion queue existed or by uploads that never completed.
+
+The storage listing is streamed a page at a time and each page is checked
+against the database, so neither side is ever loaded whole.
+"""
+
+from media_management.jobs import public_id_fields
+from media_management.models import PendingDeletion, UploadJob
+from media_management.storage import THUMBNAIL_SUFFIX, get_storage
+
+
+def referenced(public_ids):
+    """
+    Returns which of `public_ids` are pointed at by a row or an upload still
+    under way, or already queued for deletion.
+    """
+    found = set()
+    for model, fields in public_id_fields().items():
+        for field in fields:
+            found.update(
+                model.objects.filter(**{f"{field}__in": public_ids}).values_list(
+                    field, flat=True
+                )
+            )
+    found.update(
+        UploadJob.objects.filter(
+            public_id__in=public_ids,
+            status__in=[UploadJob.AWAITING, UploadJob.QUEUED, UploadJob.RUNNING],
+        ).values_list("public_id", flat=True)
+    )
+    found.update(
+        PendingDeletion.objects.filter(public_id__in=public_ids).values_list(
+            "public_id", flat=True
+        )
+    )
+    return found
+
+
+def find_orphans(prefix, resource_type, created_before, page_size=500):
+    """
+    Yields, per page of the storage listing, the number of files listed and
+    the orphans among them. Files created after `created_before` are never
+    orphans: their upload may not be recorded yet.
+    """
+    pages = get_storage().list_resources(
+        prefix=prefix, resource_type=resource_type, page_size=page_size
+    )
+    for page in pages:
+        candidates = [
+            resource["public_id"]
+            for resource in page
+            if resource["created_at"] and resource["created_at"] < created_before
+        ]
+        # A thumbnail goes with its image
+        images = {public_id: public_id for public_id in candidates}
+        for public_id in candidates:
+            if public_id.endswith(THUMBNAIL_SUFFIX):
+                images[public_id] = public_id[: -len(THUMBNAIL_SUFFIX)]
+        found = referenced(list(set(images.values()))) if candidates else set()
+        yield len(page), [
+            public_id for public_id in candidates if images[public_id] not in found
+        ]
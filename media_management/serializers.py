@@ -0,0 +1,68 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from media_management.jobs import upload_queue
+from media_management.models import UploadJob
+
+
+class UploadJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source="uuid", read_only=True)
+    max_attempts = serializers.SerializerMethodField()
+    status_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadJob
+        fields = [
+            "job_id",
+            "target",
+            "status",
+            "attempts",
+            "max_attempts",
+            "error",
+            "url",
+            "file_name",
+            "size",
+            "reused",
+            "created_at",
+            "updated_at",
+            "finished_at",
+            "status_url",
+        ]
+        read_only_fields = fields
+
+    def get_max_attempts(self, job) -> int:
+        return upload_queue.max_attempts
+
+    def get_status_url(self, job) -> str:
+        url = reverse("upload-job-status", args=[job.uuid])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class SignedUploadRequestSerializer(serializers.Serializer):
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+
+
+class SignedUploadSerializer(UploadJobSerializer):
+    upload = serializers.SerializerMethodField()
+
+    class Meta(UploadJobSerializer.Meta):
+        fields = UploadJobSerializer.Meta.fields + ["public_id", "expires_at", "upload"]
+        read_only_fields = fields
+
+    def get_upload(self, job) -> dict:
+        # Endpoint and form fields to post along with the file
+        return self.context["upload"]
+
+
+class UploadConfirmationSerializer(serializers.Serializer):
+    """
+    The parts of the storage's upload response needed to confirm it.
+    """
+
+    public_id = serializers.CharField(max_length=255)
+    version = serializers.IntegerField(min_value=0)
+    signature = serializers.CharField(max_length=100)
+    # Where to look the file up; its size and url are read from the storage
+    resource_type = serializers.ChoiceField(["image", "raw", "video"], default="image")
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete
+
+from media_management import dedup
+from media_management.jobs import public_id_fields
+
+
+def connect_signals():
+    for model, fields in public_id_fields().items():
+
+        def schedule_file_deletions(sender, instance, fields=fields, **kwargs):
+            # Also runs for the projects deleted along with their profile
+            dedup.release([getattr(instance, field) for field in fields])
+
+        post_delete.connect(
+            schedule_file_deletions,
+            sender=model,
+            weak=False,
+            dispatch_uid=f"media_management:{model._meta.label}",
+        )
@@ -0,0 +1,350 @@
+"""
+Media storage backends used by the upload workers and signed direct uploads.
+
+MEDIA_STORAGE names the backend class: `CloudinaryStorage` in production,
+`FakeCloudinary` in tests and local development, which keeps files in memory
+and can be told to fail so retries can be exercised without the network.
+
+For direct uploads the backend signs the parameters of an upload the client
+then sends straight to the storage, and checks the signatures the storage
+puts on its upload response and on the notification it posts back. Both use
+Cloudinary's scheme: a SHA-1 of the sorted parameters, or of the body and a
+timestamp, followed by the API secret.
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+import time
+import uuid
+
+import cloudinary
+import cloudinary.api
+import cloudinary.exceptions
+import cloudinary.uploader
+import cloudinary.utils
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+
+
+def thumbnail_id(public_id):
+    return f"{public_id}{THUMBNAIL_SUFFIX}"
+
+
+class StorageError(Exception):
+    """
+    A call to the media storage failed and may succeed if retried.
+    """
+
+
+# Thumbnails are stored as the public id of their image plus this
+THUMBNAIL_SUFFIX = "_thumb"
+
+# Public ids Cloudinary deletes in one call
+BULK_DELETE_LIMIT = 100
+
+# Resources Cloudinary lists in one call
+LIST_PAGE_LIMIT = 500
+
+# Seconds a notification stays acceptable, Cloudinary's own default
+NOTIFICATION_MAX_AGE = 2 * 60 * 60
+
+
+def sign_params(params, api_secret):
+    return cloudinary.utils.api_sign_request(params, api_secret)
+
+
+class SignedUploads:
+    """
+    Signing shared by the backends, which provide `api_key`, `api_secret`
+    and `upload_url(resource_type)`.
+    """
+
+    def sign_upload(self, public_id, resource_type="auto", **params):
+        """
+        Returns the endpoint and form fields of an upload storing a file as
+        `public_id`, which the client posts along with the file.
+        """
+        fields = {
+            **params,
+            "public_id": public_id,
+            "timestamp": int(time.time()),
+        }
+        fields["signature"] = sign_params(fields, self.api_secret)
+        fields["api_key"] = self.api_key
+        return {"url": self.upload_url(resource_type), "fields": fields}
+
+    def verify_upload(self, public_id, version, signature):
+        """
+        Checks the signature of the upload response the client forwards.
+        """
+        expected = sign_params(
+            {"public_id": public_id, "version": version}, self.api_secret
+        )
+        return hmac.compare_digest(expected, str(signature))
+
+    def notification_signature(self, body, timestamp):
+        if isinstance(body, bytes):
+            body = body.decode()
+        payload = f"{body}{timestamp}{self.api_secret}".encode()
+        return hashlib.sha1(payload).hexdigest()
+
+    def verify_notification(self, body, timestamp, signature):
+        """
+        Checks the signature headers of a notification posted by the
+        storage, refusing stale ones so they cannot be replayed.
+        """
+        try:
+            age = time.time() - int(timestamp)
+        except (TypeError, ValueError):
+            return False
+        if age > NOTIFICATION_MAX_AGE:
+            return False
+        expected = self.notification_signature(body, timestamp)
+        return hmac.compare_digest(expected, str(signature))
+
+
+class CloudinaryStorage(SignedUploads):
+    @property
+    def api_key(self):
+        return cloudinary.config().api_key
+
+    @property
+    def api_secret(self):
+        return cloudinary.config().api_secret
+
+    def upload_url(self, resource_type="auto"):
+        return cloudinary.utils.cloudinary_api_url(
+            "upload", resource_type=resource_type
+        )
+
+    def resource(self, public_id, resource_type="image"):
+        """
+        Returns the `bytes` and `secure_url` of a stored file, or
+        None when there is no such file.
+        """
+        try:
+            result = cloudinary.api.resource(public_id, resource_type=resource_type)
+        except cloudinary.exceptions.NotFound:
+            return None
+        except Exception as e:
+            raise StorageError(f"Failed to look up Cloudinary file: {e}") from e
+        return {"bytes": result["bytes"], "secure_url": result["secure_url"]}
+
+    def upload(self, file, folder=None, resource_type="auto", public_id=None):
+        """
+        Uploads `file` and returns Cloudinary's response, which carries the
+        `public_id` and `secure_url` of the stored file. A `public_id` is
+        used as is, folder included.
+        """
+        upload_params = {"resource_type": resource_type}
+        if public_id:
+            upload_params["public_id"] = public_id
+        elif folder:
+            upload_params["folder"] = folder
+        try:
+            return cloudinary.uploader.upload(file, **upload_params)
+        except Exception as e:
+            raise StorageError(f"Failed to upload file to Cloudinary: {e}") from e
+
+    def destroy_many(self, public_ids, resource_type="image"):
+        """
+        Deletes up to BULK_DELETE_LIMIT files in one call and returns the
+        outcome per public id: "deleted", "not_found" or an error.
+        """
+        try:
+            result = cloudinary.api.delete_resources(
+                list(public_ids), resource_type=resource_type
+            )
+        except Exception as e:
+            raise StorageError(f"Failed to delete files from Cloudinary: {e}") from e
+        return result["deleted"]
+
+    def list_resources(self, prefix="", resource_type="image", page_size=500):
+        """
+        Yields the stored files whose public id starts with `prefix`, a page
+        of {"public_id", "created_at"} dicts per call to the Admin API.
+        """
+        params = {
+            "type": "upload",
+            "resource_type": resource_type,
+            "prefix": prefix,
+            "max_results": min(page_size, LIST_PAGE_LIMIT),
+        }
+        while True:
+            try:
+                result = cloudinary.api.resources(**params)
+            except Exception as e:
+                raise StorageError(f"Failed to list Cloudinary files: {e}") from e
+            yield [
+                {
+                    "public_id": resource["public_id"],
+                    "created_at": parse_datetime(resource["created_at"]),
+                }
+                for resource in result["resources"]
+            ]
+            if not result.get("next_cursor"):
+                return
+            params["next_cursor"] = result["next_cursor"]
+
+
+class FakeCloudinary(SignedUploads):
+    """
+    In-memory stand-in for Cloudinary. `files` maps public ids to their
+    content, and `fail(n)` makes the next n calls raise StorageError.
+    `receive` plays the upload endpoint clients post signed uploads to.
+    """
+
+    base_url = "https://res.cloudinary.test/skill-afrika"
+    api_key = "fake-key"
+    api_secret = "fake-secret"
+
+    def __init__(self):
+        self.files = {}
+        self.created = {}
+        # Public ids of every destroy_many call
+        self.bulk_deletes = []
+        # Pages served by list_resources
+        self.listings = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    def fail(self, times=1):
+        with self.lock:
+            self.failures += times
+
+    def check_failure(self):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise StorageError("Fake Cloudinary failure")
+
+    def upload(self, file, folder=None, resource_type="auto", public_id=None):
+        self.check_failure()
+        data = file.read()
+        if public_id is None:
+            public_id = uuid.uuid4().hex
+            if folder:
+                public_id = f"{folder}/{public_id}"
+        self.put(public_id, data)
+        return {
+            "public_id": public_id,
+            "secure_url": f"{self.base_url}/{public_id}",
+            "bytes": len(data),
+            "resource_type": resource_type,
+        }
+
+    def put(self, public_id, data, created_at=None):
+        with self.lock:
+            self.files[public_id] = data
+            self.created[public_id] = created_at or timezone.now()
+
+    def upload_url(self, resource_type="auto"):
+        return f"https://api.cloudinary.test/v1_1/skill-afrika/{resource_type}/upload"
+
+    def resource(self, public_id, resource_type="image"):
+        self.check_failure()
+        with self.lock:
+            data = self.files.get(public_id)
+        if data is None:
+            return None
+        return {"bytes": len(data), "secure_url": f"{self.base_url}/{public_id}"}
+
+    def receive(self, fields, file):
+        """
+        Stores `file` the way the upload endpoint would for a client posting
+        the signed `fields`, and returns the response the client gets.
+        """
+        fields = dict(fields)
+        signature = fields.pop("signature", "")
+        if fields.pop("api_key", None) != self.api_key:
+            raise StorageError("Unknown API key")
+        if not hmac.compare_digest(sign_params(fields, self.api_secret), signature):
+            raise StorageError("Invalid Signature")
+        if time.time() - int(fields["timestamp"]) > 60 * 60:
+            raise StorageError("Stale request")
+        format = file.name.rsplit(".", 1)[-1].lower()
+        allowed = fields.get("allowed_formats")
+        if allowed and format not in allowed.split(","):
+            raise StorageError(f"Image file format {format} not allowed")
+        self.check_failure()
+        data = file.read()
+        public_id = fields["public_id"]
+        version = int(time.time())
+        self.put(public_id, data)
+        return {
+            "public_id": public_id,
+            "version": version,
+            "signature": sign_params(
+                {"public_id": public_id, "version": version}, self.api_secret
+            ),
+            "format": format,
+            "resource_type": "image",
+            "bytes": len(data),
+            "secure_url": f"{self.base_url}/{public_id}",
+        }
+
+    def notification(self, response, notification_type="upload"):
+        """
+        Returns the body and signature headers of the notification Cloudinary
+        posts to `notification_url` after an upload.
+        """
+        body = json.dumps({"notification_type": notification_type, **response})
+        timestamp = str(int(time.time()))
+        return body, {
+            "X-Cld-Timestamp": timestamp,
+            "X-Cld-Signature": self.notification_signature(body, timestamp),
+        }
+
+    def destroy_many(self, public_ids, resource_type="image"):
+        self.check_failure()
+        self.bulk_deletes.append(list(public_ids))
+        outcome = {}
+        with self.lock:
+            for public_id in public_ids:
+                self.created.pop(public_id, None)
+                found = self.files.pop(public_id, None) is not None
+                outcome[public_id] = "deleted" if found else "not_found"
+        return outcome
+
+    def list_resources(self, prefix="", resource_type="image", page_size=500):
+        with self.lock:
+            public_ids = sorted(p for p in self.files if p.startswith(prefix))
+        page_size = min(page_size, LIST_PAGE_LIMIT)
+        for start in range(0, len(public_ids), page_size):
+            self.check_failure()
+            self.listings += 1
+            yield [
+                {"public_id": public_id, "created_at": self.created.get(public_id)}
+                for public_id in public_ids[start : start + page_size]
+            ]
+
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+
+def get_storage():
+    """
+    Returns the MEDIA_STORAGE backend, one instance per process.
+    """
+    path = settings.MEDIA_STORAGE
+    storage = _storages.get(path)
+    if storage is None:
+        with _storages_lock:
+            storage = _storages.get(path)
+            if storage is None:
+                storage = _storages[path] = import_string(path)()
+    return storage
+
+
+@receiver(setting_changed)
+def reset_storages(setting, **kwargs):
+    # Every test overriding MEDIA_STORAGE starts from an empty fake
+    if setting == "MEDIA_STORAGE":
+        _storages.clear()
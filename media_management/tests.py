@@ -0,0 +1,655 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from PIL import Image
+
+from freelancer_management.models import FreelancerProfile, Project
+from media_management.deletions import deletion_queue
+from media_management.jobs import upload_queue
+from media_management.models import PendingDeletion, StoredFile, UploadJob
+from media_management.images import image_processor
+from media_management.storage import get_storage, thumbnail_id
+from profile_management.models import User
+
+
+def image(shade=0, size=(64, 48), format="PNG", **params):
+    """
+    Returns the bytes of a solid image, different for every shade.
+    """
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (shade, 120, 200)).save(buffer, format, **params)
+    return buffer.getvalue()
+
+
+def stored_files(*public_ids):
+    # Images are stored along with their thumbnail
+    return sorted(
+        stored_id
+        for public_id in public_ids
+        for stored_id in (public_id, thumbnail_id(public_id))
+    )
+
+
+class UploadPipelineTests(APITestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir, ignore_errors=True)
+        # Per test, so every test gets an empty fake storage
+        media_settings = override_settings(
+            MEDIA_STORAGE="media_management.storage.FakeCloudinary",
+            UPLOAD_SPOOL_DIR=self.spool_dir,
+            UPLOAD_WORKERS=0,
+            IMAGE_WORKERS=0,
+        )
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        backoff = patch.object(upload_queue, "backoff", 0)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+
+        self.storage = get_storage()
+        self.user = User.objects.create_user(
+            username="ada", email="ada@example.com", password="password"
+        )
+        self.profile = FreelancerProfile.objects.create(user=self.user)
+        self.project = Project.objects.create(
+            freelancer=self.profile,
+            name="Shop",
+            description="An online shop",
+            url="https://example.com",
+        )
+        self.cover_url = reverse(
+            "project_cover_image_upload", args=[self.user.uuid, self.project.id]
+        )
+        self.authenticate(self.user)
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def upload(self, url=None, field="image", content=None, content_type=None):
+        content = image() if content is None else content
+        file = SimpleUploadedFile(
+            "cover.png", content, content_type=content_type or "image/png"
+        )
+        return self.client.post(url or self.cover_url, {field: file})
+
+    def sign(self, url=None, content_type="image/png", size=100):
+        url = url or reverse(
+            "project_cover_image_sign", args=[self.user.uuid, self.project.id]
+        )
+        return self.client.post(
+            url, {"content_type": content_type, "size": size}, format="json"
+        )
+
+    def send(self, signed, content=b"png", name="cover.png"):
+        # What the client does with the signed upload, straight to the storage
+        return self.storage.receive(
+            signed["upload"]["fields"], SimpleUploadedFile(name, content)
+        )
+
+    def confirm(self, signed, result):
+        url = reverse("upload-confirm", args=[signed["job_id"]])
+        return self.client.post(url, result, format="json")
+
+    def notify(self, result, **kwargs):
+        body, headers = self.storage.notification(result, **kwargs)
+        return self.client.generic(
+            "POST",
+            reverse("upload-webhook"),
+            body,
+            content_type="application/json",
+            headers=headers,
+        )
+
+    def run_worker(self):
+        call_command("run_upload_worker", once=True, stdout=io.StringIO())
+
+    def test_upload_is_queued_and_the_worker_stores_it(self):
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], UploadJob.QUEUED)
+        self.assertEqual(response["Location"], response.data["status_url"])
+        job = UploadJob.objects.get(uuid=response.data["job_id"])
+        self.assertTrue(os.path.exists(job.spool_path))
+        # Nothing was sent to the storage during the request
+        self.assertEqual(self.storage.files, {})
+
+        self.run_worker()
+
+        self.project.refresh_from_db()
+        self.assertEqual(
+            sorted(self.storage.files), stored_files(self.project.image_public_id)
+        )
+        self.assertTrue(self.project.image.startswith(self.storage.base_url))
+        self.assertTrue(self.project.image_thumbnail.endswith("_thumb"))
+        self.assertFalse(os.path.exists(job.spool_path))
+
+        response = self.client.get(response.data["status_url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], UploadJob.SUCCEEDED)
+        self.assertEqual(response.data["url"], self.project.image)
+        # The image and its thumbnail
+        self.assertEqual(response.data["attempts"], 2)
+
+    def test_replaced_file_is_deleted_after_the_new_one_is_stored(self):
+        self.upload(content=image(1))
+        self.run_worker()
+        self.project.refresh_from_db()
+        first = self.project.image_public_id
+
+        self.upload(content=image(2))
+        self.run_worker()
+        self.project.refresh_from_db()
+        self.assertNotEqual(self.project.image_public_id, first)
+        self.assertEqual(
+            sorted(self.storage.files), stored_files(self.project.image_public_id)
+        )
+
+    def test_failed_attempts_are_retried(self):
+        self.storage.fail(2)
+        response = self.upload()
+        self.run_worker()
+        job = UploadJob.objects.get(uuid=response.data["job_id"])
+        self.assertEqual(job.status, UploadJob.SUCCEEDED)
+        # Three for the image, one for its thumbnail
+        self.assertEqual(job.attempts, 4)
+        self.assertEqual(job.error, "")
+
+    def test_backoff_restarts_with_every_upload(self):
+        self.storage.fail(2)
+        job = UploadJob.objects.get(uuid=self.upload().data["job_id"])
+        # Attempts of an earlier run
+        UploadJob.objects.filter(id=job.id).update(attempts=10)
+        with patch.object(upload_queue, "backoff", 1), patch(
+            "media_management.jobs.time.sleep"
+        ) as sleep:
+            upload_queue.run(job.id)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2])
+
+    def test_job_fails_after_the_last_attempt(self):
+        self.storage.fail(upload_queue.max_attempts)
+        response = self.upload()
+        with self.assertLogs("media_management.jobs", "WARNING"):
+            self.run_worker()
+        job = UploadJob.objects.get(uuid=response.data["job_id"])
+        self.assertEqual(job.status, UploadJob.FAILED)
+        self.assertEqual(job.attempts, upload_queue.max_attempts)
+        self.assertIn("Fake Cloudinary failure", job.error)
+        self.assertFalse(os.path.exists(job.spool_path))
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.image)
+
+    def test_older_upload_finishing_last_is_discarded(self):
+        older = UploadJob.objects.get(uuid=self.upload(content=image(1)).data["job_id"])
+        newer = UploadJob.objects.get(uuid=self.upload(content=image(2)).data["job_id"])
+        upload_queue.run(newer.id)
+        upload_queue.run(older.id)
+        deletion_queue.flush()
+
+        older.refresh_from_db()
+        self.assertEqual(older.status, UploadJob.SUPERSEDED)
+        self.project.refresh_from_db()
+        self.assertEqual(
+            sorted(self.storage.files), stored_files(self.project.image_public_id)
+        )
+
+    def test_a_job_runs_once(self):
+        job = UploadJob.objects.get(uuid=self.upload().data["job_id"])
+        self.assertIsNotNone(upload_queue.run(job.id))
+        self.assertIsNone(upload_queue.run(job.id))
+        self.assertEqual(len(self.storage.files), 2)
+
+    def test_jobs_of_dead_workers_are_recovered(self):
+        job = UploadJob.objects.get(uuid=self.upload().data["job_id"])
+        UploadJob.objects.filter(id=job.id).update(
+            status=UploadJob.RUNNING,
+            updated_at=timezone.now() - upload_queue.lease - timedelta(seconds=1),
+        )
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, UploadJob.SUCCEEDED)
+
+    def test_committed_jobs_are_handed_to_the_queue(self):
+        with patch.object(upload_queue, "submit") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload()
+        job = UploadJob.objects.get(uuid=response.data["job_id"])
+        submit.assert_called_once_with(job.id)
+
+    def test_resume_and_profile_picture_uploads(self):
+        resume_url = reverse("resume_upload", args=[self.user.uuid])
+        response = self.upload(
+            resume_url, "resume", b"%PDF", content_type="application/pdf"
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        picture_url = reverse("profile_pic_upload", args=[self.user.uuid])
+        picture = image(format="JPEG")
+        response = self.upload(picture_url, "profile_pic", picture, "image/jpeg")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        self.run_worker()
+        self.profile.refresh_from_db()
+        self.assertEqual(self.storage.files[self.profile.resume_public_id], b"%PDF")
+        picture = self.storage.files[self.profile.profile_pic_public_id]
+        self.assertEqual(Image.open(io.BytesIO(picture)).format, "WEBP")
+        self.assertIsNotNone(self.profile.profile_pic_thumbnail)
+        # Resumes are stored as sent
+        self.assertNotIn(
+            thumbnail_id(self.profile.resume_public_id), self.storage.files
+        )
+
+    def test_invalid_uploads_are_rejected_before_queueing(self):
+        response = self.client.post(self.cover_url, {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.upload(content_type="application/pdf")
+        self.assertEqual(response.data, {"error": "Unsupported file type"})
+
+        other = User.objects.create_user(
+            username="bob", email="bob@example.com", password="password"
+        )
+        FreelancerProfile.objects.create(user=other)
+        self.authenticate(other)
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # The project must belong to the profile in the url
+        url = reverse("project_cover_image_upload", args=[other.uuid, self.project.id])
+        self.assertEqual(self.upload(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(UploadJob.objects.exists())
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_status_is_only_visible_to_the_uploader(self):
+        status_url = self.upload().data["status_url"]
+        other = User.objects.create_user(
+            username="bob", email="bob@example.com", password="password"
+        )
+        self.authenticate(other)
+        response = self.client.get(status_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_signed_direct_upload(self):
+        response = self.sign()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        signed = response.data
+        self.assertEqual(signed["status"], UploadJob.AWAITING)
+        fields = signed["upload"]["fields"]
+        self.assertEqual(fields["public_id"], signed["public_id"])
+        self.assertEqual(fields["allowed_formats"], "jpg,png")
+        self.assertTrue(fields["notification_url"].endswith(reverse("upload-webhook")))
+
+        result = self.send(signed, b"direct")
+        response = self.confirm(signed, result)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], UploadJob.SUCCEEDED)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.image_public_id, signed["public_id"])
+        self.assertEqual(self.project.image, response.data["url"])
+        self.assertEqual(self.storage.files, {signed["public_id"]: b"direct"})
+
+    def test_storage_notification_completes_a_direct_upload(self):
+        signed = self.sign().data
+        result = self.send(signed)
+        response = self.notify(result)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.image, result["secure_url"])
+
+        # The client confirming afterwards changes nothing
+        response = self.confirm(signed, result)
+        self.assertEqual(response.data["status"], UploadJob.SUCCEEDED)
+        self.assertEqual(response.data["attempts"], 1)
+
+    def test_forged_confirmations_and_notifications_are_refused(self):
+        signed = self.sign().data
+        result = self.send(signed)
+        response = self.confirm(signed, {**result, "version": result["version"] + 1})
+        self.assertEqual(response.data, {"error": "Invalid upload signature"})
+
+        # A genuine response for another upload
+        other = self.send(self.sign().data)
+        response = self.confirm(signed, other)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        body, headers = self.storage.notification(result)
+        headers["X-Cld-Signature"] = "0" * 40
+        response = self.client.generic(
+            "POST",
+            reverse("upload-webhook"),
+            body,
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.image)
+
+    def test_expired_direct_upload_is_refused_and_deleted(self):
+        signed = self.sign().data
+        result = self.send(signed)
+        UploadJob.objects.filter(uuid=signed["job_id"]).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        response = self.confirm(signed, result)
+        self.assertEqual(response.data, {"error": "The upload signature expired"})
+        job = UploadJob.objects.get(uuid=signed["job_id"])
+        self.assertEqual(job.status, UploadJob.FAILED)
+        deletion_queue.flush()
+        self.assertEqual(self.storage.files, {})
+
+    def test_file_larger_than_announced_is_deleted(self):
+        signed = self.sign(size=2).data
+        response = self.notify(self.send(signed, b"too large"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        job = UploadJob.objects.get(uuid=signed["job_id"])
+        self.assertEqual(job.status, UploadJob.FAILED)
+        deletion_queue.flush()
+        self.assertEqual(self.storage.files, {})
+
+    def test_confirming_a_file_larger_than_announced_is_refused(self):
+        signed = self.sign(size=2).data
+        response = self.confirm(signed, self.send(signed, b"too large"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": upload_queue.TOO_LARGE})
+        job = UploadJob.objects.get(uuid=signed["job_id"])
+        self.assertEqual(job.status, UploadJob.FAILED)
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.image)
+        deletion_queue.flush()
+        self.assertEqual(self.storage.files, {})
+
+    def test_client_reported_size_is_not_trusted(self):
+        signed = self.sign(size=2).data
+        result = self.send(signed, b"too large")
+        # Only the public id and version of the response are signed
+        response = self.confirm(signed, {**result, "bytes": 1})
+        self.assertEqual(response.data, {"error": upload_queue.TOO_LARGE})
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.image)
+
+    def test_notification_revokes_a_confirmed_upload_that_grew(self):
+        signed = self.sign(size=5).data
+        response = self.confirm(signed, self.send(signed, b"small"))
+        self.assertEqual(response.data["status"], UploadJob.SUCCEEDED)
+        # The signed fields are reused to overwrite the file with a larger one
+        result = self.send(signed, b"much larger")
+        self.assertEqual(self.notify(result).status_code, status.HTTP_200_OK)
+
+        job = UploadJob.objects.get(uuid=signed["job_id"])
+        self.assertEqual(job.status, UploadJob.FAILED)
+        self.assertEqual(job.error, upload_queue.TOO_LARGE)
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.image)
+        self.assertIsNone(self.project.image_public_id)
+        deletion_queue.flush()
+        self.assertEqual(self.storage.files, {})
+
+    def test_confirmation_waits_for_a_reachable_storage(self):
+        signed = self.sign().data
+        result = self.send(signed)
+        self.storage.fail()
+        response = self.confirm(signed, result)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            UploadJob.objects.get(uuid=signed["job_id"]).status, UploadJob.AWAITING
+        )
+        self.assertEqual(
+            self.confirm(signed, result).data["status"], UploadJob.SUCCEEDED
+        )
+
+    def test_unused_signature_does_not_supersede_a_queued_upload(self):
+        queued = UploadJob.objects.get(uuid=self.upload().data["job_id"])
+        self.sign()
+        upload_queue.run(queued.id)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, UploadJob.SUCCEEDED)
+
+    def test_signing_checks_the_file_and_the_owner(self):
+        response = self.sign(content_type="application/pdf")
+        self.assertEqual(response.data, {"error": "Unsupported file type"})
+        response = self.sign(size=6 * 1024 * 1024)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        other = User.objects.create_user(
+            username="bob", email="bob@example.com", password="password"
+        )
+        self.authenticate(other)
+        self.assertEqual(self.sign().status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(UploadJob.objects.exists())
+
+        self.authenticate(self.user)
+        resume_url = reverse("resume_sign", args=[self.user.uuid])
+        signed = self.sign(resume_url, "application/pdf").data
+        self.assertEqual(signed["upload"]["fields"]["allowed_formats"], "pdf")
+        self.confirm(signed, self.send(signed, b"%PDF", "resume.pdf"))
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.resume_public_id, signed["public_id"])
+
+    def test_deleting_a_profile_deletes_its_files_in_batches(self):
+        projects = [self.project] + [
+            Project.objects.create(
+                freelancer=self.profile,
+                name=f"Project {i}",
+                description="A project",
+                url="https://example.com",
+            )
+            for i in range(3)
+        ]
+        for shade, project in enumerate(projects):
+            upload = self.upload(
+                reverse(
+                    "project_cover_image_upload", args=[self.user.uuid, project.id]
+                ),
+                content=image(shade),
+            )
+            self.assertEqual(upload.status_code, status.HTTP_202_ACCEPTED)
+        self.run_worker()
+        # Four images and their thumbnails
+        self.assertEqual(len(self.storage.files), 8)
+
+        with patch.object(deletion_queue, "submit") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.profile.delete()
+        submit.assert_called()
+        # Nothing was deleted during the request
+        self.assertEqual(len(self.storage.files), 8)
+        self.assertEqual(deletion_queue.stats()["depth"], 8)
+
+        with patch.object(deletion_queue, "batch_size", 3):
+            self.assertEqual(deletion_queue.flush(), 8)
+        self.assertEqual([len(ids) for ids in self.storage.bulk_deletes], [3, 3, 2])
+        self.assertEqual(self.storage.files, {})
+        self.assertEqual(deletion_queue.stats()["depth"], 0)
+
+    def test_failed_deletions_are_retried_with_backoff(self):
+        self.upload()
+        self.run_worker()
+        self.project.refresh_from_db()
+        url = reverse(
+            "project_cover_image_delete", args=[self.user.uuid, self.project.id]
+        )
+        self.storage.fail()
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.image)
+        self.assertIsNone(self.project.image_thumbnail)
+
+        with self.assertLogs("media_management.deletions", "WARNING"):
+            self.assertEqual(deletion_queue.flush(), 0)
+        # The image and its thumbnail
+        for deletion in PendingDeletion.objects.all():
+            self.assertEqual(deletion.attempts, 1)
+            self.assertGreater(deletion.next_attempt_at, timezone.now())
+        stats = deletion_queue.stats()
+        self.assertEqual((stats["depth"], stats["due"], stats["retrying"]), (2, 0, 2))
+        self.assertGreaterEqual(stats["oldest_age"], 0)
+        # Not due yet
+        self.assertEqual(deletion_queue.flush(), 0)
+
+        PendingDeletion.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(deletion_queue.flush(), 2)
+        self.assertEqual(self.storage.files, {})
+        self.assertFalse(PendingDeletion.objects.exists())
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        deletion_queue.add(["skill_afrika/gone"])
+        deletion = PendingDeletion.objects.get()
+        delays = []
+        for _ in range(10):
+            before = timezone.now()
+            with self.assertLogs("media_management.deletions", "WARNING"):
+                deletion_queue.retry([deletion], "down")
+            delays.append(round((deletion.next_attempt_at - before).total_seconds()))
+        backoff = deletion_queue.backoff.total_seconds()
+        self.assertEqual(delays[:3], [backoff, backoff * 2, backoff * 4])
+        self.assertEqual(delays[-1], deletion_queue.max_backoff.total_seconds())
+
+    def test_gc_media_deletes_only_old_orphans(self):
+        self.upload()
+        self.run_worker()
+        self.project.refresh_from_db()
+        signed = self.sign().data
+        self.send(signed)
+        old = timezone.now() - timedelta(days=2)
+        image_ids = stored_files(self.project.image_public_id)
+        for public_id in image_ids + [signed["public_id"]]:
+            self.storage.created[public_id] = old
+        orphans = [f"skill_afrika/orphan{i}" for i in range(3)]
+        for public_id in orphans:
+            self.storage.put(public_id, b"lost", created_at=old)
+        # Too young, or outside the folder
+        self.storage.put("skill_afrika/fresh", b"new")
+        self.storage.put("elsewhere/old", b"other", created_at=old)
+
+        out = io.StringIO()
+        call_command("gc_media", dry_run=True, page_size=2, stdout=out)
+        self.assertIn("Scanned 7 files in 4 pages", out.getvalue())
+        self.assertIn("found 3 orphans", out.getvalue())
+        self.assertEqual(len(self.storage.files), 8)
+        self.assertFalse(PendingDeletion.objects.exists())
+
+        out = io.StringIO()
+        call_command("gc_media", page_size=2, stdout=out)
+        self.assertIn("Deleted 3 files", out.getvalue())
+        self.assertEqual(
+            sorted(self.storage.files),
+            sorted(
+                image_ids + [signed["public_id"], "skill_afrika/fresh", "elsewhere/old"]
+            ),
+        )
+
+    def test_identical_uploads_share_one_stored_file(self):
+        other = Project.objects.create(
+            freelancer=self.profile,
+            name="Blog",
+            description="A blog",
+            url="https://example.com",
+        )
+        other_url = reverse(
+            "project_cover_image_upload", args=[self.user.uuid, other.id]
+        )
+        same = image(7)
+        first = self.upload(content=same).data
+        self.run_worker()
+        second = self.upload(other_url, content=same).data
+        self.run_worker()
+
+        job = UploadJob.objects.get(uuid=second["job_id"])
+        self.assertEqual(job.content_hash, hashlib.sha256(same).hexdigest())
+        self.assertTrue(job.reused)
+        self.assertFalse(UploadJob.objects.get(uuid=first["job_id"]).reused)
+        # The second upload never reached the storage
+        self.assertEqual(len(self.storage.files), 2)
+        self.project.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(other.image_public_id, self.project.image_public_id)
+        self.assertEqual(other.image_thumbnail, self.project.image_thumbnail)
+        self.assertEqual(StoredFile.objects.get().refcount, 2)
+
+        delete_url = reverse(
+            "project_cover_image_delete", args=[self.user.uuid, self.project.id]
+        )
+        self.client.delete(delete_url)
+        deletion_queue.flush()
+        self.assertEqual(len(self.storage.files), 2)
+        self.assertEqual(StoredFile.objects.get().refcount, 1)
+
+        other.delete()
+        deletion_queue.flush()
+        self.assertEqual(self.storage.files, {})
+        self.assertFalse(StoredFile.objects.exists())
+
+        # Stored again once the shared copy is gone
+        self.upload(content=same)
+        self.run_worker()
+        self.project.refresh_from_db()
+        self.assertEqual(
+            sorted(self.storage.files), stored_files(self.project.image_public_id)
+        )
+
+    def test_reuploading_the_same_file_keeps_it(self):
+        self.upload()
+        self.run_worker()
+        self.upload()
+        self.run_worker()
+        self.project.refresh_from_db()
+        self.assertEqual(
+            sorted(self.storage.files), stored_files(self.project.image_public_id)
+        )
+        self.assertEqual(StoredFile.objects.get().refcount, 1)
+        self.assertFalse(PendingDeletion.objects.exists())
+
+    def test_images_are_normalized_before_they_are_stored(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotated 90 degrees
+        exif[0x010F] = "Phone maker"
+        photo = image(size=(3000, 1000), format="JPEG", exif=exif.tobytes())
+        self.upload(content=photo, content_type="image/jpeg")
+        self.run_worker()
+
+        self.project.refresh_from_db()
+        stored = Image.open(
+            io.BytesIO(self.storage.files[self.project.image_public_id])
+        )
+        self.assertEqual(stored.format, "WEBP")
+        # Turned upright, then downscaled
+        self.assertEqual(stored.size, (683, 2048))
+        self.assertEqual(dict(stored.getexif()), {})
+        thumbnail_data = self.storage.files[thumbnail_id(self.project.image_public_id)]
+        thumbnail = Image.open(io.BytesIO(thumbnail_data))
+        self.assertEqual(thumbnail.size, (400, 400))
+
+    def test_invalid_images_fail_without_reaching_the_storage(self):
+        response = self.upload(content=b"not an image")
+        with self.assertLogs("media_management.jobs", "WARNING"):
+            self.run_worker()
+        job = UploadJob.objects.get(uuid=response.data["job_id"])
+        self.assertEqual(job.status, UploadJob.FAILED)
+        self.assertIn("not a valid image", job.error)
+        self.assertEqual(job.attempts, 0)
+        self.assertEqual(self.storage.files, {})
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_images_are_processed_in_the_process_pool(self):
+        path = os.path.join(self.spool_dir, "cover.png")
+        with open(path, "wb") as file:
+            file.write(image(size=(2500, 100)))
+        with override_settings(IMAGE_WORKERS=1):
+            normalized, thumbnail = image_processor.process(path)
+            self.assertIsNotNone(image_processor.executor)
+        self.assertEqual(Image.open(normalized).size, (2048, 82))
+        self.assertEqual(Image.open(thumbnail).size, (400, 400))
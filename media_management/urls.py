@@ -0,0 +1,13 @@
+from django.urls import path
+
+from media_management.views import (
+    UploadConfirmView,
+    UploadJobStatusView,
+    UploadWebhookView,
+)
+
+urlpatterns = [
+    path("webhook", UploadWebhookView.as_view(), name="upload-webhook"),
+    path("<uuid:uuid>", UploadJobStatusView.as_view(), name="upload-job-status"),
+    path("<uuid:uuid>/confirm", UploadConfirmView.as_view(), name="upload-confirm"),
+]
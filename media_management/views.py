@@ -0,0 +1,309 @@
+import json
+import mimetypes
+
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from media_management.deletions import deletion_queue
+from media_management.jobs import enqueue, sign, upload_queue
+from media_management.models import UploadJob
+from media_management.serializers import (
+    SignedUploadRequestSerializer,
+    SignedUploadSerializer,
+    UploadConfirmationSerializer,
+    UploadJobSerializer,
+)
+from media_management.storage import StorageError, get_storage
+from skill_africa.permissions import IsAuthenticatedWithJWT
+
+
+class UploadView(APIView):
+    """
+    Validates the file sent as `file_field` and queues its upload to the
+    `target` field of the object, answering 202 with the job instead of
+    waiting on the media storage (see media_management.jobs).
+    """
+
+    permission_classes = [IsAuthenticatedWithJWT]
+    target = None
+    file_field = None
+    SUPPORTED_MIME_TYPES = []
+    MAX_FILE_SIZE_MB = 5
+
+    def get_object(self, **kwargs):
+        """
+        Returns the object the file is for and the user allowed to replace it.
+        """
+        raise NotImplementedError
+
+    def check_file(self, request, owner, content_type, size):
+        """
+        Returns the error response for a file that cannot be uploaded.
+        """
+        # Check if the file type is supported
+        if content_type not in self.SUPPORTED_MIME_TYPES:
+            return Response(
+                {"error": "Unsupported file type"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Check file size (convert MAX_FILE_SIZE_MB to bytes)
+        max_file_size_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
+        if size > max_file_size_bytes:
+            return Response(
+                {
+                    "error": f"File size exceeds the maximum limit of {self.MAX_FILE_SIZE_MB} MB."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if request.user != owner:
+            return Response(
+                {"error": "User Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED
+            )
+        return None
+
+    def post(self, request, **kwargs):
+        file = request.FILES.get(self.file_field)
+        instance, owner = self.get_object(**kwargs)
+
+        if not file:
+            return Response(
+                {"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        error = self.check_file(request, owner, file.content_type, file.size)
+        if error is not None:
+            return error
+
+        job = enqueue(request.user, self.target, instance, file)
+        data = UploadJobSerializer(job, context={"request": request}).data
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": data["status_url"]},
+        )
+
+
+class SignedUploadView(APIView):
+    """
+    Signs a direct upload for the target of `upload_view`, whose object
+    lookup and file checks it reuses. The client posts the file to the
+    returned endpoint and confirms the upload with UploadConfirmView.
+    """
+
+    permission_classes = [IsAuthenticatedWithJWT]
+    upload_view = None
+
+    def allowed_formats(self):
+        extensions = (
+            mimetypes.guess_extension(mime_type)
+            for mime_type in self.upload_view.SUPPORTED_MIME_TYPES
+        )
+        return ",".join(extension[1:] for extension in extensions if extension)
+
+    def post(self, request, **kwargs):
+        serializer = SignedUploadRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload_view = self.upload_view(request=request, kwargs=kwargs)
+        instance, owner = upload_view.get_object(**kwargs)
+
+        error = upload_view.check_file(request, owner, **serializer.validated_data)
+        if error is not None:
+            return error
+
+        job, upload = sign(
+            request.user,
+            upload_view.target,
+            instance,
+            allowed_formats=self.allowed_formats(),
+            notification_url=request.build_absolute_uri(reverse("upload-webhook")),
+            **serializer.validated_data,
+        )
+        data = SignedUploadSerializer(
+            job, context={"request": request, "upload": upload}
+        ).data
+        return Response(
+            data,
+            status=status.HTTP_201_CREATED,
+            headers={"Location": data["status_url"]},
+        )
+
+
+def signed_upload_schema(summary, description):
+    return extend_schema(
+        summary=summary,
+        description=(
+            f"{description} The response carries the `url` to post the file "
+            "to, as `file`, along with the signed form `fields`, untouched. "
+            "Confirm the upload with the storage's response on the job's "
+            "`/confirm` endpoint within an hour."
+        ),
+        request=SignedUploadRequestSerializer,
+        responses={
+            201: SignedUploadSerializer,
+            400: OpenApiTypes.OBJECT,
+            401: OpenApiTypes.OBJECT,
+        },
+    )
+
+
+class UploadJobStatusView(APIView):
+    permission_classes = [IsAuthenticatedWithJWT]
+
+    @extend_schema(
+        summary="Retrieve the status of an upload",
+        description=(
+            "Progress of a file queued by one of the upload endpoints: "
+            "`queued`, `running`, then `succeeded` (with the `url` of the "
+            "stored file), `failed` (with the last `error`) or `superseded` "
+            "by a newer upload. Signed direct uploads start `awaiting` the "
+            "file. Only the uploader can see a job."
+        ),
+        responses={
+            200: UploadJobSerializer,
+            404: OpenApiResponse(description="No such upload"),
+        },
+    )
+    def get(self, request, uuid):
+        job = get_object_or_404(UploadJob, uuid=uuid, owner=request.user)
+        return Response(UploadJobSerializer(job, context={"request": request}).data)
+
+
+class UploadConfirmView(APIView):
+    permission_classes = [IsAuthenticatedWithJWT]
+
+    @extend_schema(
+        summary="Confirm a signed direct upload",
+        description=(
+            "Forward the storage's response to a signed upload. Its "
+            "signature is checked, and the stored file's size against the "
+            "announced one, before the file replaces the current one. "
+            "Confirming an upload twice is harmless."
+        ),
+        request=UploadConfirmationSerializer,
+        responses={
+            200: UploadJobSerializer,
+            400: OpenApiTypes.OBJECT,
+            404: OpenApiResponse(description="No such upload"),
+            503: OpenApiResponse(description="The storage could not be reached"),
+        },
+    )
+    def post(self, request, uuid):
+        job = get_object_or_404(UploadJob, uuid=uuid, owner=request.user)
+        serializer = UploadConfirmationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.validated_data
+        storage = get_storage()
+
+        if result["public_id"] != job.public_id or not storage.verify_upload(
+            result["public_id"], result["version"], result["signature"]
+        ):
+            return Response(
+                {"error": "Invalid upload signature"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if job.status == UploadJob.AWAITING:
+            if job.expires_at < timezone.now():
+                if upload_queue.reject(job.id, upload_queue.EXPIRED):
+                    deletion_queue.add([job.public_id])
+                return Response(
+                    {"error": "The upload signature expired"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Only the public id and version are signed, so the size and
+            # url come from the storage rather than from the client
+            try:
+                stored = storage.resource(job.public_id, result["resource_type"])
+            except StorageError:
+                return Response(
+                    {"error": "The upload could not be checked, try again."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            if stored is None:
+                return Response(
+                    {"error": "The file was not uploaded"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if stored["bytes"] > job.size:
+                if upload_queue.reject(job.id, upload_queue.TOO_LARGE):
+                    deletion_queue.add([job.public_id])
+                return Response(
+                    {"error": upload_queue.TOO_LARGE},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # None when the storage's notification confirmed it meanwhile
+            upload_queue.confirm(
+                job.id, {"public_id": job.public_id, "secure_url": stored["secure_url"]}
+            )
+            job.refresh_from_db()
+        return Response(UploadJobSerializer(job, context={"request": request}).data)
+
+
+class UploadWebhookView(APIView):
+    """
+    Receives the notification the storage posts after a signed direct
+    upload, so the upload completes even if the client never confirms it.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(
+        summary="Storage upload notification",
+        description=(
+            "Called by the media storage, not by clients. Requests without a "
+            "valid `X-Cld-Signature` for their `X-Cld-Timestamp` are refused."
+        ),
+        request=OpenApiTypes.OBJECT,
+        responses={200: OpenApiTypes.OBJECT, 403: OpenApiTypes.OBJECT},
+    )
+    def post(self, request):
+        body = request.body
+        storage = get_storage()
+        if not storage.verify_notification(
+            body,
+            request.headers.get("X-Cld-Timestamp"),
+            request.headers.get("X-Cld-Signature", ""),
+        ):
+            return Response(
+                {"error": "Invalid signature"}, status=status.HTTP_403_FORBIDDEN
+            )
+        notification = json.loads(body)
+        public_id = notification.get("public_id")
+        job = (
+            UploadJob.objects.filter(public_id=public_id).first()
+            if notification.get("notification_type") == "upload" and public_id
+            else None
+        )
+        # Anything else is acknowledged so the storage does not retry it
+        if job is None:
+            return Response({"status": "ignored"})
+
+        if job.status == UploadJob.FAILED:
+            # Refused or expired: nothing will ever point at this file
+            deletion_queue.add([public_id])
+        elif job.status == UploadJob.SUCCEEDED:
+            # The notification's size is signed, the confirmation's was not
+            if notification.get("bytes", 0) > job.size:
+                upload_queue.revoke(job, upload_queue.TOO_LARGE)
+        elif job.status == UploadJob.AWAITING:
+            if notification.get("bytes", 0) > job.size:
+                error = upload_queue.TOO_LARGE
+            elif job.expires_at < timezone.now():
+                error = upload_queue.EXPIRED
+            else:
+                upload_queue.confirm(
+                    job.id,
+                    {"public_id": public_id, "secure_url": notification["secure_url"]},
+                )
+                return Response({"status": "ok"})
+            if upload_queue.reject(job.id, error):
+                deletion_queue.add([public_id])
+        return Response({"status": "ok"})
@@ -0,0 +1,40 @@
+"""
+The in-process thread pool background uploads and deletions run on.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def submit(fn, *args):
+    """
+    Runs `fn(*args)` on a pool of UPLOAD_WORKERS threads. Returns the future,
+    or None when the work is left to `run_upload_worker`.
+    """
+    global _executor
+    workers = settings.UPLOAD_WORKERS
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(workers, thread_name_prefix="media")
+    return _executor.submit(_run, fn, *args)
+
+
+def _run(fn, *args):
+    try:
+        return fn(*args)
+    except Exception:
+        logger.exception("Background media task %s%s crashed", fn.__name__, args)
+    finally:
+        # Pool threads outlive requests, nothing else closes their connections
+        connections.close_all()
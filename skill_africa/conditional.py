@@ -0,0 +1,56 @@
+# Conditional GET support shared by the read endpoints of the skill afrika backend.
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class Validators:
+    """
+    ETag and Last-Modified of a representation, derived from the time the
+    resource last changed, the request's full path and negotiated media type
+    (see `representation_key`) plus anything else the body depends on.
+
+    Views compute these from a cheap lookup before building the body, answer
+    with `not_modified()` when the client's copy is still current and
+    otherwise `apply()` them to the full response.
+    """
+
+    def __init__(self, last_modified, request, *parts):
+        self.last_modified = int(last_modified.timestamp())
+        parts = (last_modified.timestamp(), *representation_key(request), *parts)
+        key = ":".join(str(part) for part in parts)
+        self.etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def not_modified(self, request):
+        """
+        Returns a 304 response when `If-None-Match` / `If-Modified-Since`
+        match, otherwise None.
+        """
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        response["ETag"] = self.etag
+        response["Last-Modified"] = http_date(self.last_modified)
+        vary_on_accept(response)
+        return response
+
+
+def representation_key(request):
+    """
+    What picks the representation of a resource besides its data: the path
+    with the query string (search, paging, sparse fields) and the media type
+    negotiated from `Accept` or `?format=` (JSON or MessagePack).
+    """
+    return request.get_full_path(), request.accepted_renderer.media_type
+
+
+def vary_on_accept(response):
+    # The body depends on the Accept header, shared caches must key on it
+    patch_vary_headers(response, ["Accept"])
+    return response
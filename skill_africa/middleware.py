@@ -0,0 +1,205 @@
+# Middleware used by the skill afrika backend, see MIDDLEWARE in settings.py.
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+DEFAULTS = {
+    # Smaller bodies are sent as they are, compressing them costs more CPU
+    # than the bytes it saves
+    "MIN_SIZE": 1024,
+    # 0-11, higher is smaller but slower
+    "BROTLI_QUALITY": 4,
+    # 1-9, higher is smaller but slower
+    "GZIP_LEVEL": 6,
+    # Content types worth compressing, matched on the type or on the prefix
+    # before the "/" ("text/"). Images and archives are already compressed.
+    "CONTENT_TYPES": [
+        "application/json",
+        "application/msgpack",
+        "application/x-ndjson",
+        "application/vnd.oai.openapi",
+        "application/vnd.oai.openapi+json",
+        "application/javascript",
+        "image/svg+xml",
+        "text/",
+    ],
+    # Per content type minimum sizes overriding MIN_SIZE; None never
+    # compresses that type
+    "MIN_SIZE_BY_CONTENT_TYPE": {
+        # Pages carrying a CSRF token (admin, browsable API) stay
+        # uncompressed so the token cannot be recovered through BREACH
+        "text/html": None,
+    },
+}
+
+
+def get_setting(name):
+    return getattr(settings, "RESPONSE_COMPRESSION", {}).get(name, DEFAULTS[name])
+
+
+def parse_accept_encoding(header):
+    """
+    Returns {coding: q} from an Accept-Encoding header.
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+class GzipEncoder:
+    coding = "gzip"
+
+    def __init__(self, level):
+        # wbits=31 writes the gzip header and trailer
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self.compressor.compress(data)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliEncoder:
+    coding = "br"
+
+    def __init__(self, quality):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data):
+        return self.compressor.process(data)
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with Brotli or gzip, whichever the client prefers in
+    `Accept-Encoding` (Brotli on a tie), configured by RESPONSE_COMPRESSION
+    in settings.py (see DEFAULTS).
+
+    Regular responses are compressed when their content type is listed and
+    they are at least the minimum size for that type. Streaming responses
+    are compressed chunk by chunk as they are sent, whatever their size.
+    Strong ETags become weak, since the bytes no longer match the
+    uncompressed representation they were computed from.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        min_size = self.min_size(response)
+        if min_size is None or not self.can_compress(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        encoder = self.get_encoder(request.headers.get("Accept-Encoding", ""))
+        if encoder is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.compress_async(
+                    encoder, response.streaming_content
+                )
+            else:
+                response.streaming_content = self.compress_sequence(
+                    encoder, response.streaming_content
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed = encoder.process(response.content) + encoder.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoder.coding
+        return response
+
+    @staticmethod
+    def can_compress(response):
+        if response.has_header("Content-Encoding"):
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        return "no-transform" not in response.get("Cache-Control", "")
+
+    @staticmethod
+    def min_size(response):
+        """
+        Returns the minimum size to compress the response at, or None when
+        its content type is never compressed.
+        """
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if not content_type:
+            return None
+        overrides = get_setting("MIN_SIZE_BY_CONTENT_TYPE")
+        if content_type in overrides:
+            return overrides[content_type]
+        for allowed in get_setting("CONTENT_TYPES"):
+            if content_type == allowed or (
+                allowed.endswith("/") and content_type.startswith(allowed)
+            ):
+                return get_setting("MIN_SIZE")
+        return None
+
+    @staticmethod
+    def get_encoder(accept_encoding):
+        accepted = parse_accept_encoding(accept_encoding)
+        fallback = accepted.get("*", 0.0)
+        codings = ["br", "gzip"] if brotli is not None else ["gzip"]
+        # max() keeps the first of equal weights, Brotli wins a tie
+        coding = max(codings, key=lambda c: accepted.get(c, fallback))
+        if accepted.get(coding, fallback) <= 0:
+            return None
+        if coding == "br":
+            return BrotliEncoder(get_setting("BROTLI_QUALITY"))
+        return GzipEncoder(get_setting("GZIP_LEVEL"))
+
+    @staticmethod
+    def compress_sequence(encoder, chunks):
+        for chunk in chunks:
+            data = encoder.process(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+
+    @staticmethod
+    async def compress_async(encoder, chunks):
+        async for chunk in chunks:
+            data = encoder.process(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
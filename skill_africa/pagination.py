@@ -1,8 +1,235 @@
 # File for all pagination classes that will be used in the skill afrika backend.
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CustomCursorPagination(BasePagination):
+    """
+    Keyset pagination that never counts or offsets into the table.
+
+    The page boundary is the sort key of the last (or first) row on the page,
+    so fetching page 1000 costs the same index range scan as page 1. The
+    queryset keeps whatever ordering the view and its ordering filters gave
+    it (e.g. `user__username`, `datetime`, `name`) and the primary key is
+    appended as a tiebreaker so rows sharing a sort value are never skipped
+    or repeated. NULL sort keys come after every value, on every database.
+
+    Use it per view with `pagination_class = CustomCursorPagination`, or per
+    request on any view using `CustomPageNumberPagination` by passing
+    `?cursor=` (empty for the first page).
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor.get("r"))
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self.flip(field) for field in ordering]
+        queryset = queryset.order_by(*[self.order_by(field) for field in ordering])
+        if cursor:
+            queryset = queryset.filter(self.build_filter(cursor["v"]))
+
+        # One extra row tells us whether there is a page after this one
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else cursor is not None
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        # Expressions and random ordering have no position to resume from
+        if any(not isinstance(field, str) or field == "?" for field in ordering):
+            raise ValidationError(
+                {"ordering": ["Cursor pagination needs a field based ordering."]}
+            )
+
+        pk_names = {"pk", queryset.model._meta.pk.name}
+        if not ordering or ordering[-1].lstrip("-") not in pk_names:
+            ordering.append("pk")
+        return ordering
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def order_by(field):
+        # NULL as the largest value, as build_filter compares it
+        if field.startswith("-"):
+            return F(field[1:]).desc(nulls_first=True)
+        return F(field).asc(nulls_last=True)
+
+    @staticmethod
+    def compare(name, lookup, value):
+        """
+        `name <lookup> value` with NULL sorting after every value; SQL
+        comparisons with NULL are never true.
+        """
+        if lookup == "exact":
+            if value is None:
+                return Q(**{f"{name}__isnull": True})
+            return Q(**{name: value})
+        if value is None:
+            return {
+                # Nothing sorts after NULL
+                "gt": Q(pk__in=[]),
+                "gte": Q(**{f"{name}__isnull": True}),
+                "lt": Q(**{f"{name}__isnull": False}),
+                "lte": Q(),
+            }[lookup]
+        query = Q(**{f"{name}__{lookup}": value})
+        if lookup in ("gt", "gte"):
+            query |= Q(**{f"{name}__isnull": True})
+        return query
+
+    def build_filter(self, values):
+        """
+        Builds `(f1, f2, ..., pk) > (v1, v2, ..., vpk)` honouring the direction
+        of every ordering field.
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        query = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            descending = field.startswith("-")
+            name = field.lstrip("-")
+            lookup = "lt" if descending != self.reverse else "gt"
+            query |= equal & self.compare(name, lookup, value)
+            equal &= self.compare(name, "exact", value)
+
+        # The redundant inclusive bound on the leading key lets the database
+        # seek into its index instead of evaluating the OR chain on every row.
+        field, value = self.ordering[0], values[0]
+        lookup = "lte" if field.startswith("-") != self.reverse else "gte"
+        return self.compare(field.lstrip("-"), lookup, value) & query
+
+    @staticmethod
+    def get_position(instance, field):
+        value = instance
+        for attr in field.lstrip("-").split("__"):
+            value = getattr(value, attr)
+        return value
+
+    def encode_cursor(self, instance, reverse=False):
+        values = [self.get_position(instance, field) for field in self.ordering]
+        data = json.dumps({"v": values, "r": int(reverse)}, cls=DjangoJSONEncoder)
+        cursor = base64.urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(cursor.get("v"), list):
+                raise ValueError
+        except (TypeError, ValueError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = "page_size"
     max_page_size = 500
+    cursor_pagination_class = CustomCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # `?cursor=` switches the request over to keyset pagination
+        self.cursor_paginator = None
+        if self.cursor_pagination_class.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
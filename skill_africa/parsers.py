@@ -0,0 +1,51 @@
+# Parsers used by the skill afrika backend, see REST_FRAMEWORK in settings.py.
+import msgpack
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from skill_africa.renderers import FastJSONRenderer, MessagePackRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson. orjson only reads UTF-8 and always rejects
+    NaN and Infinity, so other encodings, STRICT_JSON = False or a missing
+    orjson fall back to JSONParser.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        utf8 = encoding.lower().replace("-", "") == "utf8"
+        if orjson is None or not utf8 or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses `application/msgpack` request bodies. Datetimes may be sent as
+    ISO strings, like in JSON, or as MessagePack timestamps, which are
+    decoded to aware UTC datetimes.
+    """
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, timestamp=3)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError("MessagePack parse error - %s" % str(exc))
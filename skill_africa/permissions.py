@@ -22,3 +22,11 @@ class IsProfileOwner(BasePermission):
 class IsAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
         return obj.user["role"] == "admin"
+
+
+class IsSponsorOrAdmin(BasePermission):
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated and user.role in ("sponsor", "admin")
+        )
@@ -0,0 +1,173 @@
+# Renderers used by the skill afrika backend, see REST_FRAMEWORK in settings.py.
+import csv
+import io
+
+import msgpack
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson.
+
+    orjson encodes str, int, float, dict, list, UUID and datetime (with a
+    trailing `Z` for UTC, like DRF) natively; everything else (Decimal, lazy
+    strings, querysets, timedelta...) goes through DRF's own encoder, so the
+    output matches JSONRenderer's. Indented output, ASCII-only output, a
+    missing orjson or any value orjson can't encode (e.g. integers over 64
+    bits) fall back to JSONRenderer.
+    """
+
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else None
+    default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (
+            orjson is None
+            or indent is not None
+            or self.ensure_ascii
+            or not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output stays a javascript subset
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders `application/msgpack` (`?format=msgpack`).
+
+    Values are encoded as in the JSON responses, so clients get the same
+    document whichever format they ask for: UUIDs and datetimes are ISO
+    strings (`Z` for UTC), Decimals are rendered by their serializer fields
+    as strings, and anything else MessagePack has no type for goes through
+    DRF's JSON encoder. Only integer dict keys differ, they stay integers.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self.default)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders newline delimited JSON, one object per line. A list renders one
+    line per item; anything else (an error, for instance) renders one line.
+
+    `render_row()` encodes a single row, for views that stream rows.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    json_renderer = FastJSONRenderer()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(self.render_row(row) for row in rows)
+
+    def render_header(self, columns):
+        return b""
+
+    def render_row(self, row, columns=None):
+        return self.json_renderer.render(row) + b"\n"
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders rows of objects as CSV with a header line. Nested objects become
+    `parent.key` columns and lists are joined with "; ", lists of objects by
+    their `url` or else their first text value (e.g. the skill name). Cells
+    starting with a formula character are prefixed with a quote so
+    spreadsheets show them as text.
+
+    `render_header()` and `render_row()` encode single lines, for views that
+    stream rows.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+    separator = "; "
+    formula_prefixes = ("=", "+", "-", "@", "\t", "\r")
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = [
+            self.flatten(row) for row in (data if isinstance(data, list) else [data])
+        ]
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        return self.render_header(columns) + b"".join(
+            self.render_row(row, columns) for row in rows
+        )
+
+    def render_header(self, columns):
+        return self.write(columns)
+
+    def render_row(self, row, columns=None):
+        row = self.flatten(row)
+        return self.write(
+            [self.cell(row.get(column)) for column in (columns or list(row))]
+        )
+
+    def flatten(self, row, prefix=""):
+        flat = {}
+        for key, value in row.items():
+            if isinstance(value, dict):
+                flat.update(self.flatten(value, f"{prefix}{key}."))
+            else:
+                flat[f"{prefix}{key}"] = value
+        return flat
+
+    def cell(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            value = self.separator.join(self.list_item(item) for item in value)
+        if isinstance(value, str) and value.startswith(self.formula_prefixes):
+            return "'" + value
+        return value
+
+    @staticmethod
+    def list_item(item):
+        if isinstance(item, dict):
+            if "url" in item:
+                return str(item["url"])
+            return next((v for v in item.values() if isinstance(v, str)), "")
+        return str(item)
+
+    @staticmethod
+    def write(values):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue().encode()
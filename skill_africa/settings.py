@@ -55,6 +55,7 @@ INSTALLED_APPS = [
     "sponsor_management",
     "admin_management",
     "event_management",
+    "media_management",
     "corsheaders",
     "django_filters",
 ]
@@ -68,6 +69,17 @@ REST_FRAMEWORK = {
         "dj_rest_auth.jwt_auth.JWTCookieAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_RENDERER_CLASSES": [
+        "skill_africa.renderers.FastJSONRenderer",
+        "skill_africa.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "skill_africa.parsers.FastJSONParser",
+        "skill_africa.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "skill_africa.pagination.CustomPageNumberPagination",
     "PAGE_SIZE": 50,
 }
@@ -109,6 +121,7 @@ SIMPLE_JWT = {
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "skill_africa.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -121,8 +134,34 @@ MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",
 ]
 
+# Brotli/gzip compression of API responses, see skill_africa.middleware for
+# every option. Lower levels trade bytes on the wire for CPU.
+RESPONSE_COMPRESSION = {
+    "MIN_SIZE": int(os.getenv("COMPRESSION_MIN_SIZE", 1024)),
+    "BROTLI_QUALITY": int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4)),
+    "GZIP_LEVEL": int(os.getenv("COMPRESSION_GZIP_LEVEL", 6)),
+}
+
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Precomputed similar freelancers index, shared by every worker on the host
+# (see freelancer_management.similarity)
+SIMILARITY_INDEX_PATH = os.getenv(
+    "SIMILARITY_INDEX_PATH", str(BASE_DIR / "var" / "similarity_index.npz")
+)
+
+# Uploads are spooled to UPLOAD_SPOOL_DIR and sent to MEDIA_STORAGE by
+# UPLOAD_WORKERS threads per process, or by `manage.py run_upload_worker`
+# when it is 0 (see media_management.jobs)
+MEDIA_STORAGE = os.getenv(
+    "MEDIA_STORAGE", "media_management.storage.CloudinaryStorage"
+)
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", str(BASE_DIR / "var" / "uploads"))
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "2"))
+# Processes normalizing images before upload, 0 to do it in the upload
+# worker itself (see media_management.images)
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
 # settings.py
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -0,0 +1,449 @@
+import asyncio
+import datetime
+import decimal
+import gzip
+import io
+import json
+import uuid
+
+import brotli
+import msgpack
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from admin_management.models import AdminProfile
+from event_management import serializers as event_serializers
+from event_management.models import Event, EventAttendee, EventCoHost
+from freelancer_management import serializers as freelancer_serializers
+from freelancer_management.taxonomy import skill_taxonomy
+from freelancer_management.models import (
+    FreelancerLanguage,
+    FreelancerLink,
+    FreelancerNiche,
+    FreelancerProfile,
+    FreelancerSkill,
+    Language,
+    Niche,
+    Project,
+    Skill,
+    WorkExperience,
+)
+from profile_management import serializers as profile_serializers
+from profile_management.models import PasswordOTP, User
+from skill_africa.middleware import CompressionMiddleware, parse_accept_encoding
+from skill_africa.parsers import FastJSONParser, MessagePackParser
+from skill_africa.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def setUp(self):
+        self.data = {
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "price": decimal.Decimal("19.99"),
+            "datetime": datetime.datetime(2024, 5, 1, 9, 30, tzinfo=datetime.UTC),
+            "naive": datetime.datetime(2024, 5, 1, 9, 30, 0, 1500),
+            "date": datetime.date(2024, 5, 1),
+            "duration": datetime.timedelta(minutes=90),
+            "lazy": gettext_lazy("Not found."),
+            "text": "Café\u2028line\u2029",
+            "results": {1: "created", 2: "exists"},
+            "nested": [{"id": 1, "ratio": 0.5, "ok": True, "none": None}],
+        }
+
+    def test_output_matches_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_falls_back_for_values_orjson_cannot_encode(self):
+        data = {"big": 2**70}
+        self.assertEqual(
+            FastJSONRenderer().render(data), b'{"big":1180591620717411303424}'
+        )
+
+    def test_indented_output_falls_back(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=2", {})
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body):
+        return FastJSONParser().parse(io.BytesIO(body), "application/json", {})
+
+    def test_parses_utf8(self):
+        self.assertEqual(
+            self.parse('{"name": "Café", "ids": [1, 2]}'.encode()),
+            {"name": "Café", "ids": [1, 2]},
+        )
+
+    def test_invalid_json_is_a_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"name": ')
+        with self.assertRaises(ParseError):
+            self.parse(b'{"value": NaN}')
+
+
+class MessagePackRendererTests(SimpleTestCase):
+    def test_values_are_encoded_as_in_json(self):
+        data = {
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "price": decimal.Decimal("19.99"),
+            "datetime": datetime.datetime(2024, 5, 1, 9, 30, tzinfo=datetime.UTC),
+            "date": datetime.date(2024, 5, 1),
+            "lazy": gettext_lazy("Not found."),
+        }
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+
+    def test_no_content_renders_empty(self):
+        self.assertEqual(MessagePackRenderer().render(None), b"")
+
+
+class MessagePackParserTests(SimpleTestCase):
+    def parse(self, body):
+        return MessagePackParser().parse(io.BytesIO(body), "application/msgpack", {})
+
+    def test_timestamps_are_aware_datetimes(self):
+        moment = datetime.datetime(2024, 5, 1, 9, 30, tzinfo=datetime.UTC)
+        body = msgpack.packb({"datetime": moment}, datetime=True)
+        self.assertEqual(self.parse(body), {"datetime": moment})
+
+    def test_invalid_body_is_a_parse_error(self):
+        for body in [b"", b"\x92\x01", b"\x81\x01\x02\x03", b"\xc1"]:
+            with self.assertRaises(ParseError):
+                self.parse(body)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class MessagePackRoundTripTests(APITestCase):
+    """
+    Every serializer of the API apps gives the same document through
+    MessagePack as through JSON, and accepts it back as input.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="jane", email="jane@example.com", password="Str0ng_P@ssw0rd"
+        )
+        self.profile = FreelancerProfile.objects.create(
+            user=self.user, first_name="Jane", bio="Café owner"
+        )
+        self.skill = Skill.objects.create(name="Python")
+        self.niche = Niche.objects.create(name="Backend")
+        self.language = Language.objects.create(name="Yoruba")
+        self.freelancer_skill = FreelancerSkill.objects.create(
+            freelancer=self.profile, skill=self.skill
+        )
+        self.freelancer_niche = FreelancerNiche.objects.create(
+            freelancer=self.profile, niche=self.niche
+        )
+        self.freelancer_language = FreelancerLanguage.objects.create(
+            freelancer=self.profile, language=self.language
+        )
+        self.link = FreelancerLink.objects.create(
+            freelancer=self.profile, name="GitHub", url="https://github.com/jane"
+        )
+        self.project = Project.objects.create(
+            freelancer=self.profile,
+            name="Shop",
+            skills="Python, Django",
+            tools="Docker",
+            description="An online shop",
+            url="https://example.com",
+        )
+        self.work_experience = WorkExperience.objects.create(
+            freelancer=self.profile,
+            job_title="Engineer",
+            company="Acme",
+            start_date=datetime.date(2020, 1, 1),
+            description="Built things",
+        )
+
+        host = User.objects.create_user(
+            username="admin", email="admin@example.com", password="Str0ng_P@ssw0rd"
+        )
+        self.event = Event.objects.create(
+            name="Meetup",
+            location="Lagos",
+            datetime=timezone.now() + datetime.timedelta(days=7),
+            details="Monthly meetup",
+            price=decimal.Decimal("2500.00"),
+            host=AdminProfile.objects.create(user=host),
+        )
+        self.attendee = EventAttendee.objects.create(
+            event=self.event, attendee=self.user
+        )
+        self.cohost = EventCoHost.objects.create(event=self.event, cohost=host)
+        self.otp = PasswordOTP.objects.create(
+            email=self.user.email,
+            code="012345",
+            expires_at=timezone.now() + datetime.timedelta(minutes=30),
+        )
+
+    def round_trip(self, data):
+        body = MessagePackRenderer().render(data)
+        return MessagePackParser().parse(io.BytesIO(body), "application/msgpack", {})
+
+    def assertRoundTrips(self, serializer):
+        data = serializer.data
+        self.assertEqual(self.round_trip(data), json.loads(JSONRenderer().render(data)))
+        return data
+
+    def test_freelancer_management_serializers(self):
+        fm = freelancer_serializers
+        cases = [
+            (fm.FreelanceSerializer, self.profile),
+            (fm.FreelanceProfileSerializer, self.profile),
+            (fm.NicheSerializer, self.niche),
+            (fm.SkillSerializer, self.skill),
+            (fm.LanguageSerializer, self.language),
+            (fm.FreelancerLinkSerializer, self.link),
+            (fm.FreelancerNicheSerializer, self.freelancer_niche),
+            (fm.FreelancerSkillSerializer, self.freelancer_skill),
+            (fm.FreelancerLanguageSerializer, self.freelancer_language),
+            (fm.ListFreelancerNicheSerializer, self.freelancer_niche),
+            (fm.ListFreelancerSkillSerializer, self.freelancer_skill),
+            (fm.ListFreelancerLanguageSerializer, self.freelancer_language),
+            (fm.ProjectSerializer, self.project),
+            (fm.WorkExperienceSerializer, self.work_experience),
+        ]
+        for serializer_class, instance in cases:
+            with self.subTest(serializer_class.__name__):
+                self.assertRoundTrips(serializer_class(instance))
+
+        writable = [
+            (fm.NicheSerializer, self.niche),
+            (fm.SkillSerializer, self.skill),
+            (fm.LanguageSerializer, self.language),
+            (fm.FreelancerLinkSerializer, self.link),
+            (fm.ProjectSerializer, self.project),
+            (fm.WorkExperienceSerializer, self.work_experience),
+        ]
+        for serializer_class, instance in writable:
+            with self.subTest(serializer_class.__name__):
+                data = self.round_trip(serializer_class(instance).data)
+                serializer = serializer_class(instance, data=data)
+                self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_event_management_serializers(self):
+        em = event_serializers
+        cases = [
+            (em.CreateEventSerializer, self.event),
+            (em.EventSerializer, self.event),
+            (em.EventAttendeeListSerializer, self.attendee),
+            (em.EventAttendeeSerializer, self.attendee),
+            (em.EventCoHostSerializer, self.cohost),
+        ]
+        for serializer_class, instance in cases:
+            with self.subTest(serializer_class.__name__):
+                self.assertRoundTrips(serializer_class(instance))
+
+        data = self.assertRoundTrips(em.CreateEventSerializer(self.event))
+        self.assertEqual(data["price"], "2500.00")
+        serializer = em.CreateEventSerializer(self.event, data=self.round_trip(data))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["price"], self.event.price)
+        self.assertEqual(serializer.validated_data["datetime"], self.event.datetime)
+
+        for serializer_class, instance in [
+            (em.EventAttendeeSerializer, self.attendee),
+            (em.EventCoHostSerializer, self.cohost),
+        ]:
+            with self.subTest(serializer_class.__name__):
+                data = self.round_trip(serializer_class(instance).data)
+                serializer = serializer_class(instance, data=data)
+                self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_profile_management_serializers(self):
+        pm = profile_serializers
+        expiration = timezone.now()
+        cases = [
+            (pm.UserDetailsSerializer, self.user),
+            (pm.UserDetailsSerializerWithId, self.user),
+            (pm.RegisterSerializer, self.user),
+            (pm.DocumentationRegisterSerializer, self.user),
+            (pm.PasswordOTPSerializer, self.otp),
+            (
+                pm.JWTSerializer,
+                {
+                    "access": "access",
+                    "refresh": "refresh",
+                    "user": self.user,
+                    "access_expiration": expiration,
+                    "refresh_expiration": expiration,
+                },
+            ),
+            (pm.LoginSerializer, {"email": self.user.email, "password": "secret"}),
+            (pm.LogoutSerializer, {"refresh": "refresh"}),
+            (pm.VerifyOTPSerializer, {"otp": "012345"}),
+        ]
+        for serializer_class, instance in cases:
+            with self.subTest(serializer_class.__name__):
+                self.assertRoundTrips(serializer_class(instance))
+
+        data = self.assertRoundTrips(pm.UserDetailsSerializer(self.user))
+        self.assertEqual(data["uuid"], str(self.user.uuid))
+
+        login = self.round_trip(
+            {"email": self.user.email, "password": "Str0ng_P@ssw0rd"}
+        )
+        serializer = pm.LoginSerializer(data=login)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["user"], self.user)
+
+    def test_content_negotiation(self):
+        body = msgpack.packb({"email": self.user.email, "password": "Str0ng_P@ssw0rd"})
+        response = self.client.post(
+            reverse("login_view"),
+            body,
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(data["user"]["uuid"], str(self.user.uuid))
+
+        response = self.client.get(reverse("skill-list-create"), {"format": "msgpack"})
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(
+            msgpack.unpackb(response.content)["results"],
+            [{"id": self.skill.id, "name": "Python"}],
+        )
+
+        # JSON stays the default
+        response = self.client.get(reverse("skill-list-create"))
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_malformed_body_is_rejected(self):
+        response = self.client.post(
+            reverse("login_view"), b"\xc1", content_type="application/msgpack"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = json.dumps([{"id": i, "name": f"Skill {i}"} for i in range(200)]).encode()
+
+    def get(self, response, accept_encoding="gzip, deflate, br"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=None, **kwargs):
+        return HttpResponse(
+            self.body if body is None else body,
+            content_type="application/json",
+            **kwargs,
+        )
+
+    def test_prefers_brotli(self):
+        response = self.get(self.json_response())
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(brotli.decompress(response.content), self.body)
+
+    def test_honours_client_preference(self):
+        response = self.get(self.json_response(), "br;q=0.5, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+        response = self.get(self.json_response(), "br;q=0, gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        response = self.get(self.json_response(), "*")
+        self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding("gzip;q=0.8, BR, identity; q=bad,"),
+            {"gzip": 0.8, "br": 1.0, "identity": 0.0},
+        )
+
+    def test_skips_small_and_unlisted_responses(self):
+        response = self.get(self.json_response(b'{"id": 1}'))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        # Caches must still keep the compressed and plain variants apart
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+        response = self.get(HttpResponse(self.body, content_type="image/png"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        response = self.get(HttpResponse(self.body, content_type="text/html"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        response = self.get(self.json_response(status=304))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(
+        RESPONSE_COMPRESSION={
+            "MIN_SIZE": 10,
+            "MIN_SIZE_BY_CONTENT_TYPE": {"text/csv": 10**6},
+        }
+    )
+    def test_thresholds_are_configurable(self):
+        body = b'{"id": 1, "name": "' + b"a" * 50 + b'"}'
+        response = self.get(self.json_response(body))
+        self.assertEqual(response["Content-Encoding"], "br")
+
+        response = self.get(HttpResponse(self.body, content_type="text/csv"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_etag_becomes_weak(self):
+        response = self.json_response()
+        response["ETag"] = '"abc"'
+        self.assertEqual(self.get(response)["ETag"], 'W/"abc"')
+
+    def test_streaming_response(self):
+        chunks = [self.body[i : i + 100] for i in range(0, len(self.body), 100)]
+        response = self.get(
+            StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson"),
+            "gzip",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(gzip.decompress(b"".join(response)), self.body)
+
+    def test_async_streaming_response(self):
+        async def chunks():
+            for i in range(0, len(self.body), 100):
+                yield self.body[i : i + 100]
+
+        response = self.get(
+            StreamingHttpResponse(chunks(), content_type="application/json")
+        )
+
+        async def consume():
+            return b"".join([chunk async for chunk in response])
+
+        self.assertEqual(brotli.decompress(asyncio.run(consume())), self.body)
+
+
+class CompressedApiResponseTests(APITestCase):
+    def setUp(self):
+        Skill.objects.bulk_create([Skill(name=f"Skill {i}") for i in range(100)])
+        skill_taxonomy.bump()
+        self.url = reverse("skill-list-create")
+
+    def test_list_is_compressed_and_revalidates(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response["ETag"], "W/" + plain["ETag"])
+
+        response = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
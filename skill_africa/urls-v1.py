@@ -13,6 +13,7 @@ urlpatterns = [
     path("freelancer/", include("freelancer_management.urls")),
     path("sponsors/", include("sponsor_management.urls")),
     path("sso/", include("sso_authentication.urls")),
+    path("uploads/", include("media_management.urls")),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path("docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("docs/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),